@@ -0,0 +1,121 @@
+"""
+BENCH_EVENEMENTS.PY - Nombre d'événements SimPy par heure simulée
+Responsable : Sarah
+Projet : Simulation de Feux de Circulation
+
+Compare l'ancienne attente par scrutation (timeout de 0.1s tant que le feu
+est rouge) avec l'attente sur l'événement "début du vert" publié par
+SystemeFeux.gerer_cycle.
+
+Usage :
+    python benchmarks/bench_evenements.py
+"""
+
+import os
+import sys
+import time
+
+import simpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from feux import SystemeFeux, ConfigurationFeux
+from vehicule import GenerateurVehicules
+from intersection import Intersection
+from journal import JournalNul
+
+
+class EnvironnementCompteur(simpy.Environment):
+    """Environnement SimPy qui compte les événements traités"""
+
+    def __init__(self):
+        super().__init__()
+        self.nombre_evenements = 0
+
+    def step(self):
+        self.nombre_evenements += 1
+        super().step()
+
+
+class IntersectionScrutation(Intersection):
+    """Ancienne version : vérifie le feu toutes les 0.1s"""
+
+    def traverser_voie_a(self, vehicule):
+        self.file_a.ajouter_vehicule(vehicule, self.env.now)
+        self.vehicules_total_a += 1
+        while not self.systeme_feux.peut_passer_voie_a():
+            yield self.env.timeout(0.1)
+        with self.voie_a.request() as req:
+            yield req
+            self.file_a.retirer_vehicule()
+            temps_attente = self.env.now - vehicule.temps_arrivee
+            vehicule.temps_attente = temps_attente
+            yield self.env.timeout(0.1)
+            vehicule.temps_depart = self.env.now
+            self.file_a.enregistrer_service(temps_attente)
+
+    def traverser_voie_b(self, vehicule):
+        self.file_b.ajouter_vehicule(vehicule, self.env.now)
+        self.vehicules_total_b += 1
+        while not self.systeme_feux.peut_passer_voie_b():
+            yield self.env.timeout(0.1)
+        with self.voie_b.request() as req:
+            yield req
+            self.file_b.retirer_vehicule()
+            temps_attente = self.env.now - vehicule.temps_arrivee
+            vehicule.temps_attente = temps_attente
+            yield self.env.timeout(0.1)
+            vehicule.temps_depart = self.env.now
+            self.file_b.enregistrer_service(temps_attente)
+
+
+def mesurer(classe_intersection, lambda_: float, config: ConfigurationFeux,
+            duree: float) -> dict:
+    """
+    Exécute une simulation et mesure les événements traités
+
+    Returns:
+        Dictionnaire avec événements/heure simulée et durée réelle
+    """
+    env = EnvironnementCompteur()
+    journal = JournalNul()
+    systeme_feux = SystemeFeux(env, config, journal)
+    intersection = classe_intersection(env, systeme_feux, journal)
+    generateur = GenerateurVehicules(env, lambda_, lambda_, journal)
+
+    env.process(systeme_feux.gerer_cycle())
+    env.process(generateur.generer_voie_a(intersection))
+    env.process(generateur.generer_voie_b(intersection))
+
+    debut = time.perf_counter()
+    env.run(until=duree)
+    duree_reelle = time.perf_counter() - debut
+
+    servis = (intersection.file_a.nombre_vehicules_servis +
+              intersection.file_b.nombre_vehicules_servis)
+    return {
+        'evenements_par_heure': env.nombre_evenements * 3600.0 / duree,
+        'vehicules_servis': servis,
+        'duree_reelle': duree_reelle
+    }
+
+
+if __name__ == "__main__":
+    duree = 3600.0
+    cas = [
+        ("Scénario 1 (λ=0.3, 30/25)", 0.3, ConfigurationFeux(30, 25)),
+        ("Scénario 2 (λ=0.4, 40/20)", 0.4, ConfigurationFeux(40, 20)),
+    ]
+
+    print(f"📏 Horizon : {duree:.0f}s simulées\n")
+    for titre, lambda_, config in cas:
+        avant = mesurer(IntersectionScrutation, lambda_, config, duree)
+        apres = mesurer(Intersection, lambda_, config, duree)
+        gain = avant['evenements_par_heure'] / apres['evenements_par_heure']
+        print(f"📌 {titre}")
+        print(f"   Avant (scrutation) : {avant['evenements_par_heure']:>10.0f} évén./h "
+              f"| {avant['duree_reelle']:.3f}s")
+        print(f"   Après (événement)  : {apres['evenements_par_heure']:>10.0f} évén./h "
+              f"| {apres['duree_reelle']:.3f}s")
+        print(f"   → {gain:.1f}x moins d'événements "
+              f"({apres['vehicules_servis']} véhicules servis)\n")
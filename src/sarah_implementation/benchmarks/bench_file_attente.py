@@ -0,0 +1,97 @@
+"""
+BENCH_FILE_ATTENTE.PY - Stress test d'une voie sursaturée
+Responsable : Sarah
+Projet : Simulation de Feux de Circulation
+
+Fait tourner la voie B du scénario 2 (λ=0.4, T_B=20s, ρ_B≈1.6) pendant
+6, 12 et 24 heures simulées : la file grandit sans limite. Compare l'ancien
+stockage en liste (pop(0) en O(n)) avec le deque de FileAttente (O(1)).
+Un stockage linéaire doit garder un coût par opération constant.
+
+Usage :
+    python benchmarks/bench_file_attente.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from feux import ConfigurationFeux
+from vehicule import Vehicule, Direction
+from intersection import FileAttente
+
+
+class FileAttenteListe(FileAttente):
+    """Ancien stockage : liste Python avec pop(0)"""
+
+    def __init__(self, nom: str):
+        super().__init__(nom)
+        self.vehicules_en_attente = []
+
+    def retirer_vehicule(self, temps_actuel=None):
+        if self.vehicules_en_attente:
+            self._avancer(temps_actuel)
+            vehicule = self.vehicules_en_attente.pop(0)
+            self.nombre_en_service += 1
+            return vehicule
+        return None
+
+
+def simuler_voie_saturee(file: FileAttente, lambda_: float,
+                         config: ConfigurationFeux, duree: float,
+                         graine: int = 42) -> int:
+    """
+    Arrivées de Poisson et départs pendant le vert de la voie B,
+    un départ par seconde de vert (μ = T_B / T_cycle < λ)
+
+    Returns:
+        Nombre total d'opérations sur la file (ajouts + retraits)
+    """
+    aleatoire = random.Random(graine)
+    debut_vert = config.duree_vert_a + config.duree_jaune
+    cycle = config.duree_cycle
+    operations = 0
+
+    t_arrivee = aleatoire.expovariate(lambda_)
+    compteur = 0
+    numero_cycle = 0
+    while numero_cycle * cycle < duree:
+        origine = numero_cycle * cycle + debut_vert
+        for k in range(int(config.duree_vert_b)):
+            creneau = origine + k
+            if creneau >= duree:
+                break
+            while t_arrivee <= creneau:
+                compteur += 1
+                file.ajouter_vehicule(Vehicule(compteur, Direction.VOIE_B, t_arrivee),
+                                      t_arrivee)
+                t_arrivee += aleatoire.expovariate(lambda_)
+                operations += 1
+            vehicule = file.retirer_vehicule(creneau)
+            if vehicule is not None:
+                file.enregistrer_service(creneau - vehicule.temps_arrivee, creneau)
+                operations += 1
+        numero_cycle += 1
+    return operations
+
+
+if __name__ == "__main__":
+    config = ConfigurationFeux(duree_vert_a=40, duree_vert_b=20)
+    lambda_ = 0.4
+
+    print(f"📌 Voie B sursaturée : λ = {lambda_}, μ = {config.proportion_vert_b():.3f} "
+          f"→ ρ = {lambda_ / config.proportion_vert_b():.2f}\n")
+    print(f"{'Horizon':>8} | {'Stockage':>8} | {'File finale':>11} | "
+          f"{'Durée':>8} | {'ns/opération':>12}")
+    print("─" * 60)
+    for heures in (6, 12, 24):
+        for nom, classe in (("liste", FileAttenteListe), ("deque", FileAttente)):
+            file = classe("File Voie B")
+            debut = time.perf_counter()
+            operations = simuler_voie_saturee(file, lambda_, config, heures * 3600.0)
+            duree_reelle = time.perf_counter() - debut
+            print(f"{heures:>7}h | {nom:>8} | {file.longueur():>11} | "
+                  f"{duree_reelle:>7.3f}s | {1e9 * duree_reelle / operations:>12.0f}")
@@ -0,0 +1,41 @@
+"""
+BENCH_MOTEURS.PY - Moteur SimPy contre moteur vectorisé par cycles
+Responsable : Sarah
+Projet : Simulation de Feux de Circulation
+
+Usage :
+    python benchmarks/bench_moteurs.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from main import executer_simulation
+
+
+def chronometrer(moteur: str, duree: float) -> tuple:
+    """Retourne (durée réelle, W_q voie A) d'une simulation silencieuse"""
+    debut = time.perf_counter()
+    collecteur = executer_simulation(duree_simulation=duree, graine=1,
+                                     mode_silencieux=True, dossier_resultats=None,
+                                     moteur=moteur)
+    return (time.perf_counter() - debut,
+            collecteur.donnees['empirique']['voie_a']['temps_attente_moyen'])
+
+
+if __name__ == "__main__":
+    print(f"{'Horizon':>10} | {'SimPy':>9} | {'Cycles':>9} | {'Gain':>7} | W_q A (SimPy / cycles)")
+    print("─" * 72)
+    for jours in (1, 7):
+        duree = jours * 86400.0
+        t_simpy, w_simpy = chronometrer('simpy', duree)
+        t_cycles, w_cycles = chronometrer('cycles', duree)
+        print(f"{jours:>8} j | {t_simpy:>8.3f}s | {t_cycles:>8.4f}s | "
+              f"×{t_simpy / t_cycles:>5.0f} | {w_simpy:.3f}s / {w_cycles:.3f}s")
+
+    # Le moteur par cycles seul sur un très long horizon
+    t_an, _ = chronometrer('cycles', 365 * 86400.0)
+    print(f"\n📅 1 an simulé avec le moteur par cycles : {t_an:.2f}s")
@@ -0,0 +1,318 @@
+"""
+SUITE.PY - Suite de benchmarks du cœur de la simulation
+Responsable : Sarah
+Projet : Simulation de Feux de Circulation
+
+Mesure pour chaque cas :
+- la durée réelle (meilleure de plusieurs répétitions)
+- les événements SimPy par seconde et les véhicules par seconde
+- le pic de mémoire (tracemalloc, mesuré sur une exécution séparée)
+
+Les références sont stockées dans benchmarks/references.json. Un cas plus
+lent ou plus gourmand que sa référence (au-delà de la tolérance) fait
+échouer la suite (code de sortie 1).
+
+Les durées dépendent de la machine : chaque référence garde la durée d'un
+calcul étalon (Python pur) mesurée au même moment, et la durée de
+référence est mise à l'échelle par le rapport des étalons avant la
+comparaison. Une suite lancée sur une autre machine n'a donc pas à
+réenregistrer les références.
+
+Les références ne se réenregistrent qu'avec un motif (--motif), conservé
+dans le fichier : une mise à jour est un commit à part qui explique
+pourquoi le cas est devenu plus lent ou plus gourmand.
+
+Usage :
+    python benchmarks/suite.py                  # comparer aux références
+    python benchmarks/suite.py --enregistrer --motif "..."
+    python benchmarks/suite.py --filtre simulation
+"""
+
+import argparse
+import contextlib
+import datetime
+import functools
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import simpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from feux import ConfigurationFeux
+from vehicule import Vehicule, Direction
+from intersection import FileAttente
+from statistiques import StatistiquesTheorique, StatistiquesTheoriqueVectorisees
+from main import executer_simulation
+
+
+FICHIER_REFERENCES = os.path.join(os.path.dirname(__file__), 'references.json')
+
+
+@contextlib.contextmanager
+def compter_evenements():
+    """Compte les événements traités par tous les environnements SimPy"""
+    compteur = {'evenements': 0}
+    step_original = simpy.Environment.step
+
+    def step(env):
+        compteur['evenements'] += 1
+        step_original(env)
+
+    simpy.Environment.step = step
+    try:
+        yield compteur
+    finally:
+        simpy.Environment.step = step_original
+
+
+# ─── Cas de benchmark : chaque fonction renvoie ses compteurs ───────────────
+
+def cas_simulation(lambda_: float, duree: float, config: ConfigurationFeux,
+                   moteur: str = 'simpy') -> Callable[[], dict]:
+    """executer_simulation silencieuse, sans fichier JSON"""
+    def executer():
+        collecteur = executer_simulation(
+            duree_simulation=duree, lambda_a=lambda_, lambda_b=lambda_,
+            config_feux=config, graine=2024, mode_silencieux=True,
+            dossier_resultats=None, moteur=moteur
+        )
+        empirique = collecteur.donnees['empirique']
+        return {'vehicules': (empirique['voie_a']['vehicules_total'] +
+                              empirique['voie_b']['vehicules_total'])}
+    return executer
+
+
+def cas_file_attente(nombre: int = 200_000) -> Callable[[], dict]:
+    """Ajouts puis retraits FIFO avec moyennes temporelles"""
+    vehicules = [Vehicule(i, Direction.VOIE_A, float(i)) for i in range(nombre)]
+
+    def executer():
+        file = FileAttente("File Voie A")
+        for v in vehicules:
+            file.ajouter_vehicule(v, v.temps_arrivee)
+        for v in vehicules:
+            t = nombre + v.temps_arrivee
+            file.retirer_vehicule(t)
+            file.enregistrer_service(t - v.temps_arrivee, t)
+        return {'vehicules': nombre}
+    return executer
+
+
+def cas_theorique(nombre: int = 50_000) -> Callable[[], dict]:
+    """Évaluation scalaire de StatistiquesTheorique"""
+    def executer():
+        for i in range(nombre):
+            StatistiquesTheorique(0.1 + 0.3 * i / nombre, 0.395).to_dict()
+        return {}
+    return executer
+
+
+def cas_theorique_vectorise(nombre: int = 1_000_000) -> Callable[[], dict]:
+    """StatistiquesTheoriqueVectorisees sur une grille d'un million de points"""
+    lambdas = np.linspace(0.1, 0.4, nombre)
+
+    def executer():
+        StatistiquesTheoriqueVectorisees(lambdas, 0.395).tableau()
+        return {}
+    return executer
+
+
+def cas_sauvegarde_json() -> Callable[[], dict]:
+    """Sauvegarde JSON d'une simulation d'une heure avec historique des files"""
+    collecteur = executer_simulation(duree_simulation=3600, graine=2024,
+                                     mode_silencieux=True, dossier_resultats=None,
+                                     historique_files=True)
+
+    def executer():
+        with tempfile.TemporaryDirectory() as dossier, \
+                contextlib.redirect_stdout(io.StringIO()):
+            collecteur.sauvegarder(os.path.join(dossier, 'bench.json'))
+        return {}
+    return executer
+
+
+def construire_cas() -> List[Tuple[str, Callable[[], Callable[[], dict]]]]:
+    """
+    Liste (nom, preparation) de tous les cas de la suite
+
+    La préparation construit les données du cas et renvoie la fonction
+    mesurée : elle n'est appelée que pour les cas retenus par --filtre.
+    """
+    configs = {
+        'defaut': ConfigurationFeux(),
+        '40-20': ConfigurationFeux(duree_vert_a=40, duree_vert_b=20),
+        '28-28': ConfigurationFeux(duree_vert_a=28, duree_vert_b=28, duree_pietons=14),
+    }
+    cas = []
+    for lambda_ in (0.2, 0.3, 0.4):
+        for duree in (600, 3600):
+            cas.append((f"simulation/lambda={lambda_}/duree={duree}/defaut",
+                        functools.partial(cas_simulation, lambda_, duree, configs['defaut'])))
+    for nom, config in configs.items():
+        if nom == 'defaut':
+            continue  # déjà couvert par la grille ci-dessus
+        cas.append((f"simulation/lambda=0.3/duree=3600/{nom}",
+                    functools.partial(cas_simulation, 0.3, 3600, config)))
+    cas.append(("simulation/lambda=0.3/duree=86400/defaut/cycles",
+                functools.partial(cas_simulation, 0.3, 86400, configs['defaut'], 'cycles')))
+    cas.append(("file_attente/200000", cas_file_attente))
+    cas.append(("theorique/50000", cas_theorique))
+    cas.append(("theorique_vectorise/1000000", cas_theorique_vectorise))
+    cas.append(("sauvegarde_json/3600", cas_sauvegarde_json))
+    return cas
+
+
+def mesurer_etalon(repetitions: int = 20) -> float:
+    """Durée (meilleure de plusieurs) d'un calcul fixe : vitesse de la machine"""
+    meilleure = float('inf')
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        total = 0.0
+        file = []
+        for i in range(100_000):
+            file.append(i * 0.5)
+            if len(file) > 8:
+                total += file.pop(0)
+        meilleure = min(meilleure, time.perf_counter() - debut)
+    return meilleure
+
+
+def mesurer(fonction: Callable[[], dict], repetitions: int,
+            budget: float = 0.5) -> dict:
+    """
+    Chronomètre un cas et mesure son pic de mémoire
+
+    Au moins `repetitions` exécutions, et davantage pour les cas courts
+    (jusqu'à `budget` secondes cumulées) afin de stabiliser le minimum.
+    """
+    meilleure = float('inf')
+    cumul = 0.0
+    executions = 0
+    while executions < repetitions or (cumul < budget and executions < 100):
+        with compter_evenements() as compteur:
+            debut = time.perf_counter()
+            resultats = fonction()
+            duree = time.perf_counter() - debut
+        meilleure = min(meilleure, duree)
+        cumul += duree
+        executions += 1
+
+    tracemalloc.start()
+    fonction()
+    _, pic = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    mesure = {'duree': meilleure, 'memoire_pic': pic}
+    if compteur['evenements']:
+        mesure['evenements_par_seconde'] = compteur['evenements'] / meilleure
+    if resultats.get('vehicules'):
+        mesure['vehicules_par_seconde'] = resultats['vehicules'] / meilleure
+    return mesure
+
+
+def comparer(mesure: dict, reference: dict, tolerance_duree: float,
+             tolerance_memoire: float, etalon: Optional[float] = None) -> List[str]:
+    """
+    Retourne la liste des régressions par rapport à la référence
+
+    Avec l'étalon de la machine courante, la durée de référence est mise à
+    l'échelle par le rapport des étalons (si la référence en a un).
+    """
+    regressions = []
+    duree_reference = reference['duree']
+    if etalon is not None and reference.get('etalon'):
+        duree_reference *= etalon / reference['etalon']
+    if mesure['duree'] > duree_reference * (1 + tolerance_duree):
+        regressions.append(f"durée {mesure['duree']:.4f}s > "
+                           f"{duree_reference:.4f}s (+{tolerance_duree:.0%})")
+    if mesure['memoire_pic'] > reference['memoire_pic'] * (1 + tolerance_memoire):
+        regressions.append(f"mémoire {mesure['memoire_pic'] / 1e6:.2f} Mo > "
+                           f"{reference['memoire_pic'] / 1e6:.2f} Mo (+{tolerance_memoire:.0%})")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks du cœur de la simulation")
+    parser.add_argument('--enregistrer', action='store_true',
+                        help="enregistre les mesures comme nouvelles références")
+    parser.add_argument('--motif', default='',
+                        help="raison de la mise à jour (obligatoire avec --enregistrer)")
+    parser.add_argument('--filtre', default='', help="ne lance que les cas contenant ce texte")
+    parser.add_argument('--repetitions', type=int, default=3)
+    parser.add_argument('--tolerance-duree', type=float, default=0.5)
+    parser.add_argument('--tolerance-memoire', type=float, default=0.2)
+    args = parser.parse_args()
+    if args.enregistrer and not args.motif.strip():
+        parser.error("--enregistrer exige --motif : expliquer pourquoi les références changent")
+
+    references: Dict[str, dict] = {}
+    if os.path.exists(FICHIER_REFERENCES):
+        with open(FICHIER_REFERENCES, encoding='utf-8') as f:
+            references = json.load(f)
+
+    etalon = mesurer_etalon()
+    etalons_references = sorted({r['etalon'] for r in references.values() if r.get('etalon')})
+    print(f"⏱️  Étalon de la machine : {etalon * 1e3:.1f} ms"
+          + (f" (références : {', '.join(f'{e * 1e3:.1f}' for e in etalons_references)} ms)"
+             if etalons_references else ""))
+
+    echecs = 0
+    sans_reference = 0
+    print(f"{'Cas':<50} | {'Durée':>9} | {'Mémoire':>9} | {'évén./s':>10} | {'véh./s':>10}")
+    print("─" * 100)
+    for nom, preparation in construire_cas():
+        if args.filtre not in nom:
+            continue
+        mesure = mesurer(preparation(), args.repetitions)
+        print(f"{nom:<50} | {mesure['duree']:>8.4f}s | "
+              f"{mesure['memoire_pic'] / 1e6:>6.2f} Mo | "
+              f"{mesure.get('evenements_par_seconde', 0):>10.0f} | "
+              f"{mesure.get('vehicules_par_seconde', 0):>10.0f}")
+
+        if args.enregistrer:
+            references[nom] = {**mesure, 'etalon': etalon, 'motif': args.motif.strip(),
+                               'date': datetime.date.today().isoformat(),
+                               'machine': platform.platform()}
+        elif nom not in references:
+            print("   ⚠️  Pas de référence pour ce cas")
+            sans_reference += 1
+        else:
+            regressions = comparer(mesure, references[nom], args.tolerance_duree,
+                                   args.tolerance_memoire, etalon)
+            if regressions:
+                # Confirmation : une seule mesure lente peut venir de la machine
+                regressions = comparer(mesurer(fonction, args.repetitions), references[nom],
+                                       args.tolerance_duree, args.tolerance_memoire,
+                                       mesurer_etalon())
+            for regression in regressions:
+                print(f"   ❌ RÉGRESSION : {regression}")
+                echecs += 1
+
+    if args.enregistrer:
+        with open(FICHIER_REFERENCES, 'w', encoding='utf-8') as f:
+            json.dump(references, f, indent=2, sort_keys=True)
+        print(f"\n💾 Références enregistrées : {FICHIER_REFERENCES}")
+        print("   À committer seules, avec le motif dans le message du commit")
+        return 0
+
+    if sans_reference:
+        print(f"\n⚠️  {sans_reference} cas sans référence (--enregistrer --motif \"...\")")
+
+    if echecs:
+        print(f"\n❌ {echecs} régression(s) détectée(s)")
+        return 1
+    print("\n✅ Aucune régression")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
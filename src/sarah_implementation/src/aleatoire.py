@@ -0,0 +1,56 @@
+"""
+ALEATOIRE.PY - Flux aléatoires reproductibles
+Responsable : Sarah
+Projet : Simulation de Feux de Circulation
+
+Une graine unique alimente une numpy.random.SeedSequence, dont on dérive
+(spawn) un flux indépendant par composant stochastique :
+- arrivees_a : arrivées de Poisson sur la Voie A
+- arrivees_b : arrivées de Poisson sur la Voie B
+- auxiliaire : tirages ponctuels (tests, outils)
+
+⚠️ Les nouveaux composants s'ajoutent À LA FIN de FLUX_ALEATOIRES :
+   les flux existants restent ainsi identiques pour une même graine.
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+
+
+FLUX_ALEATOIRES: Tuple[str, ...] = ('arrivees_a', 'arrivees_b', 'auxiliaire')
+
+
+class FluxAleatoires:
+    """
+    Ensemble des générateurs NumPy d'une simulation
+
+    La même graine redonne exactement les mêmes tirages pour chaque flux.
+    """
+
+    def __init__(self, graine: Optional[int] = None, indice_replication: Optional[int] = None):
+        """
+        Args:
+            graine: Graine de la simulation (entropie du système si None)
+            indice_replication: Numéro de réplication, donne une séquence fille
+                                indépendante sans changer la graine
+        """
+        sequence = np.random.SeedSequence(graine)
+        # Entropie effective : permet de rejouer une simulation lancée sans graine
+        self.graine = sequence.entropy
+        self.indice_replication = indice_replication
+        if indice_replication is not None:
+            sequence = np.random.SeedSequence(self.graine, spawn_key=(indice_replication,))
+        self.sequence = sequence
+
+        enfants = sequence.spawn(len(FLUX_ALEATOIRES))
+        self._generateurs = {nom: np.random.default_rng(enfant)
+                             for nom, enfant in zip(FLUX_ALEATOIRES, enfants)}
+
+    def generateur(self, nom: str) -> np.random.Generator:
+        """
+        Retourne le générateur d'un composant
+
+        Args:
+            nom: Nom du flux (voir FLUX_ALEATOIRES)
+        """
+        return self._generateurs[nom]
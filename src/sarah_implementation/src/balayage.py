@@ -0,0 +1,411 @@
+"""
+BALAYAGE.PY - Balayage de paramètres (grille ou hypercube latin)
+Responsable : Sarah
+Projet : Simulation de Feux de Circulation
+
+Développe des plages de λ_A, λ_B, T_A, T_B, T_jaune et T_pietons en points
+de simulation, les exécute en parallèle via executer_simulation et écrit
+UN tableau CSV « tidy » (une ligne par point, une colonne par paramètre ou
+indicateur).
+
+Pensé pour des dizaines de milliers de points :
+- les points sont générés paresseusement et le nombre de tâches en vol
+  est borné (executer_en_parallele)
+- chaque ligne est écrite et vidée sur disque dès son arrivée
+- chaque point a un identifiant stable (empreinte de ses paramètres) :
+  relancer la même commande reprend là où le balayage s'était arrêté ;
+  un CSV ne se complète qu'avec les mêmes colonnes, durée, moteur et graine
+- tous les points utilisent la même graine (nombres aléatoires communs :
+  les écarts entre points voisins ne sont pas noyés dans le bruit)
+
+Usage :
+    python balayage.py --sortie ../results/balayage.csv \\
+        --lambda-a 0.1:0.4:7 --lambda-b 0.3 --T-A 20:40:5 --T-B 20:40:5
+    python balayage.py --mode hypercube --points 20000 --moteur cycles \\
+        --lambda-a 0.1:0.4 --lambda-b 0.1:0.4 --T-A 15:45 --T-B 15:45
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import itertools
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from scipy.stats import qmc
+
+from feux import ConfigurationFeux
+from aleatoire import FluxAleatoires
+from parallele import executer_en_parallele
+from main import MOTEURS, executer_simulation
+from cache_resultats import CacheResultats
+
+
+# Paramètres balayables et valeur par défaut (configuration de référence)
+PARAMETRES_BALAYES: Dict[str, float] = {
+    'lambda_a': 0.3,
+    'lambda_b': 0.3,
+    'T_A': 30.0,
+    'T_B': 25.0,
+    'T_jaune': 3.0,
+    'T_pietons': 15.0,
+}
+
+# Indicateurs relevés par voie (format Intersection.obtenir_statistiques)
+INDICATEURS_VOIE = ('vehicules_servis', 'temps_attente_moyen', 'temps_attente_moyen_stationnaire',
+                    'longueur_moyenne_file', 'nombre_moyen_systeme', 'debit')
+
+# Retards analytiques relevés à côté des mesures (criblage des configurations)
+INDICATEURS_THEORIQUES = ('retard_webster', 'retard_hcm')
+
+COLONNES = (['id'] + list(PARAMETRES_BALAYES) + ['graine', 'duree_simulation', 'moteur'] +
+            [f"{voie}_{cle}" for voie in ('voie_a', 'voie_b')
+             for cle in INDICATEURS_VOIE + INDICATEURS_THEORIQUES] +
+            ['duree_calcul'])
+
+
+def identifiant_point(point: Dict[str, float]) -> str:
+    """Empreinte stable des paramètres d'un point (12 caractères hexadécimaux)"""
+    canonique = json.dumps({cle: round(float(point[cle]), 9) for cle in PARAMETRES_BALAYES},
+                           sort_keys=True)
+    return hashlib.sha1(canonique.encode('utf-8')).hexdigest()[:12]
+
+
+def _completer(point: Dict[str, float]) -> Dict[str, float]:
+    """Ajoute les paramètres non balayés (valeurs par défaut)"""
+    inconnus = set(point) - set(PARAMETRES_BALAYES)
+    if inconnus:
+        raise ValueError(f"Paramètres inconnus : {', '.join(sorted(inconnus))}")
+    return {**PARAMETRES_BALAYES, **point}
+
+
+def grille(plages: Dict[str, Sequence[float]]) -> Iterator[Dict[str, float]]:
+    """
+    Produit cartésien des valeurs de chaque paramètre (paresseux)
+
+    Args:
+        plages: Valeurs de chaque paramètre balayé ; les autres gardent
+                leur valeur par défaut (PARAMETRES_BALAYES)
+    """
+    noms = list(plages)
+    for valeurs in itertools.product(*(plages[nom] for nom in noms)):
+        yield _completer(dict(zip(noms, valeurs)))
+
+
+def hypercube_latin(bornes: Dict[str, Tuple[float, float]], nb_points: int,
+                    graine: Optional[int] = None) -> List[Dict[str, float]]:
+    """
+    Plan en hypercube latin : chaque plage est coupée en nb_points strates,
+    et chaque strate de chaque paramètre est utilisée exactement une fois
+
+    Args:
+        bornes: (minimum, maximum) de chaque paramètre balayé
+        nb_points: Nombre de points du plan
+        graine: Graine du tirage du plan
+    """
+    noms = list(bornes)
+    echantillonneur = qmc.LatinHypercube(d=len(noms), seed=graine)
+    unitaires = echantillonneur.random(nb_points)
+    bas = np.array([bornes[nom][0] for nom in noms], dtype=float)
+    haut = np.array([bornes[nom][1] for nom in noms], dtype=float)
+    points = bas + unitaires * (haut - bas)
+    return [_completer(dict(zip(noms, map(float, ligne)))) for ligne in points]
+
+
+def _executer_point(tache: dict) -> dict:
+    """
+    Simule un point du balayage (fonction de niveau module pour le pool)
+
+    Returns:
+        Ligne du tableau de résultats (clés = COLONNES)
+    """
+    point = tache["point"]
+    config = ConfigurationFeux(duree_vert_a=point['T_A'], duree_vert_b=point['T_B'],
+                               duree_jaune=point['T_jaune'], duree_pietons=point['T_pietons'])
+    debut = time.perf_counter()
+    collecteur = executer_simulation(
+        duree_simulation=tache["duree_simulation"],
+        lambda_a=point['lambda_a'],
+        lambda_b=point['lambda_b'],
+        config_feux=config,
+        mode_silencieux=True,
+        graine=tache["graine"],
+        dossier_resultats=None,
+        moteur=tache["moteur"],
+        cache=tache.get("cache")
+    )
+    ligne = {
+        'id': tache["id"],
+        **point,
+        'graine': tache["graine"],
+        'duree_simulation': tache["duree_simulation"],
+        'moteur': tache["moteur"],
+    }
+    for voie in ('voie_a', 'voie_b'):
+        stats = collecteur.donnees['empirique'][voie]
+        for cle in INDICATEURS_VOIE:
+            ligne[f"{voie}_{cle}"] = stats.get(cle, '')
+        theorique = collecteur.donnees['theorique'][voie]
+        for cle in INDICATEURS_THEORIQUES:
+            valeur = theorique.get(cle)
+            ligne[f"{voie}_{cle}"] = '' if valeur is None else valeur
+    ligne['duree_calcul'] = time.perf_counter() - debut
+    return ligne
+
+
+def identifiants_termines(chemin: str) -> Set[str]:
+    """
+    Identifiants déjà présents dans un CSV de résultats
+
+    Une dernière ligne tronquée (arrêt brutal pendant l'écriture) est
+    supprimée du fichier pour que la reprise reparte sur une ligne propre,
+    seulement si l'en-tête est celui du balayage (jamais un autre CSV).
+    """
+    if not os.path.exists(chemin):
+        return set()
+    with open(chemin, 'rb+') as f:
+        contenu = f.read()
+        if contenu and not contenu.endswith(b'\n') and _entete(contenu) == COLONNES:
+            f.truncate(contenu.rfind(b'\n') + 1)
+    with open(chemin, newline='', encoding='utf-8') as f:
+        return {ligne['id'] for ligne in csv.DictReader(f) if ligne.get('id')}
+
+
+def _entete(contenu: bytes) -> List[str]:
+    """Colonnes de la première ligne (complète) d'un CSV lu en octets"""
+    if b'\n' not in contenu:
+        return []
+    premiere = contenu[:contenu.index(b'\n')].decode('utf-8', errors='replace')
+    return next(csv.reader([premiere.rstrip('\r')]), [])
+
+
+def graine_enregistree(chemin: str) -> Optional[int]:
+    """Graine commune d'un balayage déjà commencé (None si le CSV est vide)"""
+    if not os.path.exists(chemin):
+        return None
+    with open(chemin, newline='', encoding='utf-8') as f:
+        premiere = next(csv.DictReader(f), None)
+    return int(premiere['graine']) if premiere else None
+
+
+def verifier_reprise(chemin: str, duree_simulation: float, moteur: str,
+                     graine: Optional[int] = None):
+    """
+    Refuse de compléter un CSV écrit avec d'autres réglages
+
+    Les identifiants ne portent que sur les paramètres balayés : reprendre
+    avec une autre durée, un autre moteur ou une autre graine sauterait les
+    points déjà présents et mélangerait des lignes incomparables. Un en-tête
+    différent de COLONNES (CSV d'une version antérieure) décalerait les
+    colonnes des nouvelles lignes.
+
+    Raises:
+        ValueError: En-tête ou réglage différent de ceux du CSV
+    """
+    if not os.path.exists(chemin):
+        return
+    with open(chemin, newline='', encoding='utf-8') as f:
+        contenu = f.read()
+    # Une dernière ligne tronquée n'est pas un réglage enregistré
+    lecteur = csv.reader(io.StringIO(contenu[:contenu.rfind('\n') + 1]))
+    entete = next(lecteur, None)
+    premiere = next(lecteur, None)
+    if entete is None:
+        return
+    if entete != COLONNES:
+        raise ValueError(f"{chemin} : colonnes différentes de celles du balayage "
+                         f"actuel, choisir un autre fichier de sortie")
+    if premiere is None:
+        return
+    enregistres = dict(zip(entete, premiere))
+    differences = []
+    if float(enregistres['duree_simulation']) != float(duree_simulation):
+        differences.append(f"durée {enregistres['duree_simulation']} ≠ {duree_simulation}")
+    if enregistres['moteur'] != moteur:
+        differences.append(f"moteur {enregistres['moteur']} ≠ {moteur}")
+    if graine is not None and int(enregistres['graine']) != graine:
+        differences.append(f"graine {enregistres['graine']} ≠ {graine}")
+    if differences:
+        raise ValueError(f"{chemin} a été produit avec d'autres réglages "
+                         f"({', '.join(differences)}), choisir un autre fichier de sortie")
+
+
+def afficher_progression(termines: int, total: Optional[int], simules: int, ecoule: float):
+    """Rappel de progression par défaut (une ligne sur la sortie standard)"""
+    debit = simules / ecoule if ecoule > 0 else 0.0
+    if total:
+        restant = (total - termines) / debit if debit > 0 else float('inf')
+        print(f"\r⏳ {termines}/{total} points ({termines / total:.1%}) | "
+              f"{debit:.1f} points/s | reste ≈ {restant:.0f}s", end='', flush=True)
+    else:
+        print(f"\r⏳ {termines} points | {debit:.1f} points/s", end='', flush=True)
+
+
+def executer_balayage(
+    points: Iterable[Dict[str, float]],
+    chemin_csv: str,
+    duree_simulation: float = 600.0,
+    graine: Optional[int] = None,
+    moteur: str = 'simpy',
+    nb_processus: Optional[int] = None,
+    nb_points: Optional[int] = None,
+    rappel_progression: Optional[Callable[[int, Optional[int], int, float], None]] = afficher_progression,
+    intervalle_progression: float = 1.0,
+    cache: Optional[CacheResultats] = None
+) -> int:
+    """
+    Exécute un balayage en parallèle, avec reprise
+
+    Les lignes sont ajoutées au CSV dans l'ordre de terminaison. Les points
+    dont l'identifiant figure déjà dans le CSV sont sautés ; le CSV doit
+    avoir été produit avec les mêmes réglages (verifier_reprise).
+
+    Args:
+        points: Points à simuler (grille() ou hypercube_latin())
+        chemin_csv: Tableau de résultats (créé ou complété)
+        duree_simulation: Horizon de chaque point (secondes)
+        graine: Graine commune à tous les points. Si None, la graine déjà
+                enregistrée dans le CSV est reprise, sinon une graine est tirée
+        moteur: 'simpy' ou 'cycles' (recommandé pour les grands balayages)
+        nb_processus: Processus utilisés (tous les cœurs si None)
+        nb_points: Nombre total de points, pour la progression (facultatif)
+        rappel_progression: Appelé avec (points terminés y compris ceux d'une
+                            exécution précédente, total, points simulés par
+                            cet appel, secondes écoulées)
+        intervalle_progression: Secondes minimales entre deux rappels
+        cache: Cache disque des résultats (points déjà simulés par un autre
+               balayage avec la même graine)
+
+    Returns:
+        Nombre de points simulés par cet appel
+
+    Raises:
+        ValueError: Moteur inconnu, ou CSV existant produit avec d'autres
+                    colonnes, durée, moteur ou graine
+    """
+    if moteur not in MOTEURS:
+        raise ValueError(f"Moteur inconnu : {moteur} (choix : {', '.join(MOTEURS)})")
+
+    verifier_reprise(chemin_csv, duree_simulation, moteur, graine)
+    deja_faits = identifiants_termines(chemin_csv)
+    if graine is None:
+        graine = graine_enregistree(chemin_csv)
+    graine = FluxAleatoires(graine).graine
+
+    def taches():
+        for point in points:
+            identifiant = identifiant_point(point)
+            if identifiant not in deja_faits:
+                yield {
+                    "id": identifiant,
+                    "point": point,
+                    "graine": graine,
+                    "duree_simulation": duree_simulation,
+                    "moteur": moteur,
+                    "cache": cache
+                }
+
+    dossier = os.path.dirname(chemin_csv)
+    if dossier:
+        os.makedirs(dossier, exist_ok=True)
+    nouveau = not os.path.exists(chemin_csv) or os.path.getsize(chemin_csv) == 0
+
+    termines = len(deja_faits)
+    simules = 0
+    debut = time.perf_counter()
+    dernier_rappel = -float('inf')
+    with open(chemin_csv, 'a', newline='', encoding='utf-8') as f:
+        ecrivain = csv.DictWriter(f, fieldnames=COLONNES)
+        if nouveau:
+            ecrivain.writeheader()
+        for _, ligne in executer_en_parallele(_executer_point, taches(), nb_processus):
+            ecrivain.writerow(ligne)
+            f.flush()
+            termines += 1
+            simules += 1
+            maintenant = time.perf_counter()
+            if rappel_progression is not None and maintenant - dernier_rappel >= intervalle_progression:
+                rappel_progression(termines, nb_points, simules, maintenant - debut)
+                dernier_rappel = maintenant
+
+    if rappel_progression is not None:
+        rappel_progression(termines, nb_points, simules, time.perf_counter() - debut)
+        if rappel_progression is afficher_progression:
+            print()
+    return simules
+
+
+def _lire_plage(texte: str) -> List[float]:
+    """
+    Interprète une plage de la ligne de commande
+
+    '0.3' → [0.3] ; '0.1,0.2,0.4' → liste ; 'min:max:n' → n valeurs
+    régulières ; 'min:max' → bornes (hypercube latin)
+    """
+    if ':' in texte:
+        morceaux = [float(x) for x in texte.split(':')]
+        if len(morceaux) == 3:
+            return list(np.linspace(morceaux[0], morceaux[1], int(morceaux[2])))
+        if len(morceaux) == 2:
+            return morceaux
+        raise argparse.ArgumentTypeError(f"Plage invalide : {texte}")
+    return [float(x) for x in texte.split(',')]
+
+
+def main(arguments: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Balayage de paramètres de la simulation")
+    parser.add_argument('--sortie', default=os.path.join('..', 'results', 'balayage.csv'),
+                        help="fichier CSV des résultats (complété en cas de reprise)")
+    parser.add_argument('--mode', choices=('grille', 'hypercube'), default='grille')
+    parser.add_argument('--points', type=int, default=100,
+                        help="nombre de points de l'hypercube latin")
+    for nom in PARAMETRES_BALAYES:
+        option = '--' + nom.replace('_', '-')
+        parser.add_argument(option, dest=nom, type=_lire_plage, default=None,
+                            help=f"valeur, liste 'a,b,c', plage 'min:max:n' ou bornes 'min:max' "
+                                 f"(défaut {PARAMETRES_BALAYES[nom]})")
+    parser.add_argument('--duree', type=float, default=600.0, help="horizon de chaque point (s)")
+    parser.add_argument('--graine', type=int, default=None)
+    parser.add_argument('--moteur', choices=MOTEURS, default='simpy')
+    parser.add_argument('--processus', type=int, default=None)
+    parser.add_argument('--cache', default=None, metavar='DOSSIER',
+                        help="cache disque des résultats (voir cache_resultats.py)")
+    args = parser.parse_args(arguments)
+
+    plages = {nom: getattr(args, nom) for nom in PARAMETRES_BALAYES
+              if getattr(args, nom) is not None}
+    # Graine fixée (ou reprise du CSV) : le plan et les simulations sont rejouables
+    graine = args.graine if args.graine is not None else graine_enregistree(args.sortie)
+    graine = FluxAleatoires(graine).graine
+
+    if args.mode == 'grille':
+        nb_points = int(np.prod([len(valeurs) for valeurs in plages.values()]))
+        points = grille(plages)
+    else:
+        bornes = {}
+        for nom, valeurs in plages.items():
+            if len(valeurs) not in (1, 2):
+                parser.error(f"--{nom.replace('_', '-')} : bornes 'min:max' attendues")
+            bornes[nom] = (min(valeurs), max(valeurs))
+        nb_points = args.points
+        points = hypercube_latin(bornes, nb_points, graine)
+
+    print(f"🧮 Balayage ({args.mode}) : {nb_points} points → {args.sortie}")
+    try:
+        simules = executer_balayage(points, args.sortie, duree_simulation=args.duree,
+                                    graine=graine, moteur=args.moteur,
+                                    nb_processus=args.processus, nb_points=nb_points,
+                                    cache=CacheResultats(args.cache) if args.cache else None)
+    except ValueError as erreur:
+        parser.error(str(erreur))
+    print(f"✅ {simules} point(s) simulé(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+CACHE_RESULTATS.PY - Cache disque des résultats de simulation
+Responsable : Sarah
+Projet : Simulation de Feux de Circulation
+
+Adressage par contenu : la clé d'une simulation est l'empreinte SHA-256 du
+JSON canonique de tout ce qui détermine son résultat (configuration des
+feux, λ, horizon, graine, moteur, options, VERSION_MOTEUR de main.py).
+La valeur est le contenu de CollecteurDonnees.donnees, en JSON.
+
+- écriture atomique (fichier temporaire puis os.replace) : plusieurs
+  processus du pool peuvent partager le même cache
+- LRU : une lecture remet la date du fichier à maintenant ; au-delà de la
+  taille maximale, les fichiers les plus anciens sont supprimés
+- seules les simulations avec graine sont mises en cache (sans graine,
+  deux exécutions n'ont pas à donner le même résultat)
+
+⚠️ Incrémenter VERSION_MOTEUR (main.py) dès qu'une modification change
+   les résultats : toutes les anciennes entrées deviennent inaccessibles.
+
+Usage :
+    python cache_resultats.py info  [--dossier ../results/cache]
+    python cache_resultats.py vider [--dossier ../results/cache]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+
+DOSSIER_CACHE_DEFAUT = os.path.join('..', 'results', 'cache')
+TAILLE_MAX_DEFAUT = 500 * 1024 * 1024  # 500 Mo
+
+
+def cle_cache(parametres: dict) -> str:
+    """
+    Empreinte SHA-256 d'un jeu de paramètres
+
+    Le JSON est canonique (clés triées, séparateurs fixes) : deux
+    dictionnaires égaux donnent toujours la même clé.
+    """
+    canonique = json.dumps(parametres, sort_keys=True, separators=(',', ':'),
+                           ensure_ascii=True, default=str)
+    return hashlib.sha256(canonique.encode('utf-8')).hexdigest()
+
+
+class CacheResultats:
+    """
+    Cache disque LRU de résultats de simulation (un fichier JSON par clé)
+
+    L'objet ne contient que le dossier et la limite : il se transmet sans
+    frais aux processus du pool.
+    """
+
+    def __init__(self, dossier: str = DOSSIER_CACHE_DEFAUT,
+                 taille_max: int = TAILLE_MAX_DEFAUT):
+        """
+        Args:
+            dossier: Dossier des entrées (créé au besoin)
+            taille_max: Taille totale maximale en octets
+        """
+        self.dossier = dossier
+        self.taille_max = taille_max
+        self._taille_estimee: Optional[int] = None  # Évite un parcours par écriture
+
+    def _chemin(self, cle: str) -> str:
+        return os.path.join(self.dossier, f"{cle}.json")
+
+    def lire(self, cle: str) -> Optional[dict]:
+        """Retourne les données en cache (None si absentes) et les marque récentes"""
+        chemin = self._chemin(cle)
+        try:
+            with open(chemin, encoding='utf-8') as f:
+                donnees = json.load(f)
+            os.utime(chemin)
+        except (FileNotFoundError, json.JSONDecodeError):
+            # Absente, évincée entre-temps ou écriture interrompue
+            return None
+        return donnees
+
+    def ecrire(self, cle: str, donnees: dict):
+        """Enregistre des données (écriture atomique) puis applique la limite de taille"""
+        os.makedirs(self.dossier, exist_ok=True)
+        descripteur, temporaire = tempfile.mkstemp(dir=self.dossier, suffix='.tmp')
+        try:
+            with os.fdopen(descripteur, 'w', encoding='utf-8') as f:
+                json.dump(donnees, f, ensure_ascii=False)
+            os.replace(temporaire, self._chemin(cle))
+        except BaseException:
+            if os.path.exists(temporaire):
+                os.remove(temporaire)
+            raise
+
+        if self._taille_estimee is None:
+            self._taille_estimee = self.taille()
+        else:
+            self._taille_estimee += os.path.getsize(self._chemin(cle))
+        if self._taille_estimee > self.taille_max:
+            self.evincer()
+
+    def invalider(self, cle: str) -> bool:
+        """Supprime une entrée ; retourne True si elle existait"""
+        try:
+            os.remove(self._chemin(cle))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _entrees(self) -> List[Tuple[float, int, str]]:
+        """(date d'accès, taille, chemin) de chaque entrée"""
+        if not os.path.isdir(self.dossier):
+            return []
+        entrees = []
+        with os.scandir(self.dossier) as iterateur:
+            for entree in iterateur:
+                if entree.name.endswith('.json'):
+                    try:
+                        infos = entree.stat()
+                    except FileNotFoundError:
+                        continue
+                    entrees.append((infos.st_mtime, infos.st_size, entree.path))
+        return entrees
+
+    def parcourir(self) -> Iterator[dict]:
+        """Données de chaque entrée, sans les marquer récentes"""
+        for _, _, chemin in self._entrees():
+            try:
+                with open(chemin, encoding='utf-8') as f:
+                    yield json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+
+    def taille(self) -> int:
+        """Taille totale des entrées (octets)"""
+        return sum(taille for _, taille, _ in self._entrees())
+
+    def nombre_entrees(self) -> int:
+        return len(self._entrees())
+
+    def evincer(self, taille_cible: Optional[int] = None) -> int:
+        """
+        Supprime les entrées les moins récemment utilisées
+
+        Args:
+            taille_cible: Taille à atteindre (90 % de taille_max par défaut,
+                          pour ne pas évincer à chaque écriture)
+
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        if taille_cible is None:
+            taille_cible = int(0.9 * self.taille_max)
+        entrees = sorted(self._entrees())
+        total = sum(taille for _, taille, _ in entrees)
+        supprimees = 0
+        for _, taille, chemin in entrees:
+            if total <= taille_cible:
+                break
+            try:
+                os.remove(chemin)
+                supprimees += 1
+            except FileNotFoundError:
+                pass  # Déjà évincée par un autre processus
+            total -= taille
+        self._taille_estimee = total
+        return supprimees
+
+    def vider(self) -> int:
+        """Supprime toutes les entrées ; retourne leur nombre"""
+        return self.evincer(taille_cible=0)
+
+
+def main(arguments: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Gestion du cache des résultats de simulation")
+    parser.add_argument('commande', choices=('info', 'vider'))
+    parser.add_argument('--dossier', default=DOSSIER_CACHE_DEFAUT)
+    args = parser.parse_args(arguments)
+
+    cache = CacheResultats(args.dossier)
+    if args.commande == 'vider':
+        print(f"🗑️  {cache.vider()} entrée(s) supprimée(s) de {args.dossier}")
+    else:
+        print(f"📦 {args.dossier} : {cache.nombre_entrees()} entrée(s), "
+              f"{cache.taille() / 1e6:.2f} Mo / {cache.taille_max / 1e6:.0f} Mo")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
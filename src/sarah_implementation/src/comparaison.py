@@ -0,0 +1,196 @@
+"""
+COMPARAISON.PY - Comparaison de configurations de feux par nombres aléatoires communs
+Responsable : Sarah
+Projet : Simulation de Feux de Circulation
+
+Chaque configuration est simulée contre les MÊMES arrivées : la réplication
+n°i de toutes les configurations utilise la séquence fille n°i de la graine
+(les flux arrivees_a / arrivees_b ne dépendent pas des feux). Les écarts
+entre configurations sont alors estimés par différences appariées
+D_i = X_i(config) - X_i(référence), dont la variance est bien plus faible
+que celle de deux séries indépendantes quand X(config) et X(référence)
+sont positivement corrélées.
+
+Usage :
+    python comparaison.py
+"""
+
+from typing import Dict, Optional
+
+from feux import ConfigurationFeux
+from aleatoire import FluxAleatoires
+from statistiques import AccumulateurWelford
+from parallele import executer_en_parallele
+from main import MOTEURS, executer_replication, tache_replication
+
+
+# Indicateurs comparés par voie (format Intersection.obtenir_statistiques)
+INDICATEURS_COMPARES = ('temps_attente_moyen', 'nombre_moyen_systeme', 'debit')
+
+
+def _indicateurs(stats_intersection: dict) -> Dict[str, float]:
+    """
+    Aplatit les indicateurs comparés d'une réplication
+
+    Ajoute 'global.temps_attente_moyen' : W_q pondéré par les véhicules servis.
+    """
+    valeurs = {}
+    for voie in ('voie_a', 'voie_b'):
+        for cle in INDICATEURS_COMPARES:
+            valeurs[f"{voie}.{cle}"] = stats_intersection[voie][cle]
+    servis_a = stats_intersection['voie_a']['vehicules_servis']
+    servis_b = stats_intersection['voie_b']['vehicules_servis']
+    servis = servis_a + servis_b
+    valeurs['global.temps_attente_moyen'] = (
+        (stats_intersection['voie_a']['temps_attente_moyen'] * servis_a +
+         stats_intersection['voie_b']['temps_attente_moyen'] * servis_b) / servis
+        if servis else 0.0)
+    return valeurs
+
+
+def comparer_configurations(
+    configurations: Dict[str, ConfigurationFeux],
+    lambda_a: float = 0.3,
+    lambda_b: float = 0.3,
+    duree_simulation: float = 600.0,
+    nb_replications: int = 20,
+    reference: Optional[str] = None,
+    graine: Optional[int] = None,
+    moteur: str = 'simpy',
+    nb_processus: Optional[int] = None,
+    nombres_aleatoires_communs: bool = True
+) -> dict:
+    """
+    Compare des configurations de feux par différences appariées
+
+    Les réplications sont réparties sur plusieurs cœurs ; les résultats
+    d'une réplication sont agrégés dès que toutes les configurations l'ont
+    simulée (mémoire indépendante du nombre de réplications).
+
+    Args:
+        configurations: Configurations à comparer, par nom
+        lambda_a/b: Taux d'arrivée (véhicules/seconde)
+        duree_simulation: Horizon de chaque réplication (secondes)
+        nb_replications: Nombre de réplications (au moins 2)
+        reference: Nom de la configuration de référence (la première si None)
+        graine: Graine commune (tirée au hasard si None, enregistrée)
+        moteur: 'simpy' ou 'cycles'
+        nb_processus: Processus utilisés (tous les cœurs si None)
+        nombres_aleatoires_communs: Si False, chaque configuration reçoit
+                                    ses propres arrivées (comparaison naïve,
+                                    pour mesurer le gain)
+
+    Returns:
+        Dictionnaire JSON-sérialisable :
+        - parametres : graine, λ, horizon, réplications, référence
+        - configurations : par nom et indicateur, moyenne/écart-type/IC à 95%
+        - differences : par configuration (hors référence) et indicateur,
+          moyenne/écart-type/IC à 95% de config - référence, plus
+          'reduction_variance' = (s²_config + s²_ref) / s²_différence
+          (≈ 1 sans nombres aléatoires communs, None si différences constantes)
+    """
+    if moteur not in MOTEURS:
+        raise ValueError(f"Moteur inconnu : {moteur} (choix : {', '.join(MOTEURS)})")
+    if len(configurations) < 2:
+        raise ValueError("Il faut au moins deux configurations à comparer")
+    if nb_replications < 2:
+        raise ValueError("Il faut au moins deux réplications pour un intervalle de confiance")
+    noms = list(configurations)
+    if reference is None:
+        reference = noms[0]
+    if reference not in configurations:
+        raise ValueError(f"Configuration de référence inconnue : {reference}")
+
+    # Même entropie pour toutes les tâches (tirée une fois si graine=None)
+    graine_effective = FluxAleatoires(graine).graine
+
+    def indice_flux(replication: int, k: int) -> int:
+        if nombres_aleatoires_communs:
+            return replication
+        return replication * len(noms) + k
+
+    taches = [tache_replication(graine_effective, indice_flux(replication, k), duree_simulation,
+                                lambda_a, lambda_b, configurations[nom], moteur)
+              for replication in range(nb_replications) for k, nom in enumerate(noms)]
+
+    par_configuration: Dict[str, Dict[str, AccumulateurWelford]] = {nom: {} for nom in noms}
+    par_difference: Dict[str, Dict[str, AccumulateurWelford]] = {
+        nom: {} for nom in noms if nom != reference}
+    en_attente: Dict[int, Dict[str, Dict[str, float]]] = {}
+
+    for indice, (stats, _) in executer_en_parallele(executer_replication, taches, nb_processus):
+        replication, k = divmod(indice, len(noms))
+        resultats = en_attente.setdefault(replication, {})
+        resultats[noms[k]] = _indicateurs(stats)
+        if len(resultats) < len(noms):
+            continue
+
+        # Réplication complète : on agrège puis on oublie
+        del en_attente[replication]
+        valeurs_reference = resultats[reference]
+        for nom, valeurs in resultats.items():
+            for cle, valeur in valeurs.items():
+                par_configuration[nom].setdefault(cle, AccumulateurWelford()).ajouter(valeur)
+                if nom != reference:
+                    par_difference[nom].setdefault(cle, AccumulateurWelford()).ajouter(
+                        valeur - valeurs_reference[cle])
+
+    differences = {}
+    for nom, accumulateurs in par_difference.items():
+        differences[nom] = {}
+        for cle, acc in accumulateurs.items():
+            variance_independante = (par_configuration[nom][cle].variance +
+                                     par_configuration[reference][cle].variance)
+            differences[nom][cle] = {
+                **acc.to_dict(),
+                'reduction_variance': (variance_independante / acc.variance
+                                       if acc.variance > 0 else None)
+            }
+
+    return {
+        'parametres': {
+            'graine': graine_effective,
+            'lambda_a': lambda_a,
+            'lambda_b': lambda_b,
+            'duree_simulation': duree_simulation,
+            'nb_replications': nb_replications,
+            'moteur': moteur,
+            'reference': reference,
+            'nombres_aleatoires_communs': nombres_aleatoires_communs,
+            'configurations': {nom: config.to_dict() for nom, config in configurations.items()}
+        },
+        'configurations': {nom: {cle: acc.to_dict() for cle, acc in accumulateurs.items()}
+                           for nom, accumulateurs in par_configuration.items()},
+        'differences': differences
+    }
+
+
+def afficher_comparaison(resultats: dict, indicateur: str = 'global.temps_attente_moyen'):
+    """Affiche les différences appariées d'un indicateur"""
+    reference = resultats['parametres']['reference']
+    print(f"\n📊 {indicateur} : différence avec '{reference}' "
+          f"({resultats['parametres']['nb_replications']} réplications appariées)")
+    print("─" * 70)
+    for nom, differences in resultats['differences'].items():
+        d = differences[indicateur]
+        ic = d['ic_95']
+        verdict = ("≈ indiscernable" if ic[0] <= 0 <= ic[1]
+                   else "✅ meilleure" if ic[1] < 0 else "❌ moins bonne")
+        # Pas de réduction de variance si les différences sont constantes
+        reduction = ("" if d['reduction_variance'] is None
+                     else f"variance ÷{d['reduction_variance']:.1f}  ")
+        print(f"   {nom:<12} {d['moyenne']:+7.2f}  IC 95% [{ic[0]:+.2f} ; {ic[1]:+.2f}]  "
+              f"{reduction}{verdict}")
+
+
+# Démonstration : les trois réglages des scénarios de Khaoula, à λ égal
+if __name__ == "__main__":
+    configurations = {
+        '30/25': ConfigurationFeux(duree_vert_a=30, duree_vert_b=25, duree_pietons=15),
+        '28/28': ConfigurationFeux(duree_vert_a=28, duree_vert_b=28, duree_pietons=14),
+        '40/20': ConfigurationFeux(duree_vert_a=40, duree_vert_b=20, duree_pietons=15),
+    }
+    resultats = comparer_configurations(configurations, lambda_a=0.3, lambda_b=0.3,
+                                        duree_simulation=3600, nb_replications=30,
+                                        graine=2024)
+    afficher_comparaison(resultats)
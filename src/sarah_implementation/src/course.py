@@ -0,0 +1,253 @@
+"""
+COURSE.PY - Course (« racing ») entre configurations de feux
+Responsable : Sarah
+Projet : Simulation de Feux de Circulation
+
+Toutes les configurations encore en course sont simulées par manches sur
+les MÊMES réplications (séquence fille n°i de la graine) : chaque
+réplication est un bloc du test de Friedman (F-Race).
+
+- à partir de nb_blocs_min blocs, test de Friedman sur les rangs de W_q
+  pondéré ; s'il rejette l'égalité (seuil alpha), comparaisons multiples
+  avec le meilleur candidat (Conover) : les candidats significativement
+  moins bons sont éliminés. À deux candidats : test des rangs signés de
+  Wilcoxon.
+- le budget total de réplications est fixé : une manche dépense toujours
+  à peu près le même nombre de réplications, réparties entre les
+  survivants. Les réplications économisées sur les éliminés reviennent
+  donc aux survivants.
+
+Usage :
+    python course.py
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+from scipy import stats as sp_stats
+
+from feux import ConfigurationFeux, nom_configuration
+from aleatoire import FluxAleatoires
+from statistiques import AccumulateurWelford
+from parallele import executer_en_parallele
+from cache_resultats import CacheResultats
+from main import MOTEURS, executer_replication, tache_replication
+from optimiseur import objectif_pondere
+
+
+def friedman_conover(valeurs: np.ndarray, alpha: float = 0.05) -> dict:
+    """
+    Test de Friedman puis comparaisons avec le meilleur (minimisation)
+
+    Args:
+        valeurs: Tableau blocs × candidats (plus petit = meilleur)
+        alpha: Seuil des tests
+
+    Returns:
+        statistique, p_valeur, sommes_rangs et domines (indices des
+        candidats significativement moins bons que le meilleur ; vide si
+        le test global ne rejette pas)
+    """
+    b, k = valeurs.shape
+    rangs = np.apply_along_axis(sp_stats.rankdata, 1, valeurs)
+    sommes_rangs = rangs.sum(axis=0)
+    A = np.sum(rangs ** 2)
+    C = b * k * (k + 1) ** 2 / 4
+    resultat = {'statistique': 0.0, 'p_valeur': 1.0,
+                'sommes_rangs': sommes_rangs.tolist(), 'domines': []}
+    if A <= C:  # Toutes les valeurs égales dans chaque bloc
+        return resultat
+
+    # Statistique corrigée des ex aequo (Conover)
+    statistique = (k - 1) * np.sum((sommes_rangs - b * (k + 1) / 2) ** 2) / (A - C)
+    resultat['statistique'] = float(statistique)
+    resultat['p_valeur'] = float(sp_stats.chi2.sf(statistique, k - 1))
+    if resultat['p_valeur'] >= alpha:
+        return resultat
+
+    meilleur = int(np.argmin(sommes_rangs))
+    denominateur = math.sqrt(2 * (b * A - np.sum(sommes_rangs ** 2)) / ((b - 1) * (k - 1)))
+    seuil = sp_stats.t.ppf(1 - alpha / 2, (b - 1) * (k - 1))
+    if denominateur > 0:
+        resultat['domines'] = [j for j in range(k) if j != meilleur and
+                               (sommes_rangs[j] - sommes_rangs[meilleur]) / denominateur > seuil]
+    return resultat
+
+
+def wilcoxon_signes(valeurs: np.ndarray, alpha: float = 0.05) -> dict:
+    """Test des rangs signés entre deux candidats (même format que friedman_conover)"""
+    differences = valeurs[:, 0] - valeurs[:, 1]
+    resultat = {'statistique': 0.0, 'p_valeur': 1.0,
+                'sommes_rangs': None, 'domines': []}
+    if not np.any(differences != 0):
+        return resultat
+    test = sp_stats.wilcoxon(differences)
+    resultat['statistique'] = float(test.statistic)
+    resultat['p_valeur'] = float(test.pvalue)
+    if test.pvalue < alpha:
+        resultat['domines'] = [0 if np.mean(differences) > 0 else 1]
+    return resultat
+
+
+def executer_course(
+    candidats: Union[Dict[str, ConfigurationFeux], Sequence[ConfigurationFeux]],
+    lambda_a: float = 0.3,
+    lambda_b: float = 0.3,
+    duree_simulation: float = 600.0,
+    budget_replications: Optional[int] = None,
+    replications_par_manche: int = 1,
+    nb_blocs_min: int = 5,
+    alpha: float = 0.05,
+    graine: Optional[int] = None,
+    moteur: str = 'simpy',
+    nb_processus: Optional[int] = None,
+    cache: Optional[CacheResultats] = None,
+    rappel_manche=None
+) -> dict:
+    """
+    Élimine par manches les configurations statistiquement dominées
+
+    Args:
+        candidats: Configurations par nom, ou liste (nommées 'T_A/T_B/T_pietons')
+        lambda_a/b: Taux d'arrivée (véhicules/seconde)
+        duree_simulation: Horizon de chaque réplication (secondes)
+        budget_replications: Réplications au total (20 par candidat si None)
+        replications_par_manche: Réplications par candidat à la première
+                                 manche ; le budget d'une manche (ce nombre ×
+                                 nombre initial de candidats) est ensuite
+                                 partagé entre les survivants
+        nb_blocs_min: Réplications communes avant le premier test
+        alpha: Seuil des tests d'élimination
+        graine: Graine commune (tirée au hasard si None)
+        moteur: 'simpy' ou 'cycles'
+        nb_processus: Processus utilisés (tous les cœurs si None)
+        cache: Cache disque des réplications (utilisé si graine est fixée)
+        rappel_manche: Fonction (manche, survivants, elimines) appelée après
+                       chaque manche, ou None
+
+    Returns:
+        Dictionnaire JSON-sérialisable :
+        - parametres : λ, horizon, graine, budget, alpha
+        - survivants : du meilleur au moins bon, avec n, moyenne, écart-type
+          et IC à 95% du W_q pondéré
+        - eliminations : nom, manche, réplications reçues, p-valeur du test
+        - replications : réplications reçues par candidat
+        - manches, replications_utilisees, replications_uniformes (part de
+          chacun sans course) et raison_arret ('vainqueur', 'budget')
+    """
+    if moteur not in MOTEURS:
+        raise ValueError(f"Moteur inconnu : {moteur} (choix : {', '.join(MOTEURS)})")
+    if isinstance(candidats, dict):
+        configurations = dict(candidats)
+    else:
+        configurations = {nom_configuration(config): config for config in candidats}
+    if len(configurations) < 2:
+        raise ValueError("Il faut au moins deux configurations en course")
+    noms = list(configurations)
+    if budget_replications is None:
+        budget_replications = 20 * len(noms)
+    if budget_replications < nb_blocs_min * len(noms):
+        raise ValueError(f"Budget insuffisant : {nb_blocs_min} réplications par candidat "
+                         f"avant le premier test, soit {nb_blocs_min * len(noms)}")
+
+    graine_effective = FluxAleatoires(graine).graine
+    budget_manche = replications_par_manche * len(noms)
+    valeurs: Dict[str, List[float]] = {nom: [] for nom in noms}
+    survivants = list(noms)
+    eliminations = []
+    utilisees = 0
+    nb_blocs = 0
+    manche = 0
+
+    while len(survivants) > 1 and utilisees < budget_replications:
+        manche += 1
+        restant = (budget_replications - utilisees) // len(survivants)
+        if restant == 0:
+            break
+        # Avant le premier test, tous reçoivent nb_blocs_min réplications
+        nouveaux = max(budget_manche // len(survivants), 1)
+        if nb_blocs < nb_blocs_min:
+            nouveaux = max(nouveaux, nb_blocs_min - nb_blocs)
+        nouveaux = min(nouveaux, restant)
+
+        indices = range(nb_blocs, nb_blocs + nouveaux)
+        taches = [tache_replication(graine_effective, indice, duree_simulation, lambda_a,
+                                    lambda_b, configurations[nom], moteur,
+                                    cache=cache if graine is not None else None)
+                  for nom in survivants for indice in indices]
+        resultats_manche = [None] * len(taches)
+        for k, (stats, _) in executer_en_parallele(executer_replication, taches, nb_processus):
+            resultats_manche[k] = objectif_pondere(stats, lambda_a, lambda_b)
+        for i, nom in enumerate(survivants):
+            valeurs[nom].extend(resultats_manche[i * nouveaux:(i + 1) * nouveaux])
+        utilisees += len(taches)
+        nb_blocs += nouveaux
+
+        if nb_blocs < nb_blocs_min:
+            continue
+        matrice = np.array([valeurs[nom][:nb_blocs] for nom in survivants]).T
+        test = (friedman_conover if len(survivants) > 2 else wilcoxon_signes)(matrice, alpha)
+        elimines = [survivants[j] for j in test['domines']]
+        for nom in elimines:
+            eliminations.append({'nom': nom, 'manche': manche,
+                                 'nb_replications': len(valeurs[nom]),
+                                 'p_valeur': test['p_valeur']})
+        survivants = [nom for nom in survivants if nom not in elimines]
+        if rappel_manche is not None:
+            rappel_manche(manche, survivants, elimines)
+
+    accumulateurs = {}
+    for nom in survivants:
+        accumulateurs[nom] = AccumulateurWelford()
+        for valeur in valeurs[nom]:
+            accumulateurs[nom].ajouter(valeur)
+    classement = sorted(survivants, key=lambda nom: accumulateurs[nom].moyenne)
+
+    return {
+        'parametres': {
+            'lambda_a': lambda_a,
+            'lambda_b': lambda_b,
+            'duree_simulation': duree_simulation,
+            'graine': graine_effective,
+            'moteur': moteur,
+            'budget_replications': budget_replications,
+            'alpha': alpha,
+            'configurations': {nom: config.to_dict() for nom, config in configurations.items()}
+        },
+        'survivants': [{'nom': nom, **accumulateurs[nom].to_dict()} for nom in classement],
+        'eliminations': eliminations,
+        'replications': {nom: len(valeurs[nom]) for nom in noms},
+        'manches': manche,
+        'replications_utilisees': utilisees,
+        'replications_uniformes': budget_replications // len(noms),
+        'raison_arret': 'vainqueur' if len(survivants) == 1 else 'budget'
+    }
+
+
+def afficher_manche(manche: int, survivants: List[str], elimines: List[str]):
+    """Rappel par défaut : une ligne par manche avec élimination"""
+    if elimines:
+        print(f"   manche {manche:3d} : {len(elimines)} éliminé(s) "
+              f"({', '.join(elimines)}) → {len(survivants)} en course", flush=True)
+
+
+def afficher_course(resultats: dict):
+    """Affiche les survivants et la répartition des réplications"""
+    print(f"\n🏁 Course terminée ({resultats['raison_arret']}) après {resultats['manches']} manches, "
+          f"{resultats['replications_utilisees']}/{resultats['parametres']['budget_replications']} "
+          f"réplications")
+    for ligne in resultats['survivants']:
+        ic = ligne['ic_95']
+        ic_texte = f"[{ic[0]:.2f} ; {ic[1]:.2f}]" if ic is not None else ""
+        print(f"   {ligne['nom']:<12} W_q pondéré {ligne['moyenne']:6.2f}s  {ic_texte}  "
+              f"{ligne['n']} réplications (au lieu de {resultats['replications_uniformes']})")
+
+
+# Démonstration : 25 répartitions du vert à cycle fixe (λ_A = 0.3, λ_B = 0.2)
+if __name__ == "__main__":
+    candidats = [ConfigurationFeux(duree_vert_a=T_A, duree_vert_b=50 - T_A, duree_pietons=14)
+                 for T_A in range(13, 38)]
+    resultats = executer_course(candidats, lambda_a=0.3, lambda_b=0.2, duree_simulation=1800,
+                                graine=2024, rappel_manche=afficher_manche)
+    afficher_course(resultats)
@@ -0,0 +1,281 @@
+"""
+EVALUATION_MULTI_FIDELITE.PY - Tri de configurations par fidélité croissante
+Responsable : Sarah
+Projet : Simulation de Feux de Circulation
+
+Trois étages, du moins cher au plus cher :
+1. analytique : retard de Webster pondéré par λ (statistiques.retards_feux),
+   vectorisé sur tous les candidats ; une configuration sursaturée (x ≥ 1)
+   n'est jamais promue si d'autres ne le sont pas
+2. cycles : réplications du moteur vectorisé par cycles (mêmes réplications
+   pour tous les candidats, en un seul lot dans le pool)
+3. simpy : executer_simulation complet (réplications, IC à 95%, cache)
+
+Seule la meilleure fraction de chaque étage passe au suivant. Le rapport
+mesure la durée de chaque étage et la compare au coût estimé d'un passage
+de tous les candidats par l'étage 3, estimé sur les candidats réellement
+simulés (pas sur ceux relus du cache).
+
+Usage :
+    python evaluation_multi_fidelite.py
+"""
+
+import math
+import time
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+from scipy import stats as sp_stats
+
+from feux import ConfigurationFeux, nom_configuration
+from aleatoire import FluxAleatoires
+from intersection import DUREE_TRAVERSEE
+from statistiques import retards_feux
+from parallele import executer_en_parallele
+from cache_resultats import CacheResultats
+from main import executer_simulation, executer_replication, tache_replication
+from optimiseur import objectif_pondere
+
+
+ETAGES = ('analytique', 'cycles', 'simpy')
+
+
+def _nombre_promus(nb_candidats: int, fraction: float, nb_max: Optional[int]) -> int:
+    nombre = max(1, math.ceil(fraction * nb_candidats))
+    if nb_max is not None:
+        nombre = min(nombre, nb_max)
+    return min(nombre, nb_candidats)
+
+
+def _correlation_rangs(scores_avant: Dict[str, float], scores_apres: Dict[str, float]) -> Optional[float]:
+    """Corrélation de Spearman entre deux étages, sur les candidats communs"""
+    communs = [nom for nom in scores_apres if nom in scores_avant]
+    if len(communs) < 3:
+        return None
+    rho = sp_stats.spearmanr([scores_avant[nom] for nom in communs],
+                             [scores_apres[nom] for nom in communs])[0]
+    return None if np.isnan(rho) else float(rho)
+
+
+def evaluer_multi_fidelite(
+    candidats: Union[Dict[str, ConfigurationFeux], Sequence[ConfigurationFeux]],
+    lambda_a: float = 0.3,
+    lambda_b: float = 0.3,
+    fraction_analytique: float = 0.25,
+    nb_max_cycles: Optional[int] = None,
+    replications_cycles: int = 5,
+    duree_cycles: float = 3600.0,
+    fraction_cycles: float = 0.25,
+    nb_max_simpy: Optional[int] = 5,
+    replications_simpy: int = 10,
+    duree_simpy: float = 3600.0,
+    graine: Optional[int] = None,
+    nb_processus: Optional[int] = None,
+    cache: Optional[CacheResultats] = None,
+    debit_saturation: float = 1.0 / DUREE_TRAVERSEE
+) -> dict:
+    """
+    Classe des configurations en ne simulant finement que les plus prometteuses
+
+    Budget de chaque étage : fraction des candidats promus (au moins 1,
+    au plus nb_max), nombre de réplications et horizon simulé.
+
+    Args:
+        candidats: Configurations par nom, ou liste (nommées 'T_A/T_B/T_pietons')
+        lambda_a/b: Taux d'arrivée (véhicules/seconde)
+        fraction_analytique: Part des candidats promue de l'étage 1 à l'étage 2
+        nb_max_cycles: Plafond de candidats à l'étage 2 (aucun si None)
+        replications_cycles, duree_cycles: Budget de l'étage 2
+        fraction_cycles: Part promue de l'étage 2 à l'étage 3
+        nb_max_simpy: Plafond de candidats à l'étage 3 (aucun si None)
+        replications_simpy, duree_simpy: Budget de l'étage 3 (au moins 2
+                                         réplications pour un IC)
+        graine: Graine commune aux étages 2 et 3 (tirée au hasard si None)
+        nb_processus: Processus utilisés (tous les cœurs si None)
+        cache: Cache disque des résultats de l'étage 3 (candidats relus
+               comptés dans etages['simpy']['nb_lectures_cache'])
+        debit_saturation: Débit de saturation du modèle de Webster (véh/s)
+
+    Returns:
+        Dictionnaire JSON-sérialisable :
+        - parametres : λ, graine, budgets
+        - etages : par étage, candidats entrants, promus, scores (W_q
+          pondéré par λ, secondes), simulations, durée de calcul
+        - classement : candidats de l'étage 3, du meilleur au moins bon,
+          avec moyenne et IC à 95% du W_q pondéré
+        - rapport : durée totale, durée estimée « tout SimPy », économie,
+          accélération (None si tout l'étage 3 vient du cache) et
+          corrélation des rangs entre étages successifs
+    """
+    if isinstance(candidats, dict):
+        configurations = dict(candidats)
+    else:
+        configurations = {nom_configuration(config): config for config in candidats}
+    if not configurations:
+        raise ValueError("Aucun candidat à évaluer")
+    if replications_simpy < 2:
+        raise ValueError("Il faut au moins deux réplications SimPy pour un intervalle de confiance")
+    graine_effective = FluxAleatoires(graine).graine
+    noms = list(configurations)
+    etages = {}
+
+    # 1. Analytique : Webster, vectorisé sur tous les candidats
+    debut = time.perf_counter()
+    retards = retards_feux(
+        lambda_a, lambda_b,
+        np.array([configurations[nom].duree_vert_a for nom in noms]),
+        np.array([configurations[nom].duree_vert_b for nom in noms]),
+        np.array([configurations[nom].duree_jaune for nom in noms]),
+        np.array([configurations[nom].duree_pietons for nom in noms]),
+        debit_saturation, debit_saturation)
+    scores = (lambda_a * retards['voie_a']['retard_webster'] +
+              lambda_b * retards['voie_b']['retard_webster']) / (lambda_a + lambda_b)
+    scores_analytiques = {nom: float(score) for nom, score in zip(noms, np.atleast_1d(scores))}
+    nb_promus = _nombre_promus(len(noms), fraction_analytique, nb_max_cycles)
+    promus = sorted(noms, key=scores_analytiques.get)[:nb_promus]
+    etages['analytique'] = {
+        'candidats': len(noms),
+        'promus': promus,
+        'scores': {nom: (None if math.isinf(score) else score)
+                   for nom, score in scores_analytiques.items()},
+        'nb_simulations': 0,
+        'duree_calcul': time.perf_counter() - debut
+    }
+
+    # 2. Moteur par cycles : toutes les réplications de tous les candidats en un lot
+    debut = time.perf_counter()
+    taches = [tache_replication(graine_effective, indice, duree_cycles, lambda_a, lambda_b,
+                                configurations[nom], 'cycles')
+              for nom in promus for indice in range(replications_cycles)]
+    sommes = dict.fromkeys(promus, 0.0)
+    for k, (stats, _) in executer_en_parallele(executer_replication, taches, nb_processus):
+        sommes[promus[k // replications_cycles]] += objectif_pondere(stats, lambda_a, lambda_b)
+    scores_cycles = {nom: somme / replications_cycles for nom, somme in sommes.items()}
+    entrants = promus
+    nb_promus = _nombre_promus(len(entrants), fraction_cycles, nb_max_simpy)
+    promus = sorted(entrants, key=scores_cycles.get)[:nb_promus]
+    etages['cycles'] = {
+        'candidats': len(entrants),
+        'promus': promus,
+        'scores': scores_cycles,
+        'nb_simulations': len(taches),
+        'duree_calcul': time.perf_counter() - debut
+    }
+
+    # 3. SimPy : executer_simulation complet (mêmes réplications pour tous)
+    debut = time.perf_counter()
+    scores_simpy = {}
+    intervalles = {}
+    duree_simulee = 0.0  # Candidats réellement simulés (hors lectures du cache)
+    lectures_cache = 0
+    for nom in promus:
+        debut_candidat = time.perf_counter()
+        collecteur = executer_simulation(
+            duree_simulation=duree_simpy, lambda_a=lambda_a, lambda_b=lambda_b,
+            config_feux=configurations[nom], mode_silencieux=True, graine=graine_effective,
+            dossier_resultats=None, nb_replications=replications_simpy,
+            nb_processus=nb_processus, moteur='simpy', cache=cache)
+        if collecteur.depuis_cache:
+            lectures_cache += 1
+        else:
+            duree_simulee += time.perf_counter() - debut_candidat
+        empirique = collecteur.donnees['empirique']
+        replications = collecteur.donnees['replications']
+        scores_simpy[nom] = objectif_pondere(empirique, lambda_a, lambda_b)
+        # IC du W_q pondéré : combinaison des demi-largeurs par voie (majorant)
+        demi_largeur = sum(
+            poids * (replications[voie]['temps_attente_moyen']['ic_95'][1] -
+                     replications[voie]['temps_attente_moyen']['moyenne'])
+            for voie, poids in (('voie_a', lambda_a), ('voie_b', lambda_b))
+            if replications[voie]['temps_attente_moyen']['ic_95'] is not None
+        ) / (lambda_a + lambda_b)
+        intervalles[nom] = [scores_simpy[nom] - demi_largeur, scores_simpy[nom] + demi_largeur]
+    duree_simpy_totale = time.perf_counter() - debut
+    etages['simpy'] = {
+        'candidats': len(promus),
+        'promus': sorted(promus, key=scores_simpy.get),
+        'scores': scores_simpy,
+        'nb_simulations': (len(promus) - lectures_cache) * replications_simpy,
+        'nb_lectures_cache': lectures_cache,
+        'duree_calcul': duree_simpy_totale
+    }
+
+    # Rapport : coût réel contre coût d'un passage de tous les candidats par
+    # SimPy, extrapolé des seuls candidats simulés (une lecture du cache ne
+    # dit rien du coût d'une simulation)
+    duree_totale = sum(etage['duree_calcul'] for etage in etages.values())
+    simules = len(promus) - lectures_cache
+    duree_tout_simpy = duree_simulee / simules * len(noms) if simules else None
+    if duree_tout_simpy is None:
+        economie = acceleration = None
+    else:
+        economie = 1.0 - duree_totale / duree_tout_simpy if duree_tout_simpy > 0 else 0.0
+        acceleration = duree_tout_simpy / duree_totale if duree_totale > 0 else None
+    return {
+        'parametres': {
+            'lambda_a': lambda_a,
+            'lambda_b': lambda_b,
+            'graine': graine_effective,
+            'debit_saturation': debit_saturation,
+            'budgets': {
+                'analytique': {'fraction': fraction_analytique, 'nb_max': nb_max_cycles},
+                'cycles': {'fraction': fraction_cycles, 'nb_max': nb_max_simpy,
+                           'nb_replications': replications_cycles, 'duree_simulation': duree_cycles},
+                'simpy': {'nb_replications': replications_simpy, 'duree_simulation': duree_simpy}
+            },
+            'configurations': {nom: config.to_dict() for nom, config in configurations.items()}
+        },
+        'etages': etages,
+        'classement': [{'nom': nom, 'moyenne': scores_simpy[nom], 'ic_95': intervalles[nom]}
+                       for nom in etages['simpy']['promus']],
+        'rapport': {
+            'duree_totale': duree_totale,
+            'duree_tout_simpy_estimee': duree_tout_simpy,
+            'economie': economie,
+            'acceleration': acceleration,
+            'simulations_simpy_evitees': (len(noms) - len(promus)) * replications_simpy,
+            'correlation_rangs': {
+                'analytique_cycles': _correlation_rangs(scores_analytiques, scores_cycles),
+                'cycles_simpy': _correlation_rangs(scores_cycles, scores_simpy)
+            }
+        }
+    }
+
+
+def afficher_rapport(resultats: dict):
+    """Affiche le passage des candidats d'un étage à l'autre et le calcul économisé"""
+    print("\n📊 Évaluation multi-fidélité")
+    print("─" * 70)
+    for nom in ETAGES:
+        etage = resultats['etages'][nom]
+        lectures = etage.get('nb_lectures_cache', 0)
+        relus = f"  ({lectures} candidats relus du cache)" if lectures else ""
+        print(f"   {nom:<11} {etage['candidats']:4d} candidats → {len(etage['promus']):3d} retenus  "
+              f"{etage['nb_simulations']:5d} simulations  {etage['duree_calcul']:7.2f}s{relus}")
+    print("\n🏁 Classement final (W_q pondéré, IC 95%)")
+    for rang, ligne in enumerate(resultats['classement'], 1):
+        print(f"   {rang}. {ligne['nom']:<12} {ligne['moyenne']:6.2f}s  "
+              f"[{ligne['ic_95'][0]:.2f} ; {ligne['ic_95'][1]:.2f}]")
+    rapport = resultats['rapport']
+    if rapport['duree_tout_simpy_estimee'] is None:
+        print(f"\n⏱️  {rapport['duree_totale']:.1f}s ; étage SimPy relu du cache, "
+              f"économie non estimée ; "
+              f"{rapport['simulations_simpy_evitees']} réplications SimPy évitées")
+    else:
+        print(f"\n⏱️  {rapport['duree_totale']:.1f}s au lieu de ≈{rapport['duree_tout_simpy_estimee']:.0f}s "
+              f"tout en SimPy (économie {100 * rapport['economie']:.0f} %, "
+              f"×{rapport['acceleration']:.0f}) ; "
+              f"{rapport['simulations_simpy_evitees']} réplications SimPy évitées")
+    correlations = rapport['correlation_rangs']
+    for cle, rho in correlations.items():
+        if rho is not None:
+            print(f"   Corrélation des rangs {cle.replace('_', ' → ')} : {rho:+.2f}")
+
+
+# Démonstration : grille de 200 réglages à λ_A = 0.3, λ_B = 0.2
+if __name__ == "__main__":
+    candidats = [ConfigurationFeux(duree_vert_a=T_A, duree_vert_b=T_B, duree_pietons=T_pietons)
+                 for T_A in range(10, 60, 5) for T_B in range(10, 60, 5)
+                 for T_pietons in (10, 15)]
+    resultats = evaluer_multi_fidelite(candidats, lambda_a=0.3, lambda_b=0.2, graine=2024)
+    afficher_rapport(resultats)
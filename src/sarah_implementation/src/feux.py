@@ -13,6 +13,7 @@ import simpy
 from enum import Enum
 from dataclasses import dataclass
 from typing import Optional
+from journal import Journal, NiveauJournal, journal_par_defaut
 
 
 class CouleurFeu(Enum):
@@ -66,6 +67,20 @@ class ConfigurationFeux:
     def proportion_vert_b(self) -> float:
         """Calculates α_B = T_B / T_cycle (proportion of green time for Lane B)"""
         return self.duree_vert_b / self.duree_cycle
+    
+    def to_dict(self) -> dict:
+        """Durations under the model's names (results, reports and cache keys)"""
+        return {
+            'T_A': self.duree_vert_a,
+            'T_B': self.duree_vert_b,
+            'T_jaune': self.duree_jaune,
+            'T_pietons': self.duree_pietons
+        }
+
+
+def nom_configuration(config: ConfigurationFeux) -> str:
+    """Short name of a configuration: 'T_A/T_B/T_pietons'"""
+    return f"{config.duree_vert_a:g}/{config.duree_vert_b:g}/{config.duree_pietons:g}"
 
 
 class SystemeFeux:
@@ -75,16 +90,23 @@ class SystemeFeux:
     Implements the finite automaton and cycle management
     """
     
-    def __init__(self, env: simpy.Environment, config: ConfigurationFeux):
+    def __init__(self, env: simpy.Environment, config: ConfigurationFeux,
+                 journal: Optional[Journal] = None):
         """
         Args:
             env: SimPy environment
             config: Light configuration
+            journal: Event sink (console by default)
         """
         self.env = env
         self.config = config
+        self.journal = journal_par_defaut(journal)
         self.etat_courant = EtatSysteme.S1  # Initial state
         self.nombre_cycles = 0
+        
+        # Per-lane "green started" events (re-armed at each green phase)
+        self._debut_vert_a = env.event()
+        self._debut_vert_b = env.event()
     
     def peut_passer_voie_a(self) -> bool:
         """
@@ -98,36 +120,70 @@ class SystemeFeux:
         """
         return self.etat_courant in [EtatSysteme.S3, EtatSysteme.S4]
     
+    def attendre_vert_a(self) -> simpy.Event:
+        """
+        Returns the event triggered at the next start of Lane A green
+        
+        Waiting vehicles yield on it instead of polling peut_passer_voie_a()
+        """
+        return self._debut_vert_a
+    
+    def attendre_vert_b(self) -> simpy.Event:
+        """
+        Returns the event triggered at the next start of Lane B green
+        """
+        return self._debut_vert_b
+    
+    def _signaler_vert_a(self):
+        """Wakes up the vehicles waiting on Lane A and re-arms the event"""
+        evenement, self._debut_vert_a = self._debut_vert_a, self.env.event()
+        evenement.succeed()
+    
+    def _signaler_vert_b(self):
+        """Wakes up the vehicles waiting on Lane B and re-arms the event"""
+        evenement, self._debut_vert_b = self._debut_vert_b, self.env.event()
+        evenement.succeed()
+    
+    def _journaliser_etat(self):
+        """Emits the current state transition to the event sink"""
+        if self.journal.actif(NiveauJournal.INFO):
+            self.journal.emettre(NiveauJournal.INFO, self.env.now, 'feu',
+                                 {'etat': self.etat_courant.name})
+    
     def gerer_cycle(self):
         """Manages the infinite cycle of lights"""
         while True:
             # S1: Lane A Green
             self.etat_courant = EtatSysteme.S1
-            print(f"[{self.env.now:.2f}s] 🟢 Lane A Green (B Red, Pedestrians Red)")
+            self._signaler_vert_a()
+            self._journaliser_etat()
             yield self.env.timeout(self.config.duree_vert_a)
             
             # S2: Lane A Yellow
             self.etat_courant = EtatSysteme.S2
-            print(f"[{self.env.now:.2f}s] 🟡 Lane A Yellow (B Red, Pedestrians Red)")
+            self._journaliser_etat()
             yield self.env.timeout(self.config.duree_jaune)
             
             # S3: Lane B Green
             self.etat_courant = EtatSysteme.S3
-            print(f"[{self.env.now:.2f}s] 🟢 Lane B Green (A Red, Pedestrians Red)")
+            self._signaler_vert_b()
+            self._journaliser_etat()
             yield self.env.timeout(self.config.duree_vert_b)
             
             # S4: Lane B Yellow
             self.etat_courant = EtatSysteme.S4
-            print(f"[{self.env.now:.2f}s] 🟡 Lane B Yellow (A Red, Pedestrians Red)")
+            self._journaliser_etat()
             yield self.env.timeout(self.config.duree_jaune)
             
             # S5: Pedestrians
             self.etat_courant = EtatSysteme.S5
-            print(f"[{self.env.now:.2f}s] 🚶 Pedestrians Green (A Red, B Red)")
+            self._journaliser_etat()
             yield self.env.timeout(self.config.duree_pietons)
             
             self.nombre_cycles += 1
-            print(f"[{self.env.now:.2f}s] ✅ Cycle {self.nombre_cycles} completed")
+            if self.journal.actif(NiveauJournal.INFO):
+                self.journal.emettre(NiveauJournal.INFO, self.env.now, 'cycle',
+                                     {'numero': self.nombre_cycles})
     
     def obtenir_statistiques(self) -> dict:
         """
@@ -11,9 +11,58 @@ Implémente le modèle de file d'attente M/M/1 (Khaoula) :
 """
 
 import simpy
-from typing import List
+import numpy as np
+from collections import deque
+from typing import Callable, Deque, Optional
 from vehicule import Vehicule
 from feux import SystemeFeux
+from journal import Journal, NiveauJournal, journal_par_defaut
+from registre import RegistreVehicules
+from statistiques_en_ligne import StatistiquesEnLigne, TroncatureMSER
+
+
+# Durée de traversée d'un véhicule par défaut (secondes) : débit de
+# saturation = 1/0.1 = 10 véh/s. Chaque voie peut avoir son propre débit.
+DUREE_TRAVERSEE = 0.1
+DEBIT_SATURATION = 1.0 / DUREE_TRAVERSEE
+
+
+class TraceLongueur:
+    """
+    Historique compact des longueurs de file
+    
+    Tableaux NumPy qui doublent de taille quand ils sont pleins :
+    - temps : float64
+    - longueurs : int32
+    """
+    
+    def __init__(self, capacite_initiale: int = 1024):
+        self._temps = np.empty(capacite_initiale, dtype=np.float64)
+        self._longueurs = np.empty(capacite_initiale, dtype=np.int32)
+        self.taille = 0
+    
+    def ajouter(self, temps: float, longueur: int):
+        """Enregistre la longueur de la file à un instant donné"""
+        if self.taille == len(self._temps):
+            self._temps = np.resize(self._temps, 2 * self.taille)
+            self._longueurs = np.resize(self._longueurs, 2 * self.taille)
+        self._temps[self.taille] = temps
+        self._longueurs[self.taille] = longueur
+        self.taille += 1
+    
+    @property
+    def temps(self) -> np.ndarray:
+        """Instants des changements de longueur (vue, sans copie)"""
+        return self._temps[:self.taille]
+    
+    @property
+    def longueurs(self) -> np.ndarray:
+        """Longueurs de file après chaque changement (vue, sans copie)"""
+        return self._longueurs[:self.taille]
+    
+    def to_dict(self) -> dict:
+        """Convertit en listes pour export JSON"""
+        return {'temps': self.temps.tolist(), 'longueur': self.longueurs.tolist()}
 
 
 class FileAttente:
@@ -24,31 +73,73 @@ class FileAttente:
     - M : Arrivées Markoviennes (Poisson)
     - M : Service Markovien (Exponentiel)
     - 1 : Un seul serveur (une voie)
+    
+    L et L_q empiriques sont des moyennes temporelles : les intégrales
+    ∫L(t)dt et ∫L_q(t)dt sont mises à jour à chaque arrivée, début de
+    service et départ (mémoire O(1)).
+    
+    Les temps d'attente alimentent des statistiques en flux (écart-type,
+    maximum, quantiles) lisibles à tout instant, ainsi qu'une troncature
+    MSER-5 de la période de chauffe (files vides à t=0).
     """
     
-    def __init__(self, nom: str):
+    def __init__(self, nom: str, conserver_historique: bool = False):
         """
         Args:
             nom: Nom de la file (ex: "File Voie A")
+            conserver_historique: Garde la trace complète des longueurs de file
         """
         self.nom = nom
-        self.vehicules_en_attente: List[Vehicule] = []
-        self.historique_longueur = []  # Pour calculer L (longueur moyenne)
+        self.vehicules_en_attente: Deque[Vehicule] = deque()  # FIFO en O(1)
+        self.historique: Optional[TraceLongueur] = (
+            TraceLongueur() if conserver_historique else None)
         self.temps_attente_total = 0.0
         self.nombre_vehicules_servis = 0
+        self.statistiques_attente = StatistiquesEnLigne()
+        self.troncature = TroncatureMSER()
+        
+        # Accumulateurs pondérés par le temps
+        self.nombre_en_service = 0
+        self._dernier_temps = 0.0
+        self._aire_file = 0.0       # ∫ L_q(t) dt
+        self._aire_systeme = 0.0    # ∫ L(t) dt
+    
+    def _avancer(self, temps_actuel: Optional[float]):
+        """Intègre les longueurs courantes jusqu'à temps_actuel"""
+        if temps_actuel is None:
+            return
+        duree = temps_actuel - self._dernier_temps
+        if duree > 0:
+            longueur = len(self.vehicules_en_attente)
+            self._aire_file += longueur * duree
+            self._aire_systeme += (longueur + self.nombre_en_service) * duree
+            self._dernier_temps = temps_actuel
+    
+    def _tracer(self):
+        """Ajoute la longueur courante à l'historique (si demandé)"""
+        if self.historique is not None:
+            self.historique.ajouter(self._dernier_temps, len(self.vehicules_en_attente))
     
     def ajouter_vehicule(self, vehicule: Vehicule, temps_actuel: float):
         """Ajoute un véhicule à la file"""
+        self._avancer(temps_actuel)
         self.vehicules_en_attente.append(vehicule)
-        self.historique_longueur.append({
-            'temps': temps_actuel,
-            'longueur': len(self.vehicules_en_attente)
-        })
+        self._tracer()
     
-    def retirer_vehicule(self) -> Vehicule:
-        """Retire le premier véhicule de la file (FIFO)"""
+    def retirer_vehicule(self, temps_actuel: Optional[float] = None) -> Vehicule:
+        """
+        Retire le premier véhicule de la file (FIFO) : début de service
+        
+        Args:
+            temps_actuel: Instant du retrait (sans lui, les moyennes
+                          temporelles considèrent le dernier instant connu)
+        """
         if self.vehicules_en_attente:
-            return self.vehicules_en_attente.pop(0)
+            self._avancer(temps_actuel)
+            vehicule = self.vehicules_en_attente.popleft()
+            self.nombre_en_service += 1
+            self._tracer()
+            return vehicule
         return None
     
     def longueur(self) -> int:
@@ -59,10 +150,22 @@ class FileAttente:
         """Vérifie si la file est vide"""
         return len(self.vehicules_en_attente) == 0
     
-    def enregistrer_service(self, temps_attente: float):
-        """Enregistre qu'un véhicule a été servi"""
+    def enregistrer_service(self, temps_attente: float,
+                            temps_actuel: Optional[float] = None):
+        """
+        Enregistre qu'un véhicule a été servi (départ du système)
+        
+        Args:
+            temps_attente: Temps passé dans la file
+            temps_actuel: Instant du départ
+        """
+        self._avancer(temps_actuel)
+        if self.nombre_en_service > 0:
+            self.nombre_en_service -= 1
         self.temps_attente_total += temps_attente
         self.nombre_vehicules_servis += 1
+        self.statistiques_attente.ajouter(temps_attente)
+        self.troncature.ajouter(temps_attente, self._dernier_temps)
     
     def temps_attente_moyen(self) -> float:
         """
@@ -73,6 +176,61 @@ class FileAttente:
         if self.nombre_vehicules_servis == 0:
             return 0.0
         return self.temps_attente_total / self.nombre_vehicules_servis
+    
+    def distribution_attente(self) -> dict:
+        """
+        Dispersion des temps d'attente des véhicules servis
+        
+        Returns:
+            temps_attente_std, temps_attente_max et quantiles approchés
+            temps_attente_p50/p90/p95/p99
+        """
+        stats = self.statistiques_attente
+        resume = {
+            'temps_attente_std': stats.ecart_type,
+            'temps_attente_max': stats.maximum
+        }
+        for nom, valeur in stats.quantiles().items():
+            resume[f'temps_attente_{nom}'] = valeur
+        return resume
+    
+    def attente_stationnaire(self) -> dict:
+        """
+        W_q après suppression de la période de chauffe (MSER-5)
+        
+        Returns:
+            temps_attente_moyen_stationnaire, troncature_vehicules (services
+            écartés) et troncature_temps (instant du dernier écarté)
+        """
+        resultat = self.troncature.resultat()
+        return {
+            'temps_attente_moyen_stationnaire': resultat['moyenne'],
+            'troncature_vehicules': resultat['observations_ecartees'],
+            'troncature_temps': resultat['temps_troncature']
+        }
+    
+    def longueur_moyenne_file(self, temps_actuel: float) -> float:
+        """
+        Calcule L_q empirique (moyenne temporelle sur [0, temps_actuel])
+        
+        Formule théorique : L_q = ρ² / (1 - ρ)
+        """
+        if temps_actuel <= 0:
+            return 0.0
+        reste = max(temps_actuel - self._dernier_temps, 0.0)
+        return (self._aire_file + len(self.vehicules_en_attente) * reste) / temps_actuel
+    
+    def nombre_moyen_systeme(self, temps_actuel: float) -> float:
+        """
+        Calcule L empirique (file + véhicules en cours de traversée)
+        
+        Formule théorique : L = ρ / (1 - ρ)
+        """
+        if temps_actuel <= 0:
+            return 0.0
+        reste = max(temps_actuel - self._dernier_temps, 0.0)
+        presents = len(self.vehicules_en_attente) + self.nombre_en_service
+        return (self._aire_systeme + presents * reste) / temps_actuel
 
 
 class Intersection:
@@ -85,26 +243,59 @@ class Intersection:
     - Le passage des véhicules
     """
     
-    def __init__(self, env: simpy.Environment, systeme_feux: SystemeFeux):
+    def __init__(self, env: simpy.Environment, systeme_feux: SystemeFeux,
+                 journal: Optional[Journal] = None,
+                 historique_files: bool = False,
+                 registre: Optional[RegistreVehicules] = None,
+                 debit_saturation_a: float = DEBIT_SATURATION,
+                 debit_saturation_b: float = DEBIT_SATURATION):
         """
         Args:
             env: Environnement SimPy
             systeme_feux: Système de feux de circulation
+            journal: Puits d'événements (console par défaut)
+            historique_files: Garde la trace complète des longueurs de file
+            registre: Registre en colonnes où noter débuts de service et départs
+            debit_saturation_a/b: Débit de saturation de chaque voie (véh/s
+                                  de vert) ; durée de traversée = 1/débit
         """
+        if debit_saturation_a <= 0 or debit_saturation_b <= 0:
+            raise ValueError(f"Débits de saturation invalides : "
+                             f"{debit_saturation_a}, {debit_saturation_b}")
         self.env = env
+        self.journal = journal_par_defaut(journal)
         self.systeme_feux = systeme_feux
         
         # Files d'attente pour chaque voie
-        self.file_a = FileAttente("File Voie A")
-        self.file_b = FileAttente("File Voie B")
+        self.file_a = FileAttente("File Voie A", historique_files)
+        self.file_b = FileAttente("File Voie B", historique_files)
         
         # Ressources SimPy (1 serveur par voie)
         self.voie_a = simpy.Resource(env, capacity=1)
         self.voie_b = simpy.Resource(env, capacity=1)
+        self.duree_traversee_a = 1.0 / debit_saturation_a
+        self.duree_traversee_b = 1.0 / debit_saturation_b
         
         # Statistiques globales
         self.vehicules_total_a = 0
         self.vehicules_total_b = 0
+        
+        # Appelé avec chaque véhicule parti (statistiques en ligne, recyclage) :
+        # voir ajouter_sur_depart
+        self.sur_depart: Optional[Callable[[Vehicule], None]] = None
+        self.registre = registre
+    
+    def ajouter_sur_depart(self, rappel: Callable[[Vehicule], None]):
+        """Ajoute une fonction appelée avec chaque véhicule parti, après les précédentes"""
+        precedent = self.sur_depart
+        if precedent is None:
+            self.sur_depart = rappel
+            return
+        
+        def enchainer(vehicule: Vehicule):
+            precedent(vehicule)
+            rappel(vehicule)
+        self.sur_depart = enchainer
     
     def traverser_voie_a(self, vehicule: Vehicule):
         """
@@ -120,32 +311,41 @@ class Intersection:
         self.file_a.ajouter_vehicule(vehicule, self.env.now)
         self.vehicules_total_a += 1
         
-        print(f"  └─ File A : {self.file_a.longueur()} véhicule(s)")
+        if self.journal.actif(NiveauJournal.DEBUG):
+            self.journal.emettre(NiveauJournal.DEBUG, self.env.now, 'file',
+                                 {'voie': 'A', 'longueur': self.file_a.longueur()})
         
-        # 2. Attendre que le feu soit vert
-        while not self.systeme_feux.peut_passer_voie_a():
-            yield self.env.timeout(0.1)  # Vérifier toutes les 0.1s
+        # 2. Attendre que le feu soit vert (réveil au début du vert, sans scrutation)
+        if not self.systeme_feux.peut_passer_voie_a():
+            yield self.systeme_feux.attendre_vert_a()
         
         # 3. Demander la ressource (serveur)
         with self.voie_a.request() as req:
             yield req
             
             # Retirer de la file
-            self.file_a.retirer_vehicule()
+            self.file_a.retirer_vehicule(self.env.now)
             
             # Calculer temps d'attente
             temps_attente = self.env.now - vehicule.temps_arrivee
             vehicule.temps_attente = temps_attente
+            if self.registre is not None:
+                self.registre.enregistrer_debut_service(vehicule.indice_registre, self.env.now)
             
-            print(f"[{self.env.now:.2f}s] ✅ Véhicule A-{vehicule.id} traverse "
-                  f"(attendu {temps_attente:.2f}s)")
+            if self.journal.actif(NiveauJournal.INFO):
+                self.journal.emettre(NiveauJournal.INFO, self.env.now, 'traversee',
+                                     {'voie': 'A', 'id': vehicule.id, 'attente': temps_attente})
             
-            # Temps de traversée (instantané dans ce modèle)
-            yield self.env.timeout(0.1)
+            # Temps de traversée (1 / débit de saturation de la voie)
+            yield self.env.timeout(self.duree_traversee_a)
             
             # 4. Départ
             vehicule.temps_depart = self.env.now
-            self.file_a.enregistrer_service(temps_attente)
+            self.file_a.enregistrer_service(temps_attente, self.env.now)
+            if self.registre is not None:
+                self.registre.enregistrer_depart(vehicule.indice_registre, self.env.now)
+            if self.sur_depart is not None:
+                self.sur_depart(vehicule)
     
     def traverser_voie_b(self, vehicule: Vehicule):
         """
@@ -156,33 +356,45 @@ class Intersection:
         self.file_b.ajouter_vehicule(vehicule, self.env.now)
         self.vehicules_total_b += 1
         
-        print(f"  └─ File B : {self.file_b.longueur()} véhicule(s)")
+        if self.journal.actif(NiveauJournal.DEBUG):
+            self.journal.emettre(NiveauJournal.DEBUG, self.env.now, 'file',
+                                 {'voie': 'B', 'longueur': self.file_b.longueur()})
         
-        while not self.systeme_feux.peut_passer_voie_b():
-            yield self.env.timeout(0.1)
+        if not self.systeme_feux.peut_passer_voie_b():
+            yield self.systeme_feux.attendre_vert_b()
         
         with self.voie_b.request() as req:
             yield req
             
-            self.file_b.retirer_vehicule()
+            self.file_b.retirer_vehicule(self.env.now)
             temps_attente = self.env.now - vehicule.temps_arrivee
             vehicule.temps_attente = temps_attente
+            if self.registre is not None:
+                self.registre.enregistrer_debut_service(vehicule.indice_registre, self.env.now)
             
-            print(f"[{self.env.now:.2f}s] ✅ Véhicule B-{vehicule.id} traverse "
-                  f"(attendu {temps_attente:.2f}s)")
+            if self.journal.actif(NiveauJournal.INFO):
+                self.journal.emettre(NiveauJournal.INFO, self.env.now, 'traversee',
+                                     {'voie': 'B', 'id': vehicule.id, 'attente': temps_attente})
             
-            yield self.env.timeout(0.1)
+            yield self.env.timeout(self.duree_traversee_b)
             
             vehicule.temps_depart = self.env.now
-            self.file_b.enregistrer_service(temps_attente)
+            self.file_b.enregistrer_service(temps_attente, self.env.now)
+            if self.registre is not None:
+                self.registre.enregistrer_depart(vehicule.indice_registre, self.env.now)
+            if self.sur_depart is not None:
+                self.sur_depart(vehicule)
     
     def obtenir_statistiques(self) -> dict:
         """
         Calcule les indicateurs de performance
         
         Retourne les valeurs empiriques à comparer avec la théorie :
-        - L : longueur moyenne de file
-        - W_q : temps moyen d'attente
+        - L : nombre moyen de véhicules dans le système (moyenne temporelle)
+        - L_q : longueur moyenne de file (moyenne temporelle)
+        - Débit : véhicules servis par seconde
+        - W_q : temps moyen d'attente (avec écart-type, max et quantiles),
+          et W_q stationnaire après troncature de la période de chauffe
         - Nombre de véhicules servis
         """
         return {
@@ -190,13 +402,25 @@ class Intersection:
                 'vehicules_total': self.vehicules_total_a,
                 'vehicules_servis': self.file_a.nombre_vehicules_servis,
                 'temps_attente_moyen': self.file_a.temps_attente_moyen(),
-                'longueur_file_actuelle': self.file_a.longueur()
+                **self.file_a.distribution_attente(),
+                **self.file_a.attente_stationnaire(),
+                'longueur_file_actuelle': self.file_a.longueur(),
+                'longueur_moyenne_file': self.file_a.longueur_moyenne_file(self.env.now),
+                'nombre_moyen_systeme': self.file_a.nombre_moyen_systeme(self.env.now),
+                'debit': (self.file_a.nombre_vehicules_servis / self.env.now
+                          if self.env.now > 0 else 0.0)
             },
             'voie_b': {
                 'vehicules_total': self.vehicules_total_b,
                 'vehicules_servis': self.file_b.nombre_vehicules_servis,
                 'temps_attente_moyen': self.file_b.temps_attente_moyen(),
-                'longueur_file_actuelle': self.file_b.longueur()
+                **self.file_b.distribution_attente(),
+                **self.file_b.attente_stationnaire(),
+                'longueur_file_actuelle': self.file_b.longueur(),
+                'longueur_moyenne_file': self.file_b.longueur_moyenne_file(self.env.now),
+                'nombre_moyen_systeme': self.file_b.nombre_moyen_systeme(self.env.now),
+                'debit': (self.file_b.nombre_vehicules_servis / self.env.now
+                          if self.env.now > 0 else 0.0)
             }
         }
 
@@ -0,0 +1,194 @@
+"""
+JOURNAL.PY - Journalisation structurée des événements de simulation
+Responsable : Sarah
+Projet : Simulation de Feux de Circulation
+
+Remplace les print() du cœur de la simulation par des puits d'événements
+filtrés par niveau :
+- JournalNul : ignore tout (aucun formatage sur le chemin critique)
+- JournalConsole : affiche les messages comme avant
+- JournalTampon : garde les N derniers événements en mémoire
+- JournalFichier : écrit un événement JSON par ligne
+- JournalRappel : transmet chaque événement à une fonction
+
+Les émetteurs testent journal.actif(niveau) AVANT de construire les données,
+donc un journal inactif ne coûte qu'un appel de méthode par événement.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from collections import deque
+from enum import IntEnum
+from typing import Callable, List, Optional
+
+
+class NiveauJournal(IntEnum):
+    """Niveaux de détail des événements"""
+    DEBUG = 10     # Longueurs de file après chaque arrivée
+    INFO = 20      # Arrivées, traversées, changements de feux
+    AUCUN = 100    # Rien n'est émis
+
+
+# Messages console (identiques aux anciens print)
+MESSAGES_FEUX = {
+    'S1': "🟢 Lane A Green (B Red, Pedestrians Red)",
+    'S2': "🟡 Lane A Yellow (B Red, Pedestrians Red)",
+    'S3': "🟢 Lane B Green (A Red, Pedestrians Red)",
+    'S4': "🟡 Lane B Yellow (A Red, Pedestrians Red)",
+    'S5': "🚶 Pedestrians Green (A Red, B Red)",
+}
+
+ICONES_VOIES = {'A': "🚗", 'B': "🚙"}
+
+
+def formater_evenement(temps: float, evenement: str, donnees: dict) -> str:
+    """
+    Construit le message lisible d'un événement
+
+    Args:
+        temps: Temps de simulation (secondes)
+        evenement: Type d'événement ('feu', 'cycle', 'arrivee', 'file', 'traversee')
+        donnees: Champs de l'événement
+
+    Returns:
+        Message formaté pour la console
+    """
+    if evenement == 'feu':
+        return f"[{temps:.2f}s] {MESSAGES_FEUX[donnees['etat']]}"
+    if evenement == 'cycle':
+        return f"[{temps:.2f}s] ✅ Cycle {donnees['numero']} completed"
+    if evenement == 'arrivee':
+        voie = donnees['voie']
+        return (f"[{temps:.2f}s] {ICONES_VOIES[voie]} Véhicule {voie}-{donnees['id']} "
+                f"arrive sur Voie {voie}")
+    if evenement == 'file':
+        return f"  └─ File {donnees['voie']} : {donnees['longueur']} véhicule(s)"
+    if evenement == 'traversee':
+        return (f"[{temps:.2f}s] ✅ Véhicule {donnees['voie']}-{donnees['id']} traverse "
+                f"(attendu {donnees['attente']:.2f}s)")
+    return f"[{temps:.2f}s] {evenement} {donnees}"
+
+
+class Journal(ABC):
+    """
+    Puits d'événements de base, filtré par niveau
+
+    Les sous-classes implémentent emettre()
+    """
+
+    def __init__(self, niveau: NiveauJournal = NiveauJournal.INFO):
+        """
+        Args:
+            niveau: Niveau minimal des événements conservés
+        """
+        self.niveau = niveau
+
+    def actif(self, niveau: NiveauJournal) -> bool:
+        """Indique si un événement de ce niveau sera conservé"""
+        return niveau >= self.niveau
+
+    @abstractmethod
+    def emettre(self, niveau: NiveauJournal, temps: float,
+                evenement: str, donnees: dict):
+        """Reçoit un événement (à appeler seulement si actif(niveau))"""
+
+    def fermer(self):
+        """Libère les ressources éventuelles"""
+
+
+class JournalNul(Journal):
+    """Journal silencieux : aucun événement n'est jamais actif"""
+
+    def __init__(self):
+        super().__init__(NiveauJournal.AUCUN)
+
+    def actif(self, niveau: NiveauJournal) -> bool:
+        return False
+
+    def emettre(self, niveau, temps, evenement, donnees):
+        pass
+
+
+class JournalConsole(Journal):
+    """Affiche les événements sur la sortie standard (comportement historique)"""
+
+    def __init__(self, niveau: NiveauJournal = NiveauJournal.DEBUG):
+        super().__init__(niveau)
+
+    def emettre(self, niveau, temps, evenement, donnees):
+        print(formater_evenement(temps, evenement, donnees))
+
+
+class JournalTampon(Journal):
+    """
+    Tampon circulaire des derniers événements
+
+    Les événements sont stockés bruts (niveau, temps, evenement, donnees),
+    le formatage n'a lieu qu'à la lecture via messages()
+    """
+
+    def __init__(self, capacite: int = 10000,
+                 niveau: NiveauJournal = NiveauJournal.INFO):
+        """
+        Args:
+            capacite: Nombre maximal d'événements conservés
+            niveau: Niveau minimal des événements conservés
+        """
+        super().__init__(niveau)
+        self.evenements = deque(maxlen=capacite)
+
+    def emettre(self, niveau, temps, evenement, donnees):
+        self.evenements.append((niveau, temps, evenement, donnees))
+
+    def messages(self) -> List[str]:
+        """Retourne les événements du tampon sous forme de messages"""
+        return [formater_evenement(t, e, d) for _, t, e, d in self.evenements]
+
+
+class JournalFichier(Journal):
+    """Écrit un événement JSON par ligne dans un fichier"""
+
+    def __init__(self, chemin: str, niveau: NiveauJournal = NiveauJournal.INFO):
+        """
+        Args:
+            chemin: Fichier de sortie (écrasé s'il existe)
+            niveau: Niveau minimal des événements conservés
+        """
+        super().__init__(niveau)
+        self.fichier = open(chemin, 'w', encoding='utf-8')
+
+    def emettre(self, niveau, temps, evenement, donnees):
+        ligne = {'temps': temps, 'niveau': niveau.name, 'evenement': evenement}
+        ligne.update(donnees)
+        self.fichier.write(json.dumps(ligne, ensure_ascii=False) + "\n")
+
+    def fermer(self):
+        self.fichier.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+
+class JournalRappel(Journal):
+    """Transmet chaque événement à une fonction fournie par l'utilisateur"""
+
+    def __init__(self, rappel: Callable[[NiveauJournal, float, str, dict], None],
+                 niveau: NiveauJournal = NiveauJournal.INFO):
+        """
+        Args:
+            rappel: Fonction appelée avec (niveau, temps, evenement, donnees)
+            niveau: Niveau minimal des événements conservés
+        """
+        super().__init__(niveau)
+        self.rappel = rappel
+
+    def emettre(self, niveau, temps, evenement, donnees):
+        self.rappel(niveau, temps, evenement, donnees)
+
+
+def journal_par_defaut(journal: Optional[Journal]) -> Journal:
+    """Retourne le journal fourni, ou la console si aucun n'est donné"""
+    return journal if journal is not None else JournalConsole()
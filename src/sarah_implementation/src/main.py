@@ -11,10 +11,189 @@ Ce script permet de :
 
 import simpy
 import os
+import time
+from typing import List, Optional, Tuple
 from feux import SystemeFeux, ConfigurationFeux
 from vehicule import GenerateurVehicules
-from intersection import Intersection
-from statistiques import CollecteurDonnees
+from intersection import Intersection, DEBIT_SATURATION
+from statistiques import CollecteurDonnees, AgregateurReplications
+from journal import Journal, JournalConsole, JournalNul
+from aleatoire import FluxAleatoires
+from parallele import executer_en_parallele
+from moteur_cycles import MoteurCycles
+from registre import RegistreVehicules
+from cache_resultats import CacheResultats, cle_cache
+
+
+# Moteurs disponibles : un processus SimPy par véhicule, ou cycles vectorisés
+MOTEURS = ('simpy', 'cycles')
+
+# Version des résultats : à incrémenter dès qu'une modification du modèle
+# change les résultats à graine égale (invalide le cache de résultats)
+VERSION_MOTEUR = 2
+
+# Arrêt séquentiel : précision vérifiée tous les N cycles de feux
+CYCLES_ENTRE_CONTROLES = 10
+
+
+def _simuler(
+    duree_simulation: float,
+    lambda_a: float,
+    lambda_b: float,
+    config_feux: ConfigurationFeux,
+    journal: Journal,
+    historique_files: bool,
+    flux: FluxAleatoires,
+    moteur: str = 'simpy',
+    conserver_vehicules: bool = False,
+    registre: Optional[RegistreVehicules] = None,
+    precision_cible: Optional[float] = None,
+    duree_max: Optional[float] = None,
+    debits_saturation: Tuple[float, float] = (DEBIT_SATURATION, DEBIT_SATURATION)
+) -> Tuple[dict, dict, dict, Optional[Intersection]]:
+    """
+    Exécute une simulation avec le moteur choisi
+    
+    Avec precision_cible (moteur 'simpy'), duree_simulation est l'horizon
+    minimal : la simulation continue par tranches de CYCLES_ENTRE_CONTROLES
+    cycles jusqu'à ce que la demi-largeur de l'IC à 95% de W_q (moyennes
+    de lots) passe sous la cible sur les deux voies, ou jusqu'à duree_max.
+    
+    Returns:
+        (stats_intersection, stats_generateur, stats_feux, intersection)
+        intersection vaut None avec le moteur 'cycles'
+    """
+    if moteur == 'cycles':
+        moteur_cycles = MoteurCycles(
+            lambda_a, lambda_b, config_feux,
+            generateur_a=flux.generateur('arrivees_a'),
+            generateur_b=flux.generateur('arrivees_b'),
+            debit_saturation_a=debits_saturation[0],
+            debit_saturation_b=debits_saturation[1]
+        )
+        moteur_cycles.executer(duree_simulation)
+        return (moteur_cycles.obtenir_statistiques(),
+                moteur_cycles.obtenir_statistiques_vehicules(),
+                moteur_cycles.obtenir_statistiques_feux(),
+                None)
+    
+    # Environnement SimPy
+    env = simpy.Environment()
+    
+    # Composants
+    systeme_feux = SystemeFeux(env, config_feux, journal)
+    intersection = Intersection(env, systeme_feux, journal, historique_files, registre,
+                                *debits_saturation)
+    generateur = GenerateurVehicules(
+        env, lambda_a, lambda_b, journal,
+        generateur_a=flux.generateur('arrivees_a'),
+        generateur_b=flux.generateur('arrivees_b'),
+        generateur_auxiliaire=flux.generateur('auxiliaire'),
+        conserver_vehicules=conserver_vehicules,
+        recycler_vehicules=not conserver_vehicules,
+        registre=registre
+    )
+    
+    # Processus
+    env.process(systeme_feux.gerer_cycle())
+    env.process(generateur.generer_voie_a(intersection))
+    env.process(generateur.generer_voie_b(intersection))
+    
+    # Exécution
+    env.run(until=duree_simulation)
+    if precision_cible is not None:
+        pas = CYCLES_ENTRE_CONTROLES * config_feux.duree_cycle
+        while (env.now < duree_max and
+               not _precision_atteinte(intersection, precision_cible)):
+            env.run(until=min(env.now + pas, duree_max))
+    
+    return (intersection.obtenir_statistiques(),
+            generateur.obtenir_statistiques(),
+            systeme_feux.obtenir_statistiques(),
+            intersection)
+
+
+def _precision_atteinte(intersection: Intersection, precision_cible: float) -> bool:
+    """Vrai si l'IC de W_q par moyennes de lots est assez étroit sur les deux voies"""
+    return all(file.troncature.intervalle_confiance()['demi_largeur'] <= precision_cible
+               for file in (intersection.file_a, intersection.file_b))
+
+
+def tache_replication(
+    graine: int,
+    indice: int,
+    duree_simulation: float,
+    lambda_a: float,
+    lambda_b: float,
+    config_feux: ConfigurationFeux,
+    moteur: str = 'simpy',
+    debits_saturation: Tuple[float, float] = (DEBIT_SATURATION, DEBIT_SATURATION),
+    cache: Optional[CacheResultats] = None
+) -> dict:
+    """
+    Construit la tâche d'une réplication pour executer_replication
+    
+    Args:
+        graine: Graine maîtresse de l'étude
+        indice: Séquence fille de la graine utilisée par la réplication
+        debits_saturation: Débits de saturation (voie A, voie B)
+        cache: CacheResultats où relire ou conserver la réplication
+    """
+    return {
+        "graine": graine,
+        "indice": indice,
+        "duree_simulation": duree_simulation,
+        "lambda_a": lambda_a,
+        "lambda_b": lambda_b,
+        "config_feux": config_feux,
+        "moteur": moteur,
+        "debits_saturation": debits_saturation,
+        "cache": cache
+    }
+
+
+def executer_replication(tache: dict) -> Tuple[dict, bool]:
+    """
+    Exécute une réplication silencieuse (fonction de niveau module pour le pool)
+    
+    Point d'entrée commun à toutes les études par réplications (comparaison,
+    optimiseurs, évaluation multi-fidélité, course).
+    
+    Args:
+        tache: Tâche construite par tache_replication
+    
+    Returns:
+        (statistiques de l'intersection, True si relues depuis le cache)
+    """
+    debits_saturation = tache.get("debits_saturation", (DEBIT_SATURATION, DEBIT_SATURATION))
+    cache = tache.get("cache")
+    cle = None
+    if cache is not None:
+        replication = {
+            'graine': tache["graine"],
+            'indice': tache["indice"],
+            'duree_simulation': tache["duree_simulation"],
+            'lambda_a': tache["lambda_a"],
+            'lambda_b': tache["lambda_b"],
+            'moteur': tache["moteur"],
+            **tache["config_feux"].to_dict(),
+            'debit_saturation': list(debits_saturation)
+        }
+        cle = cle_cache({'version_moteur': VERSION_MOTEUR, 'replication': replication})
+        entree = cache.lire(cle)
+        if entree is not None:
+            return entree['statistiques'], True
+    
+    flux = FluxAleatoires(tache["graine"], indice_replication=tache["indice"])
+    stats_inter, _, _, _ = _simuler(
+        tache["duree_simulation"], tache["lambda_a"], tache["lambda_b"],
+        tache["config_feux"], JournalNul(), False, flux, tache["moteur"],
+        debits_saturation=debits_saturation
+    )
+    if cle is not None:
+        # Paramètres conservés pour le démarrage à chaud (optimiseur_bayesien.py)
+        cache.ecrire(cle, {'replication': replication, 'statistiques': stats_inter})
+    return stats_inter, False
 
 
 def executer_simulation(
@@ -23,7 +202,21 @@ def executer_simulation(
     lambda_b: float = 0.3,
     config_feux: ConfigurationFeux = None,
     nom_scenario: str = "simulation",
-    mode_silencieux: bool = False
+    mode_silencieux: bool = False,
+    journal: Optional[Journal] = None,
+    historique_files: bool = False,
+    graine: Optional[int] = None,
+    dossier_resultats: Optional[str] = os.path.join('..', 'results'),
+    nb_replications: int = 1,
+    nb_processus: Optional[int] = None,
+    moteur: str = 'simpy',
+    conserver_vehicules: bool = False,
+    registre_vehicules: bool = False,
+    precision_cible: Optional[float] = None,
+    duree_max: Optional[float] = None,
+    cache: Optional[CacheResultats] = None,
+    debit_saturation_a: float = DEBIT_SATURATION,
+    debit_saturation_b: float = DEBIT_SATURATION
 ) -> CollecteurDonnees:
     """
     Exécute une simulation complète et retourne les résultats.
@@ -34,6 +227,41 @@ def executer_simulation(
         config_feux: Configuration personnalisée des feux
         nom_scenario: Nom du fichier JSON de sortie
         mode_silencieux: Masque les messages détaillés (utile pour les 3 scénarios)
+        journal: Puits d'événements de la simulation. Par défaut : console,
+                 ou journal nul (aucun formatage) en mode silencieux
+        historique_files: Exporte la trace complète des longueurs de file
+        graine: Graine des flux aléatoires ; enregistrée dans le JSON pour
+                rejouer exactement la simulation (tirée au hasard si None)
+        dossier_resultats: Dossier du fichier JSON (None = pas de fichier)
+        nb_replications: Nombre de réplications indépendantes. Au-delà de 1,
+                         'empirique' contient les moyennes et 'replications'
+                         les IC à 95% de W_q, L et du débit (journal et
+                         historique des files ignorés)
+        nb_processus: Processus utilisés pour les réplications (tous les cœurs si None)
+        moteur: 'simpy' (un processus par véhicule) ou 'cycles' (moteur
+                vectorisé par cycles de feux, pour les longs horizons ;
+                sans journal ni historique des files)
+        conserver_vehicules: Garde tous les objets Vehicule en mémoire. Par
+                             défaut ils sont recyclés après intégration aux
+                             statistiques (mémoire bornée par les files)
+        registre_vehicules: Note les horodatages de chaque véhicule dans un
+                            RegistreVehicules en colonnes (collecteur.registre),
+                            exporté en .npz à côté du JSON (moteur 'simpy' seul)
+        precision_cible: Arrêt séquentiel : simule au-delà de duree_simulation
+                         jusqu'à ce que la demi-largeur de l'IC à 95% de W_q
+                         (moyennes de lots après troncature de la chauffe)
+                         soit sous cette valeur (secondes) sur les deux voies.
+                         Le bilan est dans donnees['arret_sequentiel']
+                         (simulation unique du moteur 'simpy')
+        duree_max: Horizon maximal de l'arrêt séquentiel
+                   (100 × duree_simulation par défaut)
+        cache: Cache disque des résultats. Une simulation avec graine déjà
+               calculée (mêmes paramètres, même VERSION_MOTEUR) est relue
+               au lieu d'être simulée (sauf journal explicite, historique
+               des files ou registre, non conservés dans le cache) ;
+               collecteur.depuis_cache l'indique
+        debit_saturation_a/b: Débit de saturation de chaque voie (véh/s de
+                              vert) : un départ toutes les 1/débit secondes
     
     Returns:
         CollecteurDonnees contenant tous les résultats
@@ -46,6 +274,27 @@ def executer_simulation(
         print(f"📏 Durée : {duree_simulation} secondes")
         print(f"🚗 Voie A : λ = {lambda_a} véh/s")
         print(f"🚙 Voie B : λ = {lambda_b} véh/s")
+        if nb_replications > 1:
+            print(f"🔁 Réplications : {nb_replications}")
+    
+    if moteur not in MOTEURS:
+        raise ValueError(f"Moteur inconnu : {moteur} (choix : {', '.join(MOTEURS)})")
+    if moteur == 'cycles' and historique_files:
+        raise ValueError("L'historique des files n'est disponible qu'avec le moteur 'simpy'")
+    if registre_vehicules and (moteur == 'cycles' or nb_replications > 1):
+        raise ValueError("Le registre des véhicules n'est disponible qu'avec une "
+                         "simulation unique du moteur 'simpy'")
+    if precision_cible is not None:
+        if moteur == 'cycles' or nb_replications > 1:
+            raise ValueError("L'arrêt séquentiel n'est disponible qu'avec une "
+                             "simulation unique du moteur 'simpy'")
+        if precision_cible <= 0:
+            raise ValueError(f"Précision cible invalide : {precision_cible}")
+        if duree_max is None:
+            duree_max = 100 * duree_simulation
+    if debit_saturation_a <= 0 or debit_saturation_b <= 0:
+        raise ValueError(f"Débits de saturation invalides : "
+                         f"{debit_saturation_a}, {debit_saturation_b}")
     
     # Configuration par défaut si aucune n'est fournie
     if config_feux is None:
@@ -69,24 +318,12 @@ def executer_simulation(
     if not mode_silencieux:
         print(f"\n🚀 Lancement de la simulation...\n")
     
-    # Environnement SimPy
-    env = simpy.Environment()
+    journal_fourni = journal
+    if journal is None:
+        journal = JournalNul() if mode_silencieux else JournalConsole()
     
-    # Composants
-    systeme_feux = SystemeFeux(env, config_feux)
-    intersection = Intersection(env, systeme_feux)
-    generateur = GenerateurVehicules(env, lambda_a, lambda_b)
-    
-    # Processus
-    env.process(systeme_feux.gerer_cycle())
-    env.process(generateur.generer_voie_a(intersection))
-    env.process(generateur.generer_voie_b(intersection))
-    
-    # Exécution
-    env.run(until=duree_simulation)
-    
-    if not mode_silencieux:
-        print(f"✅ Simulation terminée en {duree_simulation} secondes !\n")
+    # Flux aléatoires indépendants (un par composant stochastique)
+    flux = FluxAleatoires(graine)
     
     # Collecte des données
     collecteur = CollecteurDonnees()
@@ -96,95 +333,257 @@ def executer_simulation(
         lambda_b=lambda_b,
         mu_b=mu_b,
         duree_simulation=duree_simulation,
-        config_feux={
-            'T_A': config_feux.duree_vert_a,
-            'T_B': config_feux.duree_vert_b,
-            'T_jaune': config_feux.duree_jaune,
-            'T_pietons': config_feux.duree_pietons,
-            'T_cycle': config_feux.duree_cycle
-        }
+        config_feux={**config_feux.to_dict(), 'T_cycle': config_feux.duree_cycle},
+        graine=flux.graine,
+        debit_saturation_a=debit_saturation_a,
+        debit_saturation_b=debit_saturation_b
     )
+    collecteur.donnees['parametres']['moteur'] = moteur
     
-    stats_inter = intersection.obtenir_statistiques()
-    stats_gen = generateur.obtenir_statistiques()
-    stats_feux = systeme_feux.obtenir_statistiques()
+    # Cache : uniquement pour des résultats reproductibles et entièrement
+    # contenus dans collecteur.donnees
+    cle = None
+    donnees_en_cache = None
+    if (cache is not None and graine is not None and journal_fourni is None
+            and not historique_files and not registre_vehicules):
+        cle = cle_cache({
+            'version_moteur': VERSION_MOTEUR,
+            'parametres': collecteur.donnees['parametres'],
+            'moteur': moteur,
+            'nb_replications': nb_replications,
+            'conserver_vehicules': conserver_vehicules,
+            'precision_cible': precision_cible,
+            'duree_max': duree_max
+        })
+        donnees_en_cache = cache.lire(cle)
     
-    collecteur.enregistrer_resultats(stats_inter, stats_gen, stats_feux)
+    if donnees_en_cache is not None:
+        collecteur.donnees = donnees_en_cache
+        collecteur.depuis_cache = True
+        stats_inter = collecteur.donnees['empirique']
+        if not mode_silencieux:
+            print("📦 Résultats relus depuis le cache (aucune simulation)")
+    elif nb_replications > 1:
+        # Réplications indépendantes : séquence fille n°i de la graine,
+        # agrégées au fil de l'eau (mémoire constante en N)
+        taches = (tache_replication(flux.graine, indice, duree_simulation, lambda_a, lambda_b,
+                                    config_feux, moteur,
+                                    (debit_saturation_a, debit_saturation_b))
+                  for indice in range(nb_replications))
+        agregateur = AgregateurReplications()
+        for _, (stats_replication, _) in executer_en_parallele(
+                executer_replication, taches, nb_processus):
+            agregateur.ajouter(stats_replication)
+        collecteur.enregistrer_replications(agregateur)
+        stats_inter = collecteur.donnees['empirique']
+    else:
+        if registre_vehicules:
+            collecteur.registre = RegistreVehicules()
+        stats_inter, stats_gen, stats_feux, intersection = _simuler(
+            duree_simulation, lambda_a, lambda_b, config_feux,
+            journal, historique_files, flux, moteur, conserver_vehicules,
+            collecteur.registre, precision_cible, duree_max,
+            (debit_saturation_a, debit_saturation_b)
+        )
+        if precision_cible is not None:
+            collecteur.enregistrer_arret_sequentiel(
+                precision_cible, intersection.env.now, {
+                    'voie_a': intersection.file_a.troncature.intervalle_confiance(),
+                    'voie_b': intersection.file_b.troncature.intervalle_confiance()
+                })
+        
+        collecteur.enregistrer_resultats(stats_inter, stats_gen, stats_feux)
+        if historique_files:
+            collecteur.enregistrer_historique(intersection.file_a.historique.to_dict(),
+                                              intersection.file_b.historique.to_dict())
+    
+    if cle is not None and donnees_en_cache is None:
+        cache.ecrire(cle, collecteur.donnees)
+    
+    if not mode_silencieux:
+        print(f"✅ Simulation terminée en {duree_simulation} secondes !\n")
     
     # Sauvegarde JSON pour Tasnim
-    chemin_results = os.path.join('..', 'results')
-    os.makedirs(chemin_results, exist_ok=True)
-    fichier_json = os.path.join(chemin_results, f"{nom_scenario}.json")
-    collecteur.sauvegarder(fichier_json)
+    fichier_json = None
+    if dossier_resultats is not None:
+        os.makedirs(dossier_resultats, exist_ok=True)
+        fichier_json = os.path.join(dossier_resultats, f"{nom_scenario}.json")
+        collecteur.sauvegarder(fichier_json)
+        if collecteur.registre is not None:
+            collecteur.registre.exporter(os.path.join(dossier_resultats, f"{nom_scenario}.npz"))
     
     if not mode_silencieux:
         print("📊 RÉSUMÉ DES RÉSULTATS :")
         print("─" * 50)
-        print(f"🚗 Voie A → {stats_inter['voie_a']['vehicules_servis']} véhicules servis | "
+        print(f"🚗 Voie A → {stats_inter['voie_a']['vehicules_servis']:.0f} véhicules servis | "
               f"Attente moyenne : {stats_inter['voie_a']['temps_attente_moyen']:.2f}s")
-        print(f"🚙 Voie B → {stats_inter['voie_b']['vehicules_servis']} véhicules servis | "
+        print(f"🚙 Voie B → {stats_inter['voie_b']['vehicules_servis']:.0f} véhicules servis | "
               f"Attente moyenne : {stats_inter['voie_b']['temps_attente_moyen']:.2f}s")
+        if 'replications' in collecteur.donnees:
+            for voie in ('voie_a', 'voie_b'):
+                ic = collecteur.donnees['replications'][voie]['temps_attente_moyen']['ic_95']
+                print(f"   IC 95% W_q {voie[-1].upper()} : [{ic[0]:.2f}s ; {ic[1]:.2f}s]")
+        if 'arret_sequentiel' in collecteur.donnees:
+            arret = collecteur.donnees['arret_sequentiel']
+            print(f"⏱️  Arrêt à t = {arret['duree_simulee']:.0f}s "
+                  f"({'précision atteinte' if arret['precision_atteinte'] else 'horizon maximal'})")
+            for voie in ('voie_a', 'voie_b'):
+                # Demi-largeur None : trop peu de lots pour un intervalle
+                demi_largeur = arret[voie]['demi_largeur']
+                print(f"   W_q {voie[-1].upper()} stationnaire : {arret[voie]['moyenne']:.2f}s "
+                      + (f"± {demi_largeur:.2f}s" if demi_largeur is not None
+                         else "± ∞ (trop peu de lots)"))
         print("─" * 50)
-        print(f"💾 Fichier sauvegardé : {fichier_json}")
+        if fichier_json is not None:
+            print(f"💾 Fichier sauvegardé : {fichier_json}")
     
     return collecteur
 
 
-def executer_3_scenarios():
+# Scénarios définis par Khaoula dans son rapport
+SCENARIOS_REFERENCE = [
+    {
+        "nom": "scenario1_trafic_leger",
+        "titre": "Scénario 1 : Trafic Léger",
+        "lambda_a": 0.3,
+        "lambda_b": 0.3,
+        "T_A": 30,
+        "T_B": 25,
+        "T_pietons": 15
+    },
+    {
+        "nom": "scenario2_asymetrique",
+        "titre": "Scénario 2 : Asymétrique (dangereux)",
+        "lambda_a": 0.4,
+        "lambda_b": 0.4,
+        "T_A": 40,
+        "T_B": 20,
+        "T_pietons": 15
+    },
+    {
+        "nom": "scenario3_optimise",
+        "titre": "Scénario 3 : Optimisé (équilibré)",
+        "lambda_a": 0.3,
+        "lambda_b": 0.3,
+        "T_A": 28,
+        "T_B": 28,
+        "T_pietons": 14
+    }
+]
+
+
+def _executer_scenario(tache: dict) -> Tuple[CollecteurDonnees, float]:
+    """
+    Exécute un scénario (fonction de niveau module pour le pool de processus)
+    
+    Returns:
+        (collecteur, durée réelle de la simulation en secondes)
+    """
+    sc = tache["scenario"]
+    config = ConfigurationFeux(
+        duree_vert_a=sc["T_A"],
+        duree_vert_b=sc["T_B"],
+        duree_pietons=sc.get("T_pietons", 15)
+    )
+    debut = time.perf_counter()
+    collecteur = executer_simulation(
+        duree_simulation=tache["duree_simulation"],
+        lambda_a=sc["lambda_a"],
+        lambda_b=sc["lambda_b"],
+        config_feux=config,
+        nom_scenario=sc["nom"],
+        mode_silencieux=tache["mode_silencieux"],
+        graine=tache["graine"],
+        dossier_resultats=tache["dossier_resultats"],
+        cache=tache.get("cache")
+    )
+    return collecteur, time.perf_counter() - debut
+
+
+def executer_scenarios(
+    scenarios: List[dict],
+    duree_simulation: float = 600.0,
+    nb_processus: Optional[int] = None,
+    graine: Optional[int] = None,
+    mode_silencieux: bool = True,
+    dossier_resultats: Optional[str] = os.path.join('..', 'results'),
+    cache: Optional[CacheResultats] = None
+) -> List[CollecteurDonnees]:
+    """
+    Exécute un lot de scénarios en parallèle (un processus par simulation)
+    
+    Chaque scénario garde son propre fichier JSON ; les résultats sont
+    renvoyés dans l'ordre de la liste, quel que soit l'ordre de fin.
+    
+    Args:
+        scenarios: Scénarios au format de SCENARIOS_REFERENCE
+        duree_simulation: Durée de chaque simulation (secondes)
+        nb_processus: Nombre de processus (tous les cœurs si None, 1 = séquentiel)
+        graine: Graine commune (mêmes arrivées pour chaque scénario)
+        mode_silencieux: Masque les messages détaillés de chaque simulation
+        dossier_resultats: Dossier des fichiers JSON (None = pas de fichier)
+        cache: Cache disque des résultats (utilisé si graine est fixée)
+    
+    Returns:
+        Liste des CollecteurDonnees, dans l'ordre des scénarios
+    """
+    taches = [{
+        "scenario": sc,
+        "duree_simulation": duree_simulation,
+        "mode_silencieux": mode_silencieux,
+        "graine": graine,
+        "dossier_resultats": dossier_resultats,
+        "cache": cache
+    } for sc in scenarios]
+    
+    resultats: List[Optional[CollecteurDonnees]] = [None] * len(taches)
+    duree_cumulee = 0.0
+    debut = time.perf_counter()
+    for indice, (collecteur, duree_reelle) in executer_en_parallele(
+            _executer_scenario, taches, nb_processus):
+        resultats[indice] = collecteur
+        duree_cumulee += duree_reelle
+    duree_murale = time.perf_counter() - debut
+    
+    acceleration = duree_cumulee / duree_murale if duree_murale > 0 else 1.0
+    print(f"⏱️  {len(taches)} scénario(s) en {duree_murale:.2f}s "
+          f"(séquentiel estimé : {duree_cumulee:.2f}s → accélération ×{acceleration:.1f})")
+    
+    return resultats
+
+
+def executer_3_scenarios(graine: Optional[int] = None, nb_processus: int = 1,
+                         cache: Optional[CacheResultats] = None):
     """
     Exécute les 3 scénarios définis par Khaoula dans son rapport
     → Génère 3 fichiers JSON dans ../results/ pour Tasnim
+    
+    Args:
+        graine: Graine commune aux 3 scénarios (mêmes arrivées pour chacun)
+        nb_processus: 1 = un scénario après l'autre avec tous les messages,
+                      sinon exécution parallèle silencieuse (None = tous les cœurs)
+        cache: Cache disque des résultats : avec une graine fixée, une
+               relance sans changement ne resimule rien
     """
     print("\n" + "🎯 " * 30)
     print("     EXÉCUTION DES 3 SCÉNARIOS DE RÉFÉRENCE")
     print("🎯 " * 30 + "\n")
     
-    scenarios = [
-        {
-            "nom": "scenario1_trafic_leger",
-            "titre": "Scénario 1 : Trafic Léger",
-            "lambda_a": 0.3,
-            "lambda_b": 0.3,
-            "T_A": 30,
-            "T_B": 25,
-            "T_pietons": 15
-        },
-        {
-            "nom": "scenario2_asymetrique",
-            "titre": "Scénario 2 : Asymétrique (dangereux)",
-            "lambda_a": 0.4,
-            "lambda_b": 0.4,
-            "T_A": 40,
-            "T_B": 20,
-            "T_pietons": 15
-        },
-        {
-            "nom": "scenario3_optimise",
-            "titre": "Scénario 3 : Optimisé (équilibré)",
-            "lambda_a": 0.3,
-            "lambda_b": 0.3,
-            "T_A": 28,
-            "T_B": 28,
-            "T_pietons": 14
-        }
-    ]
-    
-    for i, sc in enumerate(scenarios, 1):
-        print(f"📌 {sc['titre']} (Scénario {i}/3)")
-        config = ConfigurationFeux(
-            duree_vert_a=sc["T_A"],
-            duree_vert_b=sc["T_B"],
-            duree_pietons=sc.get("T_pietons", 15)
-        )
-        executer_simulation(
-            duree_simulation=600,  # 10 minutes de simulation pour des stats solides
-            lambda_a=sc["lambda_a"],
-            lambda_b=sc["lambda_b"],
-            config_feux=config,
-            nom_scenario=sc["nom"],
-            mode_silencieux=False  # On veut voir les résultats
-        )
-        print()
+    if nb_processus == 1:
+        for i, sc in enumerate(SCENARIOS_REFERENCE, 1):
+            print(f"📌 {sc['titre']} (Scénario {i}/3)")
+            _executer_scenario({
+                "scenario": sc,
+                "duree_simulation": 600,  # 10 minutes de simulation pour des stats solides
+                "mode_silencieux": False,  # On veut voir les résultats
+                "graine": graine,
+                "dossier_resultats": os.path.join('..', 'results'),
+                "cache": cache
+            })
+            print()
+    else:
+        executer_scenarios(SCENARIOS_REFERENCE, duree_simulation=600,
+                           nb_processus=nb_processus, graine=graine, cache=cache)
     
     print("🎉" * 30)
     print("TOUS LES SCÉNARIOS SONT TERMINÉS !")
@@ -211,9 +610,10 @@ if __name__ == "__main__":
     print("\n📋 MENU PRINCIPAL")
     print("   1. Simulation simple (test rapide)")
     print("   2. Exécuter les 3 scénarios complets (recommandé)")
-    print("   3. Quitter")
+    print("   3. Exécuter les 3 scénarios en parallèle (tous les cœurs)")
+    print("   4. Quitter")
     
-    choix = input("\n🔸 Votre choix (1/2/3) : ").strip()
+    choix = input("\n🔸 Votre choix (1/2/3/4) : ").strip()
     
     if choix == "1":
         print("\n🚀 Lancement d'une simulation de test...")
@@ -228,6 +628,9 @@ if __name__ == "__main__":
         executer_3_scenarios()
     
     elif choix == "3":
+        executer_3_scenarios(nb_processus=None)
+    
+    elif choix == "4":
         print("\n👋 Merci et à bientôt !")
     
     else:
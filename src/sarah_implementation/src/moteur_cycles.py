@@ -0,0 +1,263 @@
+"""
+MOTEUR_CYCLES.PY - Moteur rapide par cycles de feux (sans SimPy)
+Responsable : Sarah
+Projet : Simulation de Feux de Circulation
+
+Le cycle S1 → S5 est entièrement déterministe et les arrivées sont de
+Poisson : inutile de créer un processus SimPy par véhicule. Ce moteur
+traite les cycles par blocs avec NumPy :
+- arrivées tirées en bloc (même flux que le moteur SimPy à graine égale)
+- passage en "temps de vert" : G(t) = temps de vert écoulé sur la voie
+  jusqu'à t ; un véhicule arrivé au rouge attend le début du vert suivant
+- départs au débit de saturation de la voie s = 1/h pendant le vert (et
+  le jaune) :
+  d_k = max(G(a_k), d_{k-1} + h) = k·h + max_{j≤k}(G(a_j) - j·h)
+  soit un cumul maximal vectorisé (np.maximum.accumulate)
+- retour en temps réel puis statistiques au même format que
+  Intersection.obtenir_statistiques (sans les quantiles t-digest, qui
+  demanderaient une boucle Python par véhicule)
+
+Différence avec SimPy : un véhicule ne commence jamais sa traversée au
+rouge (dans SimPy, un véhicule qui a vu le vert finit par passer même si le
+feu est repassé au rouge). Au débit par défaut (10 véh/s) l'écart est
+négligeable.
+"""
+
+import math
+import numpy as np
+from typing import Optional
+
+from feux import ConfigurationFeux
+from vehicule import EchantillonneurExponentiel
+from intersection import DEBIT_SATURATION
+from statistiques_en_ligne import TroncatureMSER
+
+
+class VoieCycles:
+    """
+    Une voie traitée par blocs de cycles
+
+    Seul l'état nécessaire au bloc suivant est gardé (dernier départ en
+    temps de vert, arrivées déjà tirées) : la mémoire ne dépend pas de
+    l'horizon.
+    """
+
+    def __init__(self, echantillonneur: EchantillonneurExponentiel,
+                 debut_vert: float, duree_vert: float, duree_cycle: float,
+                 duree_traversee: float):
+        """
+        Args:
+            echantillonneur: Temps inter-arrivée de la voie
+            debut_vert: Début du vert dans le cycle (secondes)
+            duree_vert: Durée de passage autorisé (vert + jaune)
+            duree_cycle: Durée totale du cycle
+            duree_traversee: Intervalle entre deux départs (1 / débit de saturation)
+        """
+        self.echantillonneur = echantillonneur
+        self.debut_vert = debut_vert
+        self.duree_vert = duree_vert
+        self.duree_cycle = duree_cycle
+        self.duree_traversee = duree_traversee
+
+        self._arrivees_en_attente = np.empty(0)
+        self._derniere_arrivee = 0.0
+        self._dernier_depart_vert = -math.inf
+
+        # Statistiques (mêmes définitions que FileAttente)
+        self.vehicules_total = 0
+        self.vehicules_servis = 0
+        self.en_file = 0
+        self.somme_attente = 0.0
+        self.somme_carres_attente = 0.0
+        self.attente_max = 0.0
+        self.aire_file = 0.0
+        self.aire_systeme = 0.0
+        self.troncature = TroncatureMSER()
+
+    def _arrivees_avant(self, t_fin: float) -> np.ndarray:
+        """Retourne les arrivées de [t_debut_bloc, t_fin), tirées par blocs"""
+        morceaux = [self._arrivees_en_attente]
+        while self._derniere_arrivee < t_fin:
+            nouvelles = self._derniere_arrivee + np.cumsum(self.echantillonneur.bloc_suivant())
+            self._derniere_arrivee = nouvelles[-1]
+            morceaux.append(nouvelles)
+        arrivees = np.concatenate(morceaux)
+        coupure = np.searchsorted(arrivees, t_fin, side='left')
+        self._arrivees_en_attente = arrivees[coupure:]
+        return arrivees[:coupure]
+
+    def _vers_temps_vert(self, t: np.ndarray) -> np.ndarray:
+        """G(t) : temps de vert cumulé jusqu'à t (constant pendant le rouge)"""
+        numero_cycle = np.floor(t / self.duree_cycle)
+        dans_cycle = t - numero_cycle * self.duree_cycle
+        return (numero_cycle * self.duree_vert +
+                np.clip(dans_cycle - self.debut_vert, 0.0, self.duree_vert))
+
+    def _vers_temps_reel(self, g: np.ndarray) -> np.ndarray:
+        """Inverse de G : instant réel correspondant à un temps de vert"""
+        numero_cycle = np.floor(g / self.duree_vert)
+        return (numero_cycle * self.duree_cycle + self.debut_vert +
+                (g - numero_cycle * self.duree_vert))
+
+    def traiter_bloc(self, t_fin: float, horizon: float):
+        """
+        Simule les arrivées jusqu'à t_fin et cumule leurs statistiques
+
+        Args:
+            t_fin: Fin du bloc de cycles
+            horizon: Fin de la simulation (départs au-delà non comptés)
+        """
+        arrivees = self._arrivees_avant(min(t_fin, horizon))
+        n = len(arrivees)
+        if n == 0:
+            return
+
+        h = self.duree_traversee
+        rangs = np.arange(n) * h
+        debut_vert = np.maximum.accumulate(self._vers_temps_vert(arrivees) - rangs) + rangs
+        debut_vert = np.maximum(debut_vert, self._dernier_depart_vert + h + rangs)
+        self._dernier_depart_vert = debut_vert[-1]
+        debut_service = self._vers_temps_reel(debut_vert)
+
+        servis = debut_service + h < horizon
+        attentes = debut_service[servis] - arrivees[servis]
+
+        self.vehicules_total += n
+        self.vehicules_servis += int(servis.sum())
+        self.en_file += int((debut_service >= horizon).sum())
+        if len(attentes):
+            self.somme_attente += float(attentes.sum())
+            self.somme_carres_attente += float(np.dot(attentes, attentes))
+            self.attente_max = max(self.attente_max, float(attentes.max()))
+            self.troncature.ajouter_bloc(attentes, debut_service[servis] + h)
+        self.aire_file += float((np.minimum(debut_service, horizon) - arrivees).sum())
+        self.aire_systeme += float((np.minimum(debut_service + h, horizon) - arrivees).sum())
+
+    def statistiques(self, horizon: float) -> dict:
+        """Statistiques au format de Intersection.obtenir_statistiques"""
+        return {
+            'vehicules_total': self.vehicules_total,
+            'vehicules_servis': self.vehicules_servis,
+            'temps_attente_moyen': self._attente_moyenne(),
+            'temps_attente_std': self._ecart_type_attente(echantillon=True),
+            'temps_attente_max': self.attente_max,
+            **self._attente_stationnaire(),
+            'longueur_file_actuelle': self.en_file,
+            'longueur_moyenne_file': self.aire_file / horizon if horizon > 0 else 0.0,
+            'nombre_moyen_systeme': self.aire_systeme / horizon if horizon > 0 else 0.0,
+            'debit': self.vehicules_servis / horizon if horizon > 0 else 0.0
+        }
+
+    def statistiques_vehicules(self) -> dict:
+        """Statistiques au format de GenerateurVehicules.obtenir_statistiques"""
+        if self.vehicules_total == 0:
+            return {
+                'nombre_total': 0,
+                'temps_attente_moyen': 0,
+                'temps_attente_max': 0
+            }
+        return {
+            'nombre_total': self.vehicules_total,
+            'nombre_servis': self.vehicules_servis,
+            'temps_attente_moyen': self._attente_moyenne(),
+            'temps_attente_max': self.attente_max,
+            'temps_attente_std': self._ecart_type_attente(echantillon=False)
+        }
+
+    def _attente_moyenne(self) -> float:
+        if self.vehicules_servis == 0:
+            return 0.0
+        return self.somme_attente / self.vehicules_servis
+    
+    def _attente_stationnaire(self) -> dict:
+        """Mêmes clés que FileAttente.attente_stationnaire"""
+        resultat = self.troncature.resultat()
+        return {
+            'temps_attente_moyen_stationnaire': resultat['moyenne'],
+            'troncature_vehicules': resultat['observations_ecartees'],
+            'troncature_temps': resultat['temps_troncature']
+        }
+    
+    def _ecart_type_attente(self, echantillon: bool) -> float:
+        """Écart-type des attentes (n-1 si echantillon, sinon n comme np.std)"""
+        n = self.vehicules_servis
+        if n < (2 if echantillon else 1):
+            return 0.0
+        ecarts = max(self.somme_carres_attente - n * self._attente_moyenne() ** 2, 0.0)
+        return math.sqrt(ecarts / (n - 1 if echantillon else n))
+
+
+class MoteurCycles:
+    """
+    Moteur vectorisé : même interface de résultats que le trio
+    SystemeFeux / Intersection / GenerateurVehicules
+    """
+
+    def __init__(self, lambda_a: float, lambda_b: float, config: ConfigurationFeux,
+                 generateur_a: Optional[np.random.Generator] = None,
+                 generateur_b: Optional[np.random.Generator] = None,
+                 debit_saturation_a: float = DEBIT_SATURATION,
+                 debit_saturation_b: float = DEBIT_SATURATION,
+                 cycles_par_bloc: int = 256,
+                 taille_bloc: int = 1024):
+        """
+        Args:
+            lambda_a, lambda_b: Taux d'arrivée (véhicules/seconde)
+            config: Configuration des feux
+            generateur_a/b: Flux aléatoires des arrivées de chaque voie
+            debit_saturation_a/b: Débit de saturation de chaque voie (véh/s de vert)
+            cycles_par_bloc: Nombre de cycles traités par opération NumPy
+            taille_bloc: Taille des blocs de tirages (comme GenerateurVehicules)
+        """
+        self.config = config
+        self.cycles_par_bloc = cycles_par_bloc
+        cycle = config.duree_cycle
+        self.voie_a = VoieCycles(
+            EchantillonneurExponentiel(lambda_a, generateur_a, taille_bloc),
+            debut_vert=0.0,
+            duree_vert=config.duree_vert_a + config.duree_jaune,
+            duree_cycle=cycle,
+            duree_traversee=1.0 / debit_saturation_a
+        )
+        self.voie_b = VoieCycles(
+            EchantillonneurExponentiel(lambda_b, generateur_b, taille_bloc),
+            debut_vert=config.duree_vert_a + config.duree_jaune,
+            duree_vert=config.duree_vert_b + config.duree_jaune,
+            duree_cycle=cycle,
+            duree_traversee=1.0 / debit_saturation_b
+        )
+        self.horizon = 0.0
+
+    def executer(self, duree_simulation: float):
+        """Simule [0, duree_simulation) bloc de cycles par bloc de cycles"""
+        self.horizon = duree_simulation
+        duree_bloc = self.cycles_par_bloc * self.config.duree_cycle
+        t_fin = 0.0
+        while t_fin < duree_simulation:
+            t_fin += duree_bloc
+            self.voie_a.traiter_bloc(t_fin, duree_simulation)
+            self.voie_b.traiter_bloc(t_fin, duree_simulation)
+
+    def obtenir_statistiques(self) -> dict:
+        """Indicateurs par voie (format Intersection.obtenir_statistiques)"""
+        return {
+            'voie_a': self.voie_a.statistiques(self.horizon),
+            'voie_b': self.voie_b.statistiques(self.horizon)
+        }
+
+    def obtenir_statistiques_vehicules(self) -> dict:
+        """Attentes par voie (format GenerateurVehicules.obtenir_statistiques)"""
+        return {
+            'voie_a': self.voie_a.statistiques_vehicules(),
+            'voie_b': self.voie_b.statistiques_vehicules()
+        }
+
+    def obtenir_statistiques_feux(self) -> dict:
+        """Cycles des feux (format SystemeFeux.obtenir_statistiques)"""
+        return {
+            'nombre_cycles': max(math.ceil(self.horizon / self.config.duree_cycle) - 1, 0),
+            'duree_cycle': self.config.duree_cycle,
+            'proportion_vert_a': self.config.proportion_vert_a(),
+            'proportion_vert_b': self.config.proportion_vert_b(),
+            'temps_simulation': self.horizon
+        }
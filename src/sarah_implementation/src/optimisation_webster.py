@@ -0,0 +1,145 @@
+"""
+OPTIMISATION_WEBSTER.PY - Cycle optimal et répartition du vert (Webster)
+Responsable : Sarah
+Projet : Simulation de Feux de Circulation
+
+Pour des débits λ_A, λ_B et des débits de saturation s_A, s_B :
+- rapports de charge y_i = λ_i / s_i, Y = y_A + y_B
+- temps perdu par cycle L : phase piétons (aucun véhicule ne passe) plus
+  un éventuel temps perdu au démarrage de chaque phase véhicules
+- cycle optimal de Webster C0 = (1.5·L + 5) / (1 - Y)
+- vert effectif g_i = (C - L)·y_i / Y, puis T_i = g_i - T_jaune (le jaune
+  fait partie du vert effectif, comme dans la simulation)
+
+Le cycle est borné par [duree_cycle_min, duree_cycle_max] et chaque vert
+par duree_vert_min ; au-delà de Y ≥ 1 (ou de duree_cycle_max) le plan est
+marqué saturé. Tout est vectorisé : un plan horaire complet (une demande
+par tranche horaire) se calcule en un appel.
+
+Usage :
+    python optimisation_webster.py
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from feux import ConfigurationFeux
+from intersection import DUREE_TRAVERSEE
+
+
+def plan_webster(lambda_a, lambda_b,
+                 debit_saturation_a=1.0 / DUREE_TRAVERSEE,
+                 debit_saturation_b=1.0 / DUREE_TRAVERSEE,
+                 duree_jaune: float = 3.0,
+                 duree_pietons: float = 15.0,
+                 temps_perdu_phase: float = 0.0,
+                 duree_vert_min: float = 10.0,
+                 duree_cycle_min: float = 40.0,
+                 duree_cycle_max: float = 150.0,
+                 pas_arrondi: Optional[float] = 1.0) -> Dict[str, np.ndarray]:
+    """
+    Cycle de Webster et répartition du vert, vectorisés sur les demandes
+
+    Args:
+        lambda_a, lambda_b: Débits d'arrivée (véh/s), scalaires ou tableaux
+        debit_saturation_a/b: Débits de saturation (véh/s de vert effectif)
+        duree_jaune: T_jaune, conservé tel quel
+        duree_pietons: T_pietons, conservé tel quel (temps perdu du cycle)
+        temps_perdu_phase: Temps perdu au démarrage de chaque phase véhicules
+        duree_vert_min: Vert minimal de chaque voie (T_A, T_B)
+        duree_cycle_min, duree_cycle_max: Bornes du cycle
+        pas_arrondi: Arrondi des verts (secondes ; None = pas d'arrondi)
+
+    Returns:
+        Tableaux diffusés : T_A, T_B, duree_cycle, duree_cycle_webster (C0
+        avant bornes, +inf si Y ≥ 1), Y et sature (Y ≥ 1 ou C0 > cycle max)
+    """
+    lambda_a, lambda_b, s_a, s_b = (np.asarray(v, dtype=float) for v in np.broadcast_arrays(
+        lambda_a, lambda_b, debit_saturation_a, debit_saturation_b))
+    y_a = lambda_a / s_a
+    y_b = lambda_b / s_b
+    Y = y_a + y_b
+
+    temps_perdu = duree_pietons + 2 * temps_perdu_phase
+    cycle_webster = np.full(Y.shape, np.inf)
+    np.divide(1.5 * temps_perdu + 5.0, 1.0 - Y, out=cycle_webster, where=Y < 1)
+
+    # Cycle le plus court compatible avec les verts minimaux
+    cycle_plancher = max(duree_cycle_min,
+                         2 * duree_vert_min + 2 * duree_jaune + duree_pietons)
+    if cycle_plancher > duree_cycle_max:
+        raise ValueError(f"Verts minimaux incompatibles avec le cycle maximal "
+                         f"({cycle_plancher:.0f}s > {duree_cycle_max:.0f}s)")
+    cycle = np.clip(cycle_webster, cycle_plancher, duree_cycle_max)
+
+    # T_A + T_B est fixé par le cycle ; partage proportionnel à y_i
+    total_verts = cycle - 2 * duree_jaune - duree_pietons
+    vert_effectif = cycle - temps_perdu
+    part_a = np.divide(y_a, Y, out=np.full(Y.shape, 0.5), where=Y > 0)
+    T_A = np.clip(vert_effectif * part_a - duree_jaune + temps_perdu_phase,
+                  duree_vert_min, total_verts - duree_vert_min)
+    if pas_arrondi:
+        T_A = np.round(T_A / pas_arrondi) * pas_arrondi
+        total_verts = np.round(total_verts / pas_arrondi) * pas_arrondi
+        T_A = np.clip(T_A, duree_vert_min, total_verts - duree_vert_min)
+    T_B = total_verts - T_A
+
+    return {
+        'T_A': T_A,
+        'T_B': T_B,
+        'duree_cycle': T_A + T_B + 2 * duree_jaune + duree_pietons,
+        'duree_cycle_webster': cycle_webster,
+        'Y': Y,
+        'sature': (Y >= 1) | (cycle_webster > duree_cycle_max)
+    }
+
+
+def configurations_webster(lambda_a, lambda_b, duree_jaune: float = 3.0,
+                           duree_pietons: float = 15.0, **options) -> List[ConfigurationFeux]:
+    """
+    Plan de Webster sous forme de ConfigurationFeux prêtes à simuler
+
+    Args:
+        lambda_a, lambda_b: Débits (scalaires ou tableaux, un par tranche horaire)
+        duree_jaune, duree_pietons: Durées fixes reprises dans chaque configuration
+        **options: Autres arguments de plan_webster
+
+    Returns:
+        Une configuration par demande, dans l'ordre (aplati) des entrées
+    """
+    plan = plan_webster(lambda_a, lambda_b, duree_jaune=duree_jaune,
+                        duree_pietons=duree_pietons, **options)
+    return [ConfigurationFeux(duree_vert_a=float(t_a), duree_vert_b=float(t_b),
+                              duree_jaune=duree_jaune, duree_pietons=duree_pietons)
+            for t_a, t_b in zip(plan['T_A'].ravel(), plan['T_B'].ravel())]
+
+
+def configuration_webster(lambda_a: float, lambda_b: float, **options) -> ConfigurationFeux:
+    """Configuration de Webster pour une seule demande"""
+    return configurations_webster(lambda_a, lambda_b, **options)[0]
+
+
+# Démonstration : plan horaire sur une journée type
+if __name__ == "__main__":
+    from statistiques import retards_feux
+
+    heures = np.arange(24)
+    # Pointes du matin (voie A) et du soir (voie B)
+    lambda_a = 0.03 + 0.2 * np.exp(-((heures - 8) / 1.5) ** 2) + 0.06 * np.exp(-((heures - 18) / 2) ** 2)
+    lambda_b = 0.03 + 0.06 * np.exp(-((heures - 8) / 2) ** 2) + 0.2 * np.exp(-((heures - 18) / 1.5) ** 2)
+    # Débit de saturation d'une voie réelle (1800 véh/h de vert) : avec celui
+    # du modèle (1/DUREE_TRAVERSEE) tous les verts restent au minimum
+    saturation = 0.5
+
+    plan = plan_webster(lambda_a, lambda_b, saturation, saturation)
+    retards = retards_feux(lambda_a, lambda_b, plan['T_A'], plan['T_B'],
+                           debit_saturation_a=saturation, debit_saturation_b=saturation)
+    print("Heure |  λ_A  |  λ_B  | T_A | T_B | Cycle | Webster A | Webster B")
+    print("─" * 70)
+    for h in heures:
+        print(f" {h:02d}h  | {lambda_a[h]:.3f} | {lambda_b[h]:.3f} | {plan['T_A'][h]:3.0f} | "
+              f"{plan['T_B'][h]:3.0f} | {plan['duree_cycle'][h]:5.0f} | "
+              f"{retards['voie_a']['retard_webster'][h]:8.1f}s | "
+              f"{retards['voie_b']['retard_webster'][h]:8.1f}s"
+              f"{'  ⚠️ saturé' if plan['sature'][h] else ''}")
@@ -0,0 +1,410 @@
+"""
+OPTIMISEUR.PY - Recherche des durées de feux minimisant l'attente
+Responsable : Sarah
+Projet : Simulation de Feux de Circulation
+
+Variables : x = (T_A, T_B, T_pietons), T_jaune fixé.
+Objectif : W_q pondéré (λ_A·W_A + λ_B·W_B) / (λ_A + λ_B), moyenne sur N
+réplications.
+
+- Contraintes : verts et phase piétons bornés, cycle maximal. Un sommet
+  hors du domaine est évalué en son projeté (arrondi au pas, 1 s par
+  défaut), pénalisé par sa distance au domaine : le simplexe garde sa
+  dimension le long des contraintes actives.
+- Départ : plan de Webster (optimisation_webster.py) pour la demande.
+- Bruit : toutes les configurations sont simulées avec les mêmes
+  réplications (nombres aléatoires communs) : l'objectif devient une
+  fonction déterministe, que Nelder–Mead sait minimiser. À la stagnation,
+  le nombre de réplications double (les réplications déjà simulées sont
+  réutilisées) tant que nb_replications_max n'est pas atteint.
+- Parallélisme : à chaque itération, réflexion, expansion et les deux
+  contractions sont évaluées ensemble (évaluation spéculative : plus de
+  simulations, mais une seule attente par itération).
+- Cache : chaque (configuration, réplication) est mémorisée ; avec une
+  graine et un CacheResultats, elle l'est aussi sur disque.
+
+Usage :
+    python optimiseur.py --lambda-a 0.3 --lambda-b 0.2 --graine 2024
+"""
+
+import argparse
+import math
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from feux import ConfigurationFeux
+from aleatoire import FluxAleatoires
+from statistiques import AccumulateurWelford
+from parallele import executer_en_parallele
+from cache_resultats import CacheResultats
+from main import MOTEURS, executer_replication, tache_replication
+from intersection import DUREE_TRAVERSEE
+from optimisation_webster import plan_webster
+
+
+Point = Tuple[float, float, float]  # (T_A, T_B, T_pietons) arrondis
+
+
+@dataclass
+class ContraintesFeux:
+    """Domaine admissible des durées de feux (secondes)"""
+    duree_vert_min: float = 10.0
+    duree_vert_max: float = 90.0
+    duree_pietons_min: float = 10.0
+    duree_pietons_max: float = 30.0
+    duree_cycle_max: float = 120.0
+    duree_jaune: float = 3.0
+    pas: Optional[float] = 1.0      # Arrondi des points évalués (None = aucun)
+
+    def __post_init__(self):
+        cycle_minimal = (2 * self.duree_vert_min + self.duree_pietons_min +
+                         2 * self.duree_jaune)
+        if cycle_minimal > self.duree_cycle_max:
+            raise ValueError(f"Contraintes incompatibles : cycle minimal {cycle_minimal:.0f}s "
+                             f"> cycle maximal {self.duree_cycle_max:.0f}s")
+
+    @property
+    def minimums(self) -> np.ndarray:
+        return np.array([self.duree_vert_min, self.duree_vert_min, self.duree_pietons_min])
+
+    @property
+    def maximums(self) -> np.ndarray:
+        return np.array([self.duree_vert_max, self.duree_vert_max, self.duree_pietons_max])
+
+    def projeter(self, x) -> np.ndarray:
+        """
+        Point admissible le plus proche (sans arrondi)
+
+        Les bornes sont appliquées composante par composante ; un cycle trop
+        long est ramené à duree_cycle_max en réduisant chaque durée au
+        prorata de sa marge au-dessus du minimum.
+        """
+        x = np.clip(np.asarray(x, dtype=float), self.minimums, self.maximums)
+        exces = x.sum() + 2 * self.duree_jaune - self.duree_cycle_max
+        if exces > 0:
+            marges = x - self.minimums
+            x = x - exces * marges / marges.sum()
+        return x
+
+    def arrondir(self, x) -> Point:
+        """Point évalué : projeté puis arrondi au pas, toujours admissible"""
+        x = self.projeter(x)
+        if self.pas:
+            x = np.maximum(np.round(x / self.pas) * self.pas, self.minimums)
+            # L'arrondi peut dépasser le cycle maximal : on retire un pas à
+            # la plus grande marge jusqu'à revenir dans le domaine
+            while x.sum() + 2 * self.duree_jaune > self.duree_cycle_max + 1e-9:
+                x[np.argmax(x - self.minimums)] -= self.pas
+        return tuple(float(v) for v in x)
+
+    def configuration(self, x) -> ConfigurationFeux:
+        T_A, T_B, T_pietons = self.arrondir(x)
+        return ConfigurationFeux(duree_vert_a=T_A, duree_vert_b=T_B,
+                                 duree_jaune=self.duree_jaune, duree_pietons=T_pietons)
+
+
+def objectif_pondere(stats_intersection: dict, poids_a: float, poids_b: float) -> float:
+    """W_q pondéré d'une réplication (format Intersection.obtenir_statistiques)"""
+    return ((poids_a * stats_intersection['voie_a']['temps_attente_moyen'] +
+             poids_b * stats_intersection['voie_b']['temps_attente_moyen']) /
+            (poids_a + poids_b))
+
+
+class EvaluateurConfigurations:
+    """
+    Évalue des lots de configurations sur des réplications communes
+
+    La réplication n°i de toute configuration utilise la séquence fille n°i
+    de la graine ; chaque (point, réplication) n'est simulé qu'une fois.
+    """
+
+    def __init__(self, lambda_a: float, lambda_b: float,
+                 contraintes: Optional[ContraintesFeux] = None,
+                 duree_simulation: float = 600.0,
+                 nb_replications: int = 5,
+                 graine: Optional[int] = None,
+                 moteur: str = 'simpy',
+                 nb_processus: Optional[int] = None,
+                 cache: Optional[CacheResultats] = None,
+                 poids: Optional[Tuple[float, float]] = None):
+        """
+        Args:
+            lambda_a/b: Taux d'arrivée (véhicules/seconde)
+            contraintes: Domaine admissible (valeurs par défaut si None)
+            duree_simulation: Horizon de chaque réplication (secondes)
+            nb_replications: Réplications par point (augmentable ensuite)
+            graine: Graine commune (tirée au hasard si None)
+            moteur: 'simpy' ou 'cycles'
+            nb_processus: Processus utilisés (tous les cœurs si None)
+            cache: Cache disque (utilisé seulement si graine est fixée)
+            poids: Poids de W_A et W_B dans l'objectif ((λ_A, λ_B) si None)
+        """
+        if moteur not in MOTEURS:
+            raise ValueError(f"Moteur inconnu : {moteur} (choix : {', '.join(MOTEURS)})")
+        if nb_replications < 1:
+            raise ValueError("Il faut au moins une réplication par point")
+        self.lambda_a = lambda_a
+        self.lambda_b = lambda_b
+        self.contraintes = contraintes if contraintes is not None else ContraintesFeux()
+        self.duree_simulation = duree_simulation
+        self.nb_replications = nb_replications
+        self.graine = FluxAleatoires(graine).graine
+        self.moteur = moteur
+        self.nb_processus = nb_processus
+        self.cache = cache if graine is not None else None
+        self.poids = poids if poids is not None else (lambda_a, lambda_b)
+
+        self._valeurs: Dict[Tuple[Point, int], float] = {}
+        self.nb_simulations = 0
+        self.nb_lectures_cache = 0
+
+    def _tache(self, point: Point, indice: int) -> dict:
+        T_A, T_B, T_pietons = point
+        config = ConfigurationFeux(duree_vert_a=T_A, duree_vert_b=T_B,
+                                   duree_jaune=self.contraintes.duree_jaune,
+                                   duree_pietons=T_pietons)
+        return tache_replication(self.graine, indice, self.duree_simulation, self.lambda_a,
+                                 self.lambda_b, config, self.moteur, cache=self.cache)
+
+    def evaluer(self, points: Sequence) -> List[float]:
+        """
+        Objectif moyen de chaque point sur les nb_replications premières réplications
+
+        Toutes les simulations manquantes du lot partent ensemble dans le pool.
+        """
+        arrondis = [self.contraintes.arrondir(x) for x in points]
+        manquantes = list(dict.fromkeys(
+            (point, indice) for point in arrondis for indice in range(self.nb_replications)
+            if (point, indice) not in self._valeurs))
+
+        taches = (self._tache(point, indice) for point, indice in manquantes)
+        for k, (stats, depuis_cache) in executer_en_parallele(
+                executer_replication, taches, self.nb_processus):
+            self._valeurs[manquantes[k]] = objectif_pondere(stats, *self.poids)
+            if depuis_cache:
+                self.nb_lectures_cache += 1
+            else:
+                self.nb_simulations += 1
+
+        return [float(np.mean([self._valeurs[(point, indice)]
+                               for indice in range(self.nb_replications)]))
+                for point in arrondis]
+
+    def depart_webster(self) -> np.ndarray:
+        """Plan de Webster pour la demande, avec la phase piétons minimale"""
+        c = self.contraintes
+        plan = plan_webster(self.lambda_a, self.lambda_b,
+                            1.0 / DUREE_TRAVERSEE, 1.0 / DUREE_TRAVERSEE,
+                            duree_jaune=c.duree_jaune, duree_pietons=c.duree_pietons_min,
+                            duree_vert_min=c.duree_vert_min,
+                            duree_cycle_min=2 * c.duree_vert_min + 2 * c.duree_jaune + c.duree_pietons_min,
+                            duree_cycle_max=c.duree_cycle_max, pas_arrondi=c.pas)
+        return np.array([float(plan['T_A']), float(plan['T_B']), c.duree_pietons_min])
+
+    def resume(self, x) -> dict:
+        """Moyenne, écart-type et IC à 95% de l'objectif d'un point déjà évalué"""
+        point = self.contraintes.arrondir(x)
+        acc = AccumulateurWelford()
+        for indice in range(self.nb_replications):
+            acc.ajouter(self._valeurs[(point, indice)])
+        return acc.to_dict()
+
+    @property
+    def nb_points_evalues(self) -> int:
+        return len({point for point, _ in self._valeurs})
+
+
+def optimiser_nelder_mead(
+    evaluateur: EvaluateurConfigurations,
+    depart: Optional[Sequence[float]] = None,
+    pas_initial: float = 5.0,
+    penalite: float = 1.0,
+    nb_iterations_max: int = 100,
+    tolerance: float = 0.05,
+    iterations_stagnation: int = 8,
+    nb_replications_max: Optional[int] = None,
+    rappel_iteration=None
+) -> dict:
+    """
+    Minimise l'objectif de l'évaluateur par Nelder–Mead parallèle
+
+    Args:
+        evaluateur: Évaluateur (λ, contraintes, réplications, pool, cache)
+        depart: (T_A, T_B, T_pietons) initial (plan de Webster si None)
+        pas_initial: Taille des arêtes du simplexe initial (secondes)
+        penalite: Pénalité (secondes d'attente par seconde) de la distance
+                  d'un sommet au domaine admissible
+        nb_iterations_max: Nombre maximal d'itérations
+        tolerance: Amélioration minimale (secondes d'attente) du meilleur
+                   sommet pour remettre le compteur de stagnation à zéro
+        iterations_stagnation: Itérations sans amélioration avant arrêt
+                               (ou doublement des réplications)
+        nb_replications_max: Plafond des réplications (pas de doublement si None)
+        rappel_iteration: Fonction (iteration, meilleur_point, meilleure_valeur)
+                          appelée à chaque itération, ou None
+
+    Returns:
+        Dictionnaire :
+        - configuration : ConfigurationFeux du meilleur point
+        - meilleur : T_A, T_B, T_pietons, T_cycle
+        - objectif : moyenne/écart-type/IC à 95% sur les réplications
+        - iterations, raison_arret ('stagnation', 'simplexe_degenere',
+          'iterations_max'), nb_replications
+        - nb_simulations, nb_lectures_cache, nb_points_evalues, duree_calcul
+    """
+    contraintes = evaluateur.contraintes
+    debut = time.perf_counter()
+    if nb_replications_max is None:
+        nb_replications_max = evaluateur.nb_replications
+
+    def evaluer(sommets) -> np.ndarray:
+        distances = [np.linalg.norm(x - contraintes.projeter(x)) for x in sommets]
+        return np.array(evaluateur.evaluer(sommets)) + penalite * np.array(distances)
+
+    if depart is None:
+        depart = evaluateur.depart_webster()
+    x0 = contraintes.projeter(depart)
+    simplexe = [x0]
+    for i in range(3):
+        sommet = x0.copy()
+        sommet[i] += pas_initial
+        if contraintes.arrondir(sommet) == contraintes.arrondir(x0):
+            sommet[i] = x0[i] - pas_initial  # Borne atteinte : autre sens
+        simplexe.append(sommet)
+    simplexe = np.array(simplexe)
+    valeurs = evaluer(simplexe)
+
+    meilleure_reference = math.inf
+    sans_amelioration = 0
+    raison_arret = 'iterations_max'
+    iteration = 0
+    while iteration < nb_iterations_max:
+        ordre = np.argsort(valeurs, kind='stable')
+        simplexe, valeurs = simplexe[ordre], valeurs[ordre]
+        iteration += 1
+        if rappel_iteration is not None:
+            rappel_iteration(iteration, contraintes.arrondir(simplexe[0]), valeurs[0])
+
+        if valeurs[0] < meilleure_reference - tolerance:
+            meilleure_reference = valeurs[0]
+            sans_amelioration = 0
+        else:
+            sans_amelioration += 1
+
+        degenere = len({contraintes.arrondir(x) for x in simplexe}) == 1
+        if degenere or sans_amelioration >= iterations_stagnation:
+            if evaluateur.nb_replications >= nb_replications_max:
+                raison_arret = 'simplexe_degenere' if degenere else 'stagnation'
+                break
+            # Bruit : plus de réplications, puis on repart du même simplexe
+            evaluateur.nb_replications = min(2 * evaluateur.nb_replications,
+                                              nb_replications_max)
+            valeurs = evaluer(simplexe)
+            meilleure_reference = math.inf
+            sans_amelioration = 0
+            continue
+
+        centre = simplexe[:-1].mean(axis=0)
+        pire = simplexe[-1]
+        candidats = [centre + coefficient * (pire - centre)
+                     for coefficient in (-1.0, -2.0, -0.5, 0.5)]
+        f_r, f_e, f_ce, f_ci = evaluer(candidats)
+        reflexion, expansion, contraction_ext, contraction_int = candidats
+
+        if f_r < valeurs[0]:
+            simplexe[-1], valeurs[-1] = (expansion, f_e) if f_e < f_r else (reflexion, f_r)
+        elif f_r < valeurs[-2]:
+            simplexe[-1], valeurs[-1] = reflexion, f_r
+        elif f_r < valeurs[-1] and f_ce <= f_r:
+            simplexe[-1], valeurs[-1] = contraction_ext, f_ce
+        elif f_r >= valeurs[-1] and f_ci < valeurs[-1]:
+            simplexe[-1], valeurs[-1] = contraction_int, f_ci
+        else:
+            # Rétrécissement vers le meilleur sommet
+            simplexe[1:] = simplexe[0] + 0.5 * (simplexe[1:] - simplexe[0])
+            valeurs[1:] = evaluer(simplexe[1:])
+
+    meilleur = simplexe[int(np.argmin(valeurs))]
+    configuration = contraintes.configuration(meilleur)
+    return {
+        'configuration': configuration,
+        'meilleur': {
+            'T_A': configuration.duree_vert_a,
+            'T_B': configuration.duree_vert_b,
+            'T_pietons': configuration.duree_pietons,
+            'T_cycle': configuration.duree_cycle
+        },
+        'objectif': evaluateur.resume(meilleur),
+        'iterations': iteration,
+        'raison_arret': raison_arret,
+        'nb_replications': evaluateur.nb_replications,
+        'nb_simulations': evaluateur.nb_simulations,
+        'nb_lectures_cache': evaluateur.nb_lectures_cache,
+        'nb_points_evalues': evaluateur.nb_points_evalues,
+        'duree_calcul': time.perf_counter() - debut
+    }
+
+
+def afficher_iteration(iteration: int, point: Point, valeur: float):
+    """Rappel par défaut de la ligne de commande"""
+    T_A, T_B, T_pietons = point
+    print(f"   itération {iteration:3d} : T_A={T_A:4.0f}s  T_B={T_B:4.0f}s  "
+          f"T_pietons={T_pietons:4.0f}s  →  W_q pondéré = {valeur:.2f}s", flush=True)
+
+
+def main(arguments: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Optimisation des durées de feux (Nelder–Mead parallèle)")
+    parser.add_argument('--lambda-a', type=float, default=0.3)
+    parser.add_argument('--lambda-b', type=float, default=0.3)
+    parser.add_argument('--duree', type=float, default=600.0,
+                        help="Horizon de chaque réplication (secondes)")
+    parser.add_argument('--replications', type=int, default=5)
+    parser.add_argument('--replications-max', type=int, default=20)
+    parser.add_argument('--cycle-max', type=float, default=120.0)
+    parser.add_argument('--vert-min', type=float, default=10.0)
+    parser.add_argument('--pietons-min', type=float, default=10.0)
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--graine', type=int, default=None)
+    parser.add_argument('--moteur', choices=MOTEURS, default='simpy')
+    parser.add_argument('--processus', type=int, default=None)
+    parser.add_argument('--cache', default=None,
+                        help="Dossier du cache des résultats (aucun cache si absent)")
+    args = parser.parse_args(arguments)
+
+    contraintes = ContraintesFeux(duree_vert_min=args.vert_min,
+                                  duree_pietons_min=args.pietons_min,
+                                  duree_cycle_max=args.cycle_max)
+    evaluateur = EvaluateurConfigurations(
+        args.lambda_a, args.lambda_b, contraintes, duree_simulation=args.duree,
+        nb_replications=args.replications, graine=args.graine, moteur=args.moteur,
+        nb_processus=args.processus,
+        cache=CacheResultats(args.cache) if args.cache else None)
+
+    print(f"🔎 Optimisation pour λ_A={args.lambda_a}, λ_B={args.lambda_b} "
+          f"(graine {evaluateur.graine})")
+    resultats = optimiser_nelder_mead(evaluateur, nb_iterations_max=args.iterations,
+                                      nb_replications_max=args.replications_max,
+                                      rappel_iteration=afficher_iteration)
+
+    meilleur, objectif = resultats['meilleur'], resultats['objectif']
+    ic = objectif['ic_95']  # None avec une seule réplication
+    ic_texte = f"IC 95% [{ic[0]:.2f} ; {ic[1]:.2f}]  " if ic is not None else ""
+    print(f"\n✅ Arrêt ({resultats['raison_arret']}) après {resultats['iterations']} itérations")
+    print(f"   T_A={meilleur['T_A']:.0f}s  T_B={meilleur['T_B']:.0f}s  "
+          f"T_pietons={meilleur['T_pietons']:.0f}s  (cycle {meilleur['T_cycle']:.0f}s)")
+    print(f"   W_q pondéré = {objectif['moyenne']:.2f}s  {ic_texte}"
+          f"({resultats['nb_replications']} réplications)")
+    print(f"   {resultats['nb_simulations']} simulations, "
+          f"{resultats['nb_lectures_cache']} relues du cache, "
+          f"{resultats['nb_points_evalues']} configurations, "
+          f"{resultats['duree_calcul']:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
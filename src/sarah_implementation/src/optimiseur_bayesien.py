@@ -0,0 +1,382 @@
+"""
+OPTIMISEUR_BAYESIEN.PY - Optimisation bayésienne des durées de feux
+Responsable : Sarah
+Projet : Simulation de Feux de Circulation
+
+Chaque point coûte N réplications : on remplace une partie des simulations
+par un modèle de substitution.
+
+- Substitut : processus gaussien (noyau de Matérn 5/2 à longueurs propres
+  par dimension, bruit appris) sur (T_A, T_B, T_pietons, λ_A, λ_B) →
+  log(W_q pondéré). Les hyperparamètres maximisent la vraisemblance
+  marginale (scipy.optimize, quelques redémarrages).
+- Acquisition : amélioration espérée (EI) à la demande visée, maximisée
+  sur des candidats de Sobol admissibles.
+- Lots : q candidats par itération, choisis par « kriging believer » (le
+  point retenu est ajouté avec sa valeur prédite avant de choisir le
+  suivant) ; leurs q × N réplications partent ensemble dans le pool.
+- Démarrage à chaud : toutes les entrées du cache de résultats de même
+  horizon (executer_simulation et optimiseur.py), pour tous les λ, servent
+  d'observations initiales.
+
+Les évaluations passent par optimiseur.EvaluateurConfigurations (nombres
+aléatoires communs, mémorisation, cache disque).
+
+Usage :
+    python optimiseur_bayesien.py --lambda-a 0.3 --lambda-b 0.2 --graine 2024 --cache ../results/cache
+"""
+
+import argparse
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import linalg, optimize
+from scipy.stats import norm, qmc
+
+from cache_resultats import CacheResultats
+from main import MOTEURS
+from intersection import DEBIT_SATURATION
+from optimiseur import ContraintesFeux, EvaluateurConfigurations, afficher_iteration
+
+
+class ProcessusGaussien:
+    """
+    Régression par processus gaussien, noyau de Matérn 5/2 ARD
+
+    Les entrées doivent être normalisées (ordre de grandeur 1) ; les
+    sorties sont centrées-réduites en interne.
+    """
+
+    def __init__(self, nb_redemarrages: int = 3, graine: Optional[int] = None):
+        self.nb_redemarrages = nb_redemarrages
+        self._generateur = np.random.default_rng(graine)
+        self.log_parametres: Optional[np.ndarray] = None  # log(ℓ_1..ℓ_d, s², σ²)
+
+    @staticmethod
+    def _noyau(X1: np.ndarray, X2: np.ndarray, longueurs: np.ndarray,
+               variance: float) -> np.ndarray:
+        ecarts = (X1[:, None, :] - X2[None, :, :]) / longueurs
+        r = np.sqrt(5.0 * np.sum(ecarts ** 2, axis=-1))
+        return variance * (1.0 + r + r ** 2 / 3.0) * np.exp(-r)
+
+    def _decomposer(self, log_parametres: np.ndarray):
+        d = self.X.shape[1]
+        longueurs = np.exp(log_parametres[:d])
+        variance, bruit = np.exp(log_parametres[d:])
+        K = self._noyau(self.X, self.X, longueurs, variance)
+        K[np.diag_indices_from(K)] += bruit + 1e-10
+        return linalg.cho_factor(K, lower=True)
+
+    def _log_vraisemblance_negative(self, log_parametres: np.ndarray) -> float:
+        try:
+            facteur = self._decomposer(log_parametres)
+        except linalg.LinAlgError:
+            return 1e25
+        alpha = linalg.cho_solve(facteur, self._y)
+        return (0.5 * self._y @ alpha + np.sum(np.log(np.diag(facteur[0]))) +
+                0.5 * len(self._y) * np.log(2 * np.pi))
+
+    def ajuster(self, X: np.ndarray, y: np.ndarray) -> 'ProcessusGaussien':
+        """Ajuste les hyperparamètres puis conditionne sur (X, y)"""
+        self.X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self._centre = y.mean()
+        self._echelle = y.std() if y.std() > 0 else 1.0
+        self._y = (y - self._centre) / self._echelle
+
+        d = self.X.shape[1]
+        # Longueurs ≤ 2 et bruit ≥ 1 % : l'objectif simulé (arrondi au pas,
+        # bruit résiduel des réplications) n'est pas aussi lisse que le
+        # maximum de vraisemblance le croit, et l'EI s'effondrerait trop tôt
+        bornes = [(np.log(0.05), np.log(2.0))] * d + [(np.log(0.05), np.log(20.0)),
+                                                    (np.log(1e-2), np.log(1.0))]
+        departs = [np.r_[np.zeros(d), 0.0, np.log(1e-2)]]
+        departs += [self._generateur.uniform(*np.array(bornes).T)
+                    for _ in range(self.nb_redemarrages - 1)]
+        meilleur = min((optimize.minimize(self._log_vraisemblance_negative, depart,
+                                          method='L-BFGS-B', bounds=bornes)
+                        for depart in departs), key=lambda resultat: resultat.fun)
+        self.log_parametres = meilleur.x
+        self._conditionner()
+        return self
+
+    def _conditionner(self):
+        self._facteur = self._decomposer(self.log_parametres)
+        self._alpha = linalg.cho_solve(self._facteur, self._y)
+
+    def ajouter_fictif(self, x: np.ndarray, y: float):
+        """Ajoute une observation sans réajuster les hyperparamètres (kriging believer)"""
+        self.X = np.vstack([self.X, x])
+        self._y = np.r_[self._y, (y - self._centre) / self._echelle]
+        self._conditionner()
+
+    def predire(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Moyenne et écart-type a posteriori (sans le bruit d'observation)"""
+        d = self.X.shape[1]
+        longueurs = np.exp(self.log_parametres[:d])
+        variance = np.exp(self.log_parametres[d])
+        K_croise = self._noyau(np.asarray(X, dtype=float), self.X, longueurs, variance)
+        moyenne = K_croise @ self._alpha
+        v = linalg.solve_triangular(self._facteur[0], K_croise.T, lower=True)
+        variance_post = np.maximum(variance - np.sum(v ** 2, axis=0), 1e-12)
+        return (self._centre + self._echelle * moyenne,
+                self._echelle * np.sqrt(variance_post))
+
+
+def amelioration_esperee(moyenne: np.ndarray, ecart_type: np.ndarray,
+                         meilleure: float) -> np.ndarray:
+    """EI pour une minimisation"""
+    z = (meilleure - moyenne) / ecart_type
+    return (meilleure - moyenne) * norm.cdf(z) + ecart_type * norm.pdf(z)
+
+
+def observations_en_cache(cache: CacheResultats, duree_simulation: float,
+                          duree_jaune: float = 3.0,
+                          moteur: str = 'simpy') -> Dict[tuple, Tuple[float, float]]:
+    """
+    W_q par voie des entrées du cache comparables à l'évaluateur
+
+    Seules les entrées de même horizon, même T_jaune, même moteur et au
+    débit de saturation par défaut sont retenues. Les arrêts séquentiels
+    sont écartés : leur horizon réel est celui où la précision a été
+    atteinte, pas celui demandé.
+
+    Returns:
+        (T_A, T_B, T_pietons, λ_A, λ_B) → (W_A, W_B) moyens des entrées trouvées
+    """
+    sommes: Dict[tuple, List[Tuple[float, float]]] = {}
+    for donnees in cache.parcourir():
+        if 'replication' in donnees:          # main.executer_replication
+            p = donnees['replication']
+            stats = donnees['statistiques']
+            T_jaune = p['T_jaune']
+            debits = p.get('debit_saturation', [DEBIT_SATURATION] * 2)
+            cle = (p['T_A'], p['T_B'], p['T_pietons'], p['lambda_a'], p['lambda_b'])
+        elif 'parametres' in donnees and 'empirique' in donnees:   # executer_simulation
+            if 'arret_sequentiel' in donnees:
+                continue
+            p = donnees['parametres']
+            stats = donnees['empirique']
+            feux = p['config_feux']
+            T_jaune = feux['T_jaune']
+            debits = list(p.get('debit_saturation', {}).values()) or [DEBIT_SATURATION] * 2
+            cle = (feux['T_A'], feux['T_B'], feux['T_pietons'], p['lambda_a'], p['lambda_b'])
+        else:
+            continue
+        if (p['duree_simulation'] != duree_simulation or T_jaune != duree_jaune
+                or p.get('moteur') != moteur or any(d != DEBIT_SATURATION for d in debits)):
+            continue
+        try:
+            attentes = (float(stats['voie_a']['temps_attente_moyen']),
+                        float(stats['voie_b']['temps_attente_moyen']))
+        except (KeyError, TypeError):
+            continue
+        sommes.setdefault(tuple(float(v) for v in cle), []).append(attentes)
+    return {cle: tuple(np.mean(valeurs, axis=0)) for cle, valeurs in sommes.items()}
+
+
+def optimiser_bayesien(
+    evaluateur: EvaluateurConfigurations,
+    nb_iterations_max: int = 15,
+    taille_lot: int = 4,
+    nb_points_initiaux: int = 8,
+    seuil_ei: float = 1e-3,
+    cache: Optional[CacheResultats] = None,
+    nb_observations_chaudes_max: int = 300,
+    nb_candidats: int = 1024,
+    rappel_iteration=None
+) -> dict:
+    """
+    Minimise l'objectif de l'évaluateur par optimisation bayésienne en lots
+
+    Args:
+        evaluateur: Évaluateur (λ visés, contraintes, réplications, pool)
+        nb_iterations_max: Nombre maximal de lots après le plan initial
+        taille_lot: Candidats simulés ensemble à chaque itération
+        nb_points_initiaux: Taille du plan initial (hypercube latin + plan
+                            de Webster + meilleur point en cache), réduite
+                            d'autant de points déjà connus à la demande visée
+        seuil_ei: Arrêt quand la meilleure EI (en log W_q, soit ≈ une
+                  amélioration relative) passe sous ce seuil
+        cache: Cache lu pour le démarrage à chaud (celui de l'évaluateur si None)
+        nb_observations_chaudes_max: Observations du cache conservées (les
+                                     plus proches des λ visés)
+        nb_candidats: Candidats de Sobol sur lesquels l'EI est maximisée
+        rappel_iteration: Fonction (iteration, meilleur_point, meilleure_valeur), ou None
+
+    Returns:
+        Dictionnaire au format de optimiseur.optimiser_nelder_mead, plus
+        nb_observations_chaudes et ei_finale
+    """
+    contraintes = evaluateur.contraintes
+    debut = time.perf_counter()
+    cible = np.array([evaluateur.lambda_a, evaluateur.lambda_b])
+    generateur = np.random.default_rng(evaluateur.graine)
+
+    # Démarrage à chaud : objectif de l'évaluateur recalculé pour chaque
+    # entrée (poids par défaut = λ de l'entrée, comme l'évaluateur à sa demande)
+    if cache is None:
+        cache = evaluateur.cache
+    poids_lambda = evaluateur.poids == (evaluateur.lambda_a, evaluateur.lambda_b)
+    chaudes: Dict[tuple, float] = {}
+    if cache is not None:
+        attentes = observations_en_cache(cache, evaluateur.duree_simulation,
+                                         evaluateur.contraintes.duree_jaune, evaluateur.moteur)
+        proches = sorted(attentes, key=lambda cle: np.linalg.norm(np.array(cle[3:]) - cible))
+        for cle in proches[:nb_observations_chaudes_max]:
+            poids = cle[3:] if poids_lambda else evaluateur.poids
+            if sum(poids) > 0:
+                valeur = float(np.dot(poids, attentes[cle]) / sum(poids))
+                if valeur > 0:
+                    chaudes[cle] = valeur
+
+    # Normalisation des entrées : durées sur leur domaine, λ sur [0, λ max]
+    echelle_lambda = max([*cible, *(cle[3 + i] for cle in chaudes for i in range(2))])
+
+    def normaliser(points: np.ndarray, lambdas: np.ndarray) -> np.ndarray:
+        durees = (points - contraintes.minimums) / (contraintes.maximums - contraintes.minimums)
+        return np.hstack([durees, lambdas / echelle_lambda])
+
+    # Observations à la demande visée : évaluées par l'évaluateur
+    evalues: Dict[tuple, float] = {}
+
+    def evaluer(points: List[tuple]):
+        for point, valeur in zip(points, evaluateur.evaluer(points)):
+            evalues[point] = valeur
+
+    connus = [cle for cle in chaudes if np.allclose(cle[3:], cible)]
+    deja_connus = len(connus)
+    initiaux = [contraintes.arrondir(evaluateur.depart_webster())]
+    if connus:
+        # Meilleur point déjà connu : relu du cache s'il a la même graine
+        initiaux.append(contraintes.arrondir(min(connus, key=chaudes.get)[:3]))
+    nb_hypercube = max(0, nb_points_initiaux - deja_connus - 1)
+    if nb_hypercube:
+        hypercube = qmc.LatinHypercube(d=3, seed=generateur).random(nb_hypercube)
+        initiaux += [contraintes.arrondir(qmc.scale(u[None, :], contraintes.minimums,
+                                                    contraintes.maximums)[0])
+                     for u in hypercube]
+    evaluer(list(dict.fromkeys(initiaux)))
+
+    sobol = qmc.Sobol(d=3, seed=generateur)
+    iteration = 0
+    ei_finale = None
+    raison_arret = 'iterations_max'
+    while iteration < nb_iterations_max:
+        iteration += 1
+        meilleur_point = min(evalues, key=evalues.get)
+        if rappel_iteration is not None:
+            rappel_iteration(iteration, meilleur_point, evalues[meilleur_point])
+
+        # Les observations chaudes à la demande visée sont remplacées par les évaluations
+        observations = {cle: valeur for cle, valeur in chaudes.items()
+                        if not (cle[:3] in evalues and np.allclose(cle[3:], cible))}
+        observations.update({(*point, *cible): valeur for point, valeur in evalues.items()})
+        cles = np.array(list(observations))
+        X = normaliser(cles[:, :3], cles[:, 3:])
+        y = np.log(np.maximum(list(observations.values()), 1e-6))
+        modele = ProcessusGaussien(graine=int(generateur.integers(2 ** 31))).ajuster(X, y)
+
+        # Candidats admissibles, arrondis, pas encore évalués
+        bruts = qmc.scale(sobol.random(nb_candidats), contraintes.minimums, contraintes.maximums)
+        candidats = [point for point in dict.fromkeys(contraintes.arrondir(x) for x in bruts)
+                     if point not in evalues]
+        if not candidats:
+            raison_arret = 'domaine_epuise'
+            break
+        X_candidats = normaliser(np.array(candidats), np.tile(cible, (len(candidats), 1)))
+        meilleure = float(np.min(modele.predire(normaliser(
+            np.array(list(evalues)), np.tile(cible, (len(evalues), 1))))[0]))
+
+        lot = []
+        for _ in range(min(taille_lot, len(candidats))):
+            moyenne, ecart_type = modele.predire(X_candidats)
+            ei = amelioration_esperee(moyenne, ecart_type, meilleure)
+            ei[[candidats.index(point) for point in lot]] = -np.inf
+            k = int(np.argmax(ei))
+            if not lot:
+                ei_finale = float(ei[k])
+                if ei_finale < seuil_ei:
+                    break
+            lot.append(candidats[k])
+            modele.ajouter_fictif(X_candidats[k], moyenne[k])
+        if not lot:
+            raison_arret = 'ei_faible'
+            break
+        evaluer(lot)
+
+    meilleur_point = min(evalues, key=evalues.get)
+    configuration = contraintes.configuration(meilleur_point)
+    return {
+        'configuration': configuration,
+        'meilleur': {
+            'T_A': configuration.duree_vert_a,
+            'T_B': configuration.duree_vert_b,
+            'T_pietons': configuration.duree_pietons,
+            'T_cycle': configuration.duree_cycle
+        },
+        'objectif': evaluateur.resume(meilleur_point),
+        'iterations': iteration,
+        'raison_arret': raison_arret,
+        'ei_finale': ei_finale,
+        'nb_replications': evaluateur.nb_replications,
+        'nb_simulations': evaluateur.nb_simulations,
+        'nb_lectures_cache': evaluateur.nb_lectures_cache,
+        'nb_points_evalues': evaluateur.nb_points_evalues,
+        'nb_observations_chaudes': len(chaudes),
+        'duree_calcul': time.perf_counter() - debut
+    }
+
+
+def main(arguments: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Optimisation bayésienne des durées de feux (processus gaussien, EI en lots)")
+    parser.add_argument('--lambda-a', type=float, default=0.3)
+    parser.add_argument('--lambda-b', type=float, default=0.3)
+    parser.add_argument('--duree', type=float, default=600.0,
+                        help="Horizon de chaque réplication (secondes)")
+    parser.add_argument('--replications', type=int, default=5)
+    parser.add_argument('--lot', type=int, default=4, help="Candidats par itération")
+    parser.add_argument('--iterations', type=int, default=15)
+    parser.add_argument('--cycle-max', type=float, default=120.0)
+    parser.add_argument('--vert-min', type=float, default=10.0)
+    parser.add_argument('--pietons-min', type=float, default=10.0)
+    parser.add_argument('--graine', type=int, default=None)
+    parser.add_argument('--moteur', choices=MOTEURS, default='simpy')
+    parser.add_argument('--processus', type=int, default=None)
+    parser.add_argument('--cache', default=None,
+                        help="Dossier du cache des résultats (démarrage à chaud)")
+    args = parser.parse_args(arguments)
+
+    contraintes = ContraintesFeux(duree_vert_min=args.vert_min,
+                                  duree_pietons_min=args.pietons_min,
+                                  duree_cycle_max=args.cycle_max)
+    cache = CacheResultats(args.cache) if args.cache else None
+    evaluateur = EvaluateurConfigurations(
+        args.lambda_a, args.lambda_b, contraintes, duree_simulation=args.duree,
+        nb_replications=args.replications, graine=args.graine, moteur=args.moteur,
+        nb_processus=args.processus, cache=cache)
+
+    print(f"🔎 Optimisation bayésienne pour λ_A={args.lambda_a}, λ_B={args.lambda_b} "
+          f"(graine {evaluateur.graine})")
+    resultats = optimiser_bayesien(evaluateur, nb_iterations_max=args.iterations,
+                                   taille_lot=args.lot, cache=cache,
+                                   rappel_iteration=afficher_iteration)
+
+    meilleur, objectif = resultats['meilleur'], resultats['objectif']
+    print(f"\n✅ Arrêt ({resultats['raison_arret']}) après {resultats['iterations']} itérations "
+          f"({resultats['nb_observations_chaudes']} observations reprises du cache)")
+    print(f"   T_A={meilleur['T_A']:.0f}s  T_B={meilleur['T_B']:.0f}s  "
+          f"T_pietons={meilleur['T_pietons']:.0f}s  (cycle {meilleur['T_cycle']:.0f}s)")
+    print(f"   W_q pondéré = {objectif['moyenne']:.2f}s  ({resultats['nb_replications']} réplications)")
+    print(f"   {resultats['nb_simulations']} simulations, "
+          f"{resultats['nb_lectures_cache']} relues du cache, "
+          f"{resultats['nb_points_evalues']} configurations, "
+          f"{resultats['duree_calcul']:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+PARALLELE.PY - Exécution de simulations indépendantes sur plusieurs cœurs
+Responsable : Sarah
+Projet : Simulation de Feux de Circulation
+
+Chaque environnement SimPy est indépendant : on répartit les appels sur un
+ProcessPoolExecutor. Le nombre de tâches en vol est borné pour que la
+mémoire ne dépende pas du nombre total de tâches (réplications, balayages).
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+
+def nombre_processus_defaut() -> int:
+    """Nombre de cœurs disponibles pour ce processus"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def executer_en_parallele(
+    fonction: Callable[[Any], Any],
+    taches: Iterable[Any],
+    nb_processus: Optional[int] = None,
+    taches_en_vol: Optional[int] = None
+) -> Iterator[Tuple[int, Any]]:
+    """
+    Applique une fonction à chaque tâche, en parallèle
+
+    Les résultats sont produits dans l'ordre de terminaison, accompagnés de
+    l'indice de la tâche pour que l'appelant puisse rétablir l'ordre.
+
+    Args:
+        fonction: Fonction de niveau module (sérialisable par pickle)
+        taches: Arguments successifs de la fonction (itérable paresseux accepté)
+        nb_processus: Nombre de processus (tous les cœurs si None, 1 = séquentiel)
+        taches_en_vol: Nombre maximal de tâches soumises non terminées
+                       (2 × nb_processus par défaut)
+
+    Yields:
+        (indice, resultat) pour chaque tâche
+    """
+    if nb_processus is None:
+        nb_processus = nombre_processus_defaut()
+
+    # Séquentiel : pas de pool (utile pour les tests et les appels imbriqués)
+    if nb_processus <= 1:
+        for indice, tache in enumerate(taches):
+            yield indice, fonction(tache)
+        return
+
+    if taches_en_vol is None:
+        taches_en_vol = 2 * nb_processus
+
+    iterateur = enumerate(taches)
+    with ProcessPoolExecutor(max_workers=nb_processus) as executeur:
+        en_cours = {}
+
+        def soumettre():
+            for indice, tache in iterateur:
+                en_cours[executeur.submit(fonction, tache)] = indice
+                if len(en_cours) >= taches_en_vol:
+                    return
+
+        soumettre()
+        while en_cours:
+            terminees, _ = wait(en_cours, return_when=FIRST_COMPLETED)
+            for future in terminees:
+                yield en_cours.pop(future), future.result()
+            soumettre()
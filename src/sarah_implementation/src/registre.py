@@ -0,0 +1,150 @@
+"""
+REGISTRE.PY - Registre en colonnes des véhicules (structure de tableaux)
+Responsable : Sarah
+Projet : Simulation de Feux de Circulation
+
+Une ligne par véhicule, une colonne NumPy par horodatage :
+- arrivee, debut_service, depart : float64 (NaN tant que non atteint)
+- voie : int8 (0 = Voie A, 1 = Voie B)
+
+La simulation écrit directement dans les colonnes ; l'analyse lit des vues
+sans copie pour des statistiques vectorisées et l'export.
+"""
+
+import numpy as np
+
+
+# Codes de voie de la colonne int8
+VOIE_A = 0
+VOIE_B = 1
+
+
+class RegistreVehicules:
+    """
+    Registre extensible des horodatages de chaque véhicule
+
+    Les colonnes doublent de taille quand elles sont pleines (coût amorti
+    O(1) par véhicule). ⚠️ Une vue obtenue avant un agrandissement ne voit
+    pas les lignes ajoutées ensuite : relire la propriété.
+    """
+
+    def __init__(self, capacite_initiale: int = 4096):
+        """
+        Args:
+            capacite_initiale: Nombre de lignes réservées au départ
+        """
+        self._arrivee = np.full(capacite_initiale, np.nan)
+        self._debut_service = np.full(capacite_initiale, np.nan)
+        self._depart = np.full(capacite_initiale, np.nan)
+        self._voie = np.zeros(capacite_initiale, dtype=np.int8)
+        self.taille = 0
+
+    def _agrandir(self):
+        """Double la capacité des colonnes"""
+        capacite = len(self._arrivee)
+        nan = np.full(capacite, np.nan)
+        self._arrivee = np.concatenate([self._arrivee, nan])
+        self._debut_service = np.concatenate([self._debut_service, nan])
+        self._depart = np.concatenate([self._depart, nan])
+        self._voie = np.concatenate([self._voie, np.zeros(capacite, dtype=np.int8)])
+
+    def ajouter_arrivee(self, voie: int, temps: float) -> int:
+        """
+        Ajoute un véhicule
+
+        Args:
+            voie: Code de voie (VOIE_A ou VOIE_B)
+            temps: Instant d'arrivée
+
+        Returns:
+            Indice de la ligne du véhicule
+        """
+        if self.taille == len(self._arrivee):
+            self._agrandir()
+        indice = self.taille
+        self._arrivee[indice] = temps
+        self._voie[indice] = voie
+        self.taille += 1
+        return indice
+
+    def enregistrer_debut_service(self, indice: int, temps: float):
+        """Note le début de traversée (fin de l'attente)"""
+        self._debut_service[indice] = temps
+
+    def enregistrer_depart(self, indice: int, temps: float):
+        """Note le départ du système"""
+        self._depart[indice] = temps
+
+    # ─── Vues sans copie ────────────────────────────────────────────────
+
+    @property
+    def arrivee(self) -> np.ndarray:
+        return self._arrivee[:self.taille]
+
+    @property
+    def debut_service(self) -> np.ndarray:
+        return self._debut_service[:self.taille]
+
+    @property
+    def depart(self) -> np.ndarray:
+        return self._depart[:self.taille]
+
+    @property
+    def voie(self) -> np.ndarray:
+        return self._voie[:self.taille]
+
+    def temps_attente(self) -> np.ndarray:
+        """Attente de chaque véhicule (NaN s'il n'a pas encore traversé)"""
+        return self.debut_service - self.arrivee
+
+    def statistiques_par_voie(self) -> dict:
+        """
+        Statistiques vectorisées au format de GenerateurVehicules.obtenir_statistiques
+
+        Un véhicule compte comme servi une fois parti du système.
+        """
+        attentes = self.temps_attente()
+        partis = ~np.isnan(self.depart)
+
+        def calculer_stats(code_voie: int) -> dict:
+            de_la_voie = self.voie == code_voie
+            nombre_total = int(de_la_voie.sum())
+            if nombre_total == 0:
+                return {
+                    'nombre_total': 0,
+                    'temps_attente_moyen': 0,
+                    'temps_attente_max': 0
+                }
+            servis = attentes[de_la_voie & partis]
+            vide = len(servis) == 0
+            return {
+                'nombre_total': nombre_total,
+                'nombre_servis': len(servis),
+                'temps_attente_moyen': 0 if vide else float(servis.mean()),
+                'temps_attente_max': 0 if vide else float(servis.max()),
+                'temps_attente_std': 0 if vide else float(servis.std())
+            }
+
+        return {
+            'voie_a': calculer_stats(VOIE_A),
+            'voie_b': calculer_stats(VOIE_B)
+        }
+
+    def exporter(self, chemin: str):
+        """Sauvegarde les colonnes dans une archive NumPy compressée (.npz)"""
+        np.savez_compressed(chemin, arrivee=self.arrivee,
+                            debut_service=self.debut_service,
+                            depart=self.depart, voie=self.voie)
+
+    @classmethod
+    def charger(cls, chemin: str) -> 'RegistreVehicules':
+        """Recharge un registre exporté"""
+        with np.load(chemin) as archive:
+            registre = cls(capacite_initiale=max(len(archive['arrivee']), 1))
+            n = len(archive['arrivee'])
+            registre._arrivee[:n] = archive['arrivee']
+            registre._debut_service[:n] = archive['debut_service']
+            registre._depart[:n] = archive['depart']
+            registre._voie[:n] = archive['voie']
+            registre.taille = n
+        return registre
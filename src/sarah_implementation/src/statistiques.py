@@ -8,8 +8,11 @@ Projet : Simulation de Feux de Circulation
 """
 
 import json
+import math
 import numpy as np
-from typing import Dict
+from typing import Dict, Optional
+
+from statistiques_en_ligne import AccumulateurWelford  # noqa: F401 (réexport)
 
 
 class StatistiquesTheorique:
@@ -22,6 +25,9 @@ class StatistiquesTheorique:
     - W = 1/(μ-λ) (temps moyen dans système)
     - L_q = ρ²/(1-ρ) (longueur file d'attente)
     - W_q = ρ/(μ-λ) (temps moyen d'attente)
+    
+    ⚠️ μ = proportion de vert ignore la structure du cycle ; voir
+       retard_webster / retard_hcm pour des feux à cycle fixe
     """
     
     def __init__(self, lambda_: float, mu: float):
@@ -82,6 +88,233 @@ class StatistiquesTheorique:
         }
 
 
+class StatistiquesTheoriqueVectorisees:
+    """
+    Indicateurs théoriques M/M/1 sur des tableaux de (λ, μ)
+    
+    Mêmes formules que StatistiquesTheorique, calculées en une passe NumPy
+    (λ et μ sont diffusés l'un contre l'autre). La région instable ρ ≥ 1
+    est traitée par masque : L, W, L_q et W_q y valent +inf, sans
+    branchement par élément. Un million de points se calcule en quelques
+    millisecondes.
+    """
+    
+    CHAMPS = ('lambda', 'mu', 'rho', 'est_stable', 'L', 'W', 'L_q', 'W_q')
+    
+    def __init__(self, lambda_, mu):
+        """
+        Args:
+            lambda_: Taux d'arrivée (scalaire ou tableau)
+            mu: Taux de service (scalaire ou tableau, diffusable avec lambda_)
+        """
+        self.lambda_, self.mu = (np.asarray(x, dtype=float)
+                                 for x in np.broadcast_arrays(lambda_, mu))
+        
+        self.rho = np.full(self.lambda_.shape, np.inf)
+        np.divide(self.lambda_, self.mu, out=self.rho, where=self.mu != 0)
+        self.est_stable = self.rho < 1
+        
+        # L_q = ρ·L et W_q = ρ·W (ρ ≥ 1 donne inf·ρ = inf)
+        self.L = self._sur_stables(self.rho, 1.0 - self.rho)
+        self.W = self._sur_stables(1.0, self.mu - self.lambda_)
+        self.L_q = self.rho * self.L
+        self.W_q = self.rho * self.W
+    
+    def _sur_stables(self, numerateur, denominateur) -> np.ndarray:
+        """numerateur / denominateur là où ρ < 1, +inf ailleurs"""
+        resultat = np.full(self.lambda_.shape, np.inf)
+        np.divide(numerateur, denominateur, out=resultat, where=self.est_stable)
+        return resultat
+    
+    @classmethod
+    def pour_feux(cls, lambda_a, lambda_b, T_A, T_B, T_jaune=3.0, T_pietons=15.0
+                  ) -> Dict[str, 'StatistiquesTheoriqueVectorisees']:
+        """
+        Indicateurs des deux voies pour des grilles de (λ, T_A, T_B, ...)
+        
+        μ = 1 véh/s × proportion de vert, comme executer_simulation
+        
+        Returns:
+            {'voie_a': ..., 'voie_b': ...}
+        """
+        T_A, T_B, T_jaune, T_pietons = (np.asarray(x, dtype=float)
+                                        for x in (T_A, T_B, T_jaune, T_pietons))
+        cycle = T_A + T_jaune + T_B + T_jaune + T_pietons
+        return {
+            'voie_a': cls(lambda_a, T_A / cycle),
+            'voie_b': cls(lambda_b, T_B / cycle)
+        }
+    
+    def tableau(self) -> np.ndarray:
+        """Tableau structuré (champs CHAMPS) de même forme que les entrées"""
+        types = [(champ, bool if champ == 'est_stable' else np.float64)
+                 for champ in self.CHAMPS]
+        resultat = np.empty(self.lambda_.shape, dtype=types)
+        for champ, valeurs in zip(self.CHAMPS, (self.lambda_, self.mu, self.rho,
+                                                self.est_stable, self.L, self.W,
+                                                self.L_q, self.W_q)):
+            resultat[champ] = valeurs
+        return resultat
+    
+    def to_dataframe(self):
+        """DataFrame pandas à plat (une ligne par point, colonnes CHAMPS)"""
+        import pandas as pd  # Dépendance de la visualisation, chargée à la demande
+        tableau = self.tableau().ravel()
+        return pd.DataFrame({champ: tableau[champ] for champ in self.CHAMPS})
+
+
+# ─── Modèles de retard des feux à cycle fixe ────────────────────────────────
+
+def _capacite_et_saturation(lambda_, duree_vert, duree_cycle, debit_saturation):
+    """Capacité c = s·g/C (véh/s) et degré de saturation x = λ/c (tableaux)"""
+    lambda_, g, C, s = (np.asarray(v, dtype=float)
+                        for v in np.broadcast_arrays(lambda_, duree_vert, duree_cycle,
+                                                     debit_saturation))
+    capacite = s * g / C
+    saturation = np.full(capacite.shape, np.inf)
+    np.divide(lambda_, capacite, out=saturation, where=capacite > 0)
+    return lambda_, g, C, capacite, saturation
+
+
+def retard_webster(lambda_, duree_vert, duree_cycle, debit_saturation):
+    """
+    Retard moyen par véhicule selon Webster (1958), vectorisé
+    
+    d = C(1-g/C)² / [2(1 - x·g/C)] + x² / [2λ(1-x)] - 0.65 (C/λ²)^(1/3) x^(2+5g/C)
+    
+    Args:
+        lambda_: Débit d'arrivée (véh/s)
+        duree_vert: Vert effectif g (secondes de passage autorisé)
+        duree_cycle: Durée du cycle C (secondes)
+        debit_saturation: Débit de saturation s (véh/s de vert)
+    
+    Returns:
+        Retard (secondes), +inf pour x ≥ 1 (formule d'équilibre)
+    """
+    lambda_, g, C, _, x = _capacite_et_saturation(lambda_, duree_vert, duree_cycle,
+                                                  debit_saturation)
+    valide = x < 1
+    proportion = g / C
+    retard = np.full(x.shape, np.inf)
+    uniforme = C * (1 - proportion) ** 2 / (2 * (1 - np.where(valide, x, 0.0) * proportion))
+    # Termes aléatoire et correctif : nuls sans trafic
+    avec_trafic = valide & (lambda_ > 0)
+    l_sur = np.where(avec_trafic, lambda_, 1.0)
+    x_sur = np.where(avec_trafic, x, 0.0)
+    aleatoire = x_sur ** 2 / (2 * l_sur * (1 - x_sur))
+    correctif = 0.65 * np.cbrt(C / l_sur ** 2) * x_sur ** (2 + 5 * proportion)
+    np.copyto(retard, uniforme + np.where(avec_trafic, aleatoire - correctif, 0.0), where=valide)
+    return retard
+
+
+def retard_hcm(lambda_, duree_vert, duree_cycle, debit_saturation,
+               duree_analyse: float = 900.0, k: float = 0.5, I: float = 1.0):
+    """
+    Retard de contrôle HCM 2000 : uniforme d1 + incrémental d2, vectorisé
+    
+    d1 = 0.5·C(1-g/C)² / [1 - min(1, X)·g/C]
+    d2 = 900·T·[(X-1) + √((X-1)² + 8kIX / (c·T))]   (c en véh/h, T en h)
+    
+    Contrairement à Webster, d2 reste fini en sursaturation (X ≥ 1) : la
+    file résiduelle croît sur la période d'analyse T.
+    
+    Args:
+        lambda_, duree_vert, duree_cycle, debit_saturation: comme retard_webster
+        duree_analyse: Période d'analyse T (secondes, 15 min par défaut)
+        k: Facteur de retard incrémental (0.5 pour des feux à temps fixe)
+        I: Facteur de filtrage amont (1 pour un carrefour isolé)
+    
+    Returns:
+        Retard (secondes), +inf si la capacité est nulle
+    """
+    _, g, C, capacite, x = _capacite_et_saturation(lambda_, duree_vert, duree_cycle,
+                                                   debit_saturation)
+    proportion = g / C
+    d1 = 0.5 * C * (1 - proportion) ** 2 / (1 - np.minimum(1.0, x) * proportion)
+    T = duree_analyse / 3600.0
+    c_horaire = capacite * 3600.0
+    valide = c_horaire > 0
+    c_sur = np.where(valide, c_horaire, 1.0)
+    x_sur = np.where(valide, x, 0.0)
+    d2 = 900 * T * ((x_sur - 1) + np.sqrt((x_sur - 1) ** 2 + 8 * k * I * x_sur / (c_sur * T)))
+    return np.where(valide, d1 + d2, np.inf)
+
+
+def retards_feux(lambda_a, lambda_b, T_A, T_B, T_jaune=3.0, T_pietons=15.0,
+                 debit_saturation_a=10.0, debit_saturation_b=10.0,
+                 duree_analyse: float = 900.0) -> Dict[str, dict]:
+    """
+    Retards analytiques des deux voies pour des (grilles de) configurations
+    
+    Le vert effectif d'une voie est T + T_jaune (passage autorisé au jaune,
+    comme dans la simulation). Tous les arguments sont diffusables.
+    
+    Returns:
+        {'voie_a': {...}, 'voie_b': {...}} avec capacite, degre_saturation,
+        retard_webster et retard_hcm (tableaux)
+    """
+    T_A, T_B, T_jaune, T_pietons = (np.asarray(v, dtype=float)
+                                    for v in (T_A, T_B, T_jaune, T_pietons))
+    cycle = T_A + T_jaune + T_B + T_jaune + T_pietons
+    resultats = {}
+    for voie, lambda_, vert, debit in (
+            ('voie_a', lambda_a, T_A + T_jaune, debit_saturation_a),
+            ('voie_b', lambda_b, T_B + T_jaune, debit_saturation_b)):
+        _, _, _, capacite, saturation = _capacite_et_saturation(lambda_, vert, cycle, debit)
+        resultats[voie] = {
+            'capacite': capacite,
+            'degre_saturation': saturation,
+            'retard_webster': retard_webster(lambda_, vert, cycle, debit),
+            'retard_hcm': retard_hcm(lambda_, vert, cycle, debit, duree_analyse)
+        }
+    return resultats
+
+
+class AgregateurReplications:
+    """
+    Agrège les statistiques de N réplications indépendantes au fil de l'eau
+    
+    Seuls des accumulateurs de Welford sont gardés : la mémoire ne dépend
+    pas du nombre de réplications.
+    """
+    
+    # Indicateurs avec intervalle de confiance : W_q, L et débit
+    INDICATEURS = ('temps_attente_moyen', 'nombre_moyen_systeme', 'debit')
+    
+    def __init__(self):
+        self.nombre_replications = 0
+        self._accumulateurs: Dict[str, Dict[str, AccumulateurWelford]] = {}
+    
+    def ajouter(self, stats_intersection: dict):
+        """
+        Intègre les statistiques d'une réplication
+        
+        Args:
+            stats_intersection: Résultat de Intersection.obtenir_statistiques()
+        """
+        self.nombre_replications += 1
+        for voie, valeurs in stats_intersection.items():
+            accumulateurs = self._accumulateurs.setdefault(voie, {})
+            for cle, valeur in valeurs.items():
+                if isinstance(valeur, (int, float)) and not isinstance(valeur, bool):
+                    accumulateurs.setdefault(cle, AccumulateurWelford()).ajouter(valeur)
+    
+    def moyennes(self) -> dict:
+        """Moyennes des réplications, au même format que les stats d'une simulation"""
+        return {
+            voie: {cle: acc.moyenne for cle, acc in accumulateurs.items()}
+            for voie, accumulateurs in self._accumulateurs.items()
+        }
+    
+    def intervalles(self) -> dict:
+        """Moyenne, écart-type et IC à 95% de W_q, L et du débit par voie"""
+        return {
+            voie: {cle: accumulateurs[cle].to_dict()
+                   for cle in self.INDICATEURS if cle in accumulateurs}
+            for voie, accumulateurs in self._accumulateurs.items()
+        }
+
+
 class CollecteurDonnees:
     """
     Collecte les données brutes de simulation
@@ -101,11 +334,16 @@ class CollecteurDonnees:
                 'changements_feux': []
             }
         }
+        self.registre = None  # RegistreVehicules éventuel (exporté à part en .npz)
+        self.depuis_cache = False  # Données relues du cache par executer_simulation
     
     def definir_parametres(self, lambda_a: float, mu_a: float, 
                           lambda_b: float, mu_b: float,
                           duree_simulation: float,
-                          config_feux: dict):
+                          config_feux: dict,
+                          graine: Optional[int] = None,
+                          debit_saturation_a: Optional[float] = None,
+                          debit_saturation_b: Optional[float] = None):
         """
         Enregistre les paramètres de simulation
         
@@ -114,14 +352,23 @@ class CollecteurDonnees:
             lambda_b, mu_b: Paramètres voie B
             duree_simulation: Durée totale
             config_feux: Configuration des durées de feux
+            graine: Graine des flux aléatoires (pour rejouer la simulation)
+            debit_saturation_a, debit_saturation_b: Débits de saturation des
+                              voies A et B (véh/s de vert). S'ils sont fournis,
+                              les retards de Webster et HCM (période d'analyse
+                              = duree_simulation) s'ajoutent au M/M/1
         """
+        if (debit_saturation_a is None) != (debit_saturation_b is None):
+            raise ValueError("Débits de saturation : fournir ceux des deux voies ou aucun")
+
         self.donnees['parametres'] = {
             'lambda_a': lambda_a,
             'mu_a': mu_a,
             'lambda_b': lambda_b,
             'mu_b': mu_b,
             'duree_simulation': duree_simulation,
-            'config_feux': config_feux
+            'config_feux': config_feux,
+            'graine': graine
         }
         
         # Calculer les résultats théoriques
@@ -132,6 +379,18 @@ class CollecteurDonnees:
             'voie_a': theo_a.to_dict(),
             'voie_b': theo_b.to_dict()
         }
+        
+        if debit_saturation_a is not None:
+            self.donnees['parametres']['debit_saturation'] = {
+                'voie_a': debit_saturation_a, 'voie_b': debit_saturation_b}
+            retards = retards_feux(lambda_a, lambda_b, config_feux['T_A'], config_feux['T_B'],
+                                   config_feux['T_jaune'], config_feux['T_pietons'],
+                                   debit_saturation_a, debit_saturation_b,
+                                   duree_analyse=duree_simulation)
+            for voie, valeurs in retards.items():
+                for cle, valeur in valeurs.items():
+                    valeur = float(valeur)
+                    self.donnees['theorique'][voie][cle] = None if math.isinf(valeur) else valeur
     
     def enregistrer_resultats(self, stats_intersection: dict, 
                              stats_generateur: dict, 
@@ -151,6 +410,66 @@ class CollecteurDonnees:
             'feux': stats_feux
         }
     
+    def enregistrer_arret_sequentiel(self, precision_cible: float,
+                                     duree_simulee: float, intervalles: dict):
+        """
+        Enregistre le bilan d'un arrêt séquentiel
+        
+        Args:
+            precision_cible: Demi-largeur visée pour l'IC de W_q (secondes)
+            duree_simulee: Horizon effectivement simulé
+            intervalles: Par voie, résultat de TroncatureMSER.intervalle_confiance()
+        """
+        voies = {}
+        for voie, ic in intervalles.items():
+            demi_largeur = ic['demi_largeur']
+            voies[voie] = {
+                **ic,
+                'demi_largeur': None if math.isinf(demi_largeur) else demi_largeur,
+                'ic_95': (None if math.isinf(demi_largeur) else
+                          [ic['moyenne'] - demi_largeur, ic['moyenne'] + demi_largeur])
+            }
+        self.donnees['parametres']['duree_simulation'] = duree_simulee
+        self.donnees['arret_sequentiel'] = {
+            'precision_cible': precision_cible,
+            'duree_simulee': duree_simulee,
+            'precision_atteinte': all(
+                ic['demi_largeur'] <= precision_cible for ic in intervalles.values()),
+            **voies
+        }
+    
+    def enregistrer_historique(self, historique_a: dict, historique_b: dict):
+        """
+        Enregistre la trace complète des longueurs de file
+        
+        Args:
+            historique_a, historique_b: {'temps': [...], 'longueur': [...]} par voie
+        """
+        self.donnees['historique']['longueurs_files'] = {
+            'voie_a': historique_a,
+            'voie_b': historique_b
+        }
+    
+    def enregistrer_replications(self, agregateur: AgregateurReplications):
+        """
+        Enregistre les résultats agrégés de plusieurs réplications
+        
+        'empirique' contient alors les moyennes des réplications,
+        'replications' les intervalles de confiance.
+        
+        Args:
+            agregateur: Agrégateur alimenté par toutes les réplications
+        """
+        moyennes = agregateur.moyennes()
+        self.donnees['empirique'] = {
+            'voie_a': moyennes.get('voie_a', {}),
+            'voie_b': moyennes.get('voie_b', {})
+        }
+        self.donnees['replications'] = {
+            'nombre': agregateur.nombre_replications,
+            **agregateur.intervalles()
+        }
+    
     def sauvegarder(self, nom_fichier: str):
         """
         Sauvegarde toutes les données en JSON
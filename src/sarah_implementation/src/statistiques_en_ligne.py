@@ -0,0 +1,362 @@
+"""
+STATISTIQUES_EN_LIGNE.PY - Statistiques en flux, mémoire O(1) par voie
+Responsable : Sarah
+Projet : Simulation de Feux de Circulation
+
+Lisibles à tout instant simulé, sans conserver les observations :
+- moyenne, variance et maximum (algorithme de Welford)
+- quantiles approchés p50/p90/p95/p99 (petit t-digest fusionné par blocs
+  NumPy : l'ajout d'une observation ne coûte qu'un append)
+- troncature de la période de chauffe (MSER-5 sur lots fusionnables)
+- intervalle de confiance par moyennes de lots non chevauchants (une
+  seule longue simulation), avec contrôle de l'autocorrélation des lots
+"""
+
+import math
+import numpy as np
+from scipy import stats as sp_stats
+from typing import Dict, List
+
+
+class AccumulateurWelford:
+    """
+    Moyenne et variance en ligne (algorithme de Welford)
+    
+    Mémoire O(1) : aucune observation n'est conservée
+    """
+    
+    def __init__(self):
+        self.n = 0
+        self.moyenne = 0.0
+        self.maximum = -math.inf
+        self._m2 = 0.0  # Somme des carrés des écarts à la moyenne
+    
+    def ajouter(self, valeur: float):
+        """Intègre une nouvelle observation"""
+        self.n += 1
+        delta = valeur - self.moyenne
+        self.moyenne += delta / self.n
+        self._m2 += delta * (valeur - self.moyenne)
+        if valeur > self.maximum:
+            self.maximum = valeur
+    
+    @property
+    def variance(self) -> float:
+        """Variance empirique (non biaisée, n-1)"""
+        if self.n < 2:
+            return 0.0
+        return self._m2 / (self.n - 1)
+    
+    @property
+    def ecart_type(self) -> float:
+        """Écart-type empirique"""
+        return math.sqrt(self.variance)
+    
+    @property
+    def ecart_type_population(self) -> float:
+        """Écart-type de population (n), comme np.std"""
+        if self.n == 0:
+            return 0.0
+        return math.sqrt(self._m2 / self.n)
+    
+    def demi_largeur_ic(self, niveau: float = 0.95) -> float:
+        """Demi-largeur de l'intervalle de confiance de Student sur la moyenne"""
+        if self.n < 2:
+            return float('inf')
+        quantile = sp_stats.t.ppf(0.5 + niveau / 2, self.n - 1)
+        return quantile * self.ecart_type / math.sqrt(self.n)
+    
+    def to_dict(self, niveau: float = 0.95) -> dict:
+        """Convertit en dictionnaire pour export JSON"""
+        demi_largeur = self.demi_largeur_ic(niveau)
+        if math.isinf(demi_largeur):
+            ic = None
+        else:
+            ic = [self.moyenne - demi_largeur, self.moyenne + demi_largeur]
+        return {
+            'n': self.n,
+            'moyenne': self.moyenne,
+            'ecart_type': self.ecart_type,
+            'ic_95': ic
+        }
+
+
+class DigestQuantiles:
+    """
+    Quantiles approchés en ligne (t-digest à fusion)
+    
+    Les observations s'accumulent dans un tampon ; quand il est plein (ou
+    à la lecture), il est fusionné avec les centroïdes par un tri NumPy.
+    La fonction d'échelle k(q) = δ·(asin(2q-1)/π + ½) garde des centroïdes
+    très fins dans les queues : p99 reste précis. Mémoire bornée par
+    δ + taille_tampon, coût d'un ajout : un append.
+    """
+    
+    def __init__(self, compression: int = 100, taille_tampon: int = 256):
+        """
+        Args:
+            compression: δ, nombre maximal de centroïdes après fusion
+            taille_tampon: Observations accumulées avant fusion
+        """
+        self.compression = compression
+        self.taille_tampon = taille_tampon
+        self.n = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self._moyennes = np.empty(0)
+        self._poids = np.empty(0)
+        self._tampon: List[float] = []
+    
+    def ajouter(self, valeur: float):
+        """Intègre une nouvelle observation"""
+        self._tampon.append(valeur)
+        if len(self._tampon) >= self.taille_tampon:
+            self._fusionner()
+    
+    def _fusionner(self):
+        """Fusionne le tampon avec les centroïdes existants"""
+        if not self._tampon:
+            return
+        nouvelles = np.asarray(self._tampon, dtype=float)
+        self._tampon = []
+        self.n += len(nouvelles)
+        self.minimum = min(self.minimum, float(nouvelles.min()))
+        self.maximum = max(self.maximum, float(nouvelles.max()))
+        
+        valeurs = np.concatenate([self._moyennes, nouvelles])
+        poids = np.concatenate([self._poids, np.ones(len(nouvelles))])
+        ordre = np.argsort(valeurs, kind='stable')
+        valeurs, poids = valeurs[ordre], poids[ordre]
+        
+        # Groupe de chaque point : partie entière de k au milieu de son poids
+        cumul = np.cumsum(poids)
+        q = (cumul - poids / 2) / cumul[-1]
+        k = np.floor(self.compression * (np.arcsin(2 * q - 1) / np.pi + 0.5))
+        debuts = np.flatnonzero(np.r_[True, k[1:] != k[:-1]])
+        self._poids = np.add.reduceat(poids, debuts)
+        self._moyennes = np.add.reduceat(valeurs * poids, debuts) / self._poids
+    
+    def quantile(self, p: float) -> float:
+        """Estimation courante du quantile d'ordre p (0 sans observation)"""
+        self._fusionner()
+        if self.n == 0:
+            return 0.0
+        # Interpolation entre centres de centroïdes, bornée par min et max
+        centres = np.cumsum(self._poids) - self._poids / 2
+        return float(np.interp(p * self.n,
+                               np.r_[0.0, centres, self.n],
+                               np.r_[self.minimum, self._moyennes, self.maximum]))
+
+
+class StatistiquesEnLigne:
+    """
+    Moyenne, écart-type, maximum et quantiles d'une série en flux
+    
+    Utilisée par FileAttente pour les temps d'attente : mémoire constante
+    quel que soit le nombre de véhicules servis.
+    """
+    
+    # Quantiles suivis par défaut
+    QUANTILES = (0.5, 0.9, 0.95, 0.99)
+    
+    def __init__(self, quantiles=QUANTILES, compression: int = 100):
+        """
+        Args:
+            quantiles: Ordres des quantiles rapportés par quantiles()
+            compression: Précision du t-digest (δ)
+        """
+        self.quantiles_suivis = tuple(quantiles)
+        self.accumulateur = AccumulateurWelford()
+        self.digest = DigestQuantiles(compression)
+    
+    def ajouter(self, valeur: float):
+        """Intègre une nouvelle observation"""
+        self.accumulateur.ajouter(valeur)
+        self.digest.ajouter(valeur)
+    
+    @property
+    def n(self) -> int:
+        return self.accumulateur.n
+    
+    @property
+    def moyenne(self) -> float:
+        return self.accumulateur.moyenne
+    
+    @property
+    def ecart_type(self) -> float:
+        return self.accumulateur.ecart_type
+    
+    @property
+    def maximum(self) -> float:
+        """Plus grande observation (0 sans observation)"""
+        return self.accumulateur.maximum if self.accumulateur.n else 0.0
+    
+    def quantile(self, p: float) -> float:
+        """Estimation courante du quantile d'ordre p"""
+        return self.digest.quantile(p)
+    
+    def quantiles(self) -> Dict[str, float]:
+        """Quantiles suivis, nommés 'p50', 'p90', ..."""
+        return {f"p{p * 100:g}": self.digest.quantile(p) for p in self.quantiles_suivis}
+    
+    def to_dict(self) -> dict:
+        """Convertit en dictionnaire pour export JSON"""
+        return {
+            'n': self.n,
+            'moyenne': self.moyenne,
+            'ecart_type': self.ecart_type,
+            'max': self.maximum,
+            **self.quantiles()
+        }
+
+
+class TroncatureMSER:
+    """
+    Détection de la période de chauffe par MSER-5, en flux
+    
+    Les observations sont regroupées en lots de 5 dont seules la somme et
+    la date de fin sont gardées. Quand les lots remplissent les tableaux,
+    les lots voisins sont fusionnés deux à deux (la taille des lots double) :
+    la mémoire reste bornée quel que soit l'horizon.
+    
+    La troncature d* minimise MSER(d) = Σ_{i>d}(Y_i - Ȳ_d)² / (m-d)² sur
+    les moyennes de lots Y_i, pour d ≤ m/2. Les observations antérieures
+    sont écartées de la moyenne stationnaire.
+    """
+    
+    def __init__(self, taille_lot: int = 5, nb_max_lots: int = 256):
+        """
+        Args:
+            taille_lot: Observations par lot au départ (5 pour MSER-5)
+            nb_max_lots: Nombre de lots gardés avant fusion (pair)
+        """
+        if nb_max_lots < 2 or nb_max_lots % 2:
+            raise ValueError(f"nb_max_lots doit être pair et ≥ 2 : {nb_max_lots}")
+        self.taille_lot = taille_lot
+        self.nb_max_lots = nb_max_lots
+        self.nombre_lots = 0
+        self._sommes = np.empty(nb_max_lots)
+        self._fins = np.empty(nb_max_lots)
+        self._somme_courante = 0.0
+        self._effectif_courant = 0
+    
+    def ajouter(self, valeur: float, temps: float):
+        """Intègre une observation datée"""
+        self._somme_courante += valeur
+        self._effectif_courant += 1
+        if self._effectif_courant == self.taille_lot:
+            self._clore_lot(self._somme_courante, temps)
+            self._somme_courante = 0.0
+            self._effectif_courant = 0
+    
+    def ajouter_bloc(self, valeurs: np.ndarray, temps: np.ndarray):
+        """Intègre un bloc d'observations datées (ordre chronologique)"""
+        i, n = 0, len(valeurs)
+        while i < n:
+            if self._effectif_courant or n - i < self.taille_lot:
+                self.ajouter(float(valeurs[i]), float(temps[i]))
+                i += 1
+                continue
+            # Lots complets d'un coup, dans la place restante
+            nombre = min((n - i) // self.taille_lot, self.nb_max_lots - self.nombre_lots)
+            fin = i + nombre * self.taille_lot
+            debut_lots = self.nombre_lots
+            self._sommes[debut_lots:debut_lots + nombre] = (
+                valeurs[i:fin].reshape(nombre, self.taille_lot).sum(axis=1))
+            self._fins[debut_lots:debut_lots + nombre] = temps[i + self.taille_lot - 1:fin:self.taille_lot]
+            self.nombre_lots += nombre
+            i = fin
+            if self.nombre_lots == self.nb_max_lots:
+                self._fusionner()
+    
+    def _clore_lot(self, somme: float, temps: float):
+        self._sommes[self.nombre_lots] = somme
+        self._fins[self.nombre_lots] = temps
+        self.nombre_lots += 1
+        if self.nombre_lots == self.nb_max_lots:
+            self._fusionner()
+    
+    def _fusionner(self):
+        """Fusionne les lots deux à deux (taille des lots × 2)"""
+        moitie = self.nombre_lots // 2
+        self._sommes[:moitie] = self._sommes[0:2 * moitie:2] + self._sommes[1:2 * moitie:2]
+        self._fins[:moitie] = self._fins[1:2 * moitie:2]
+        self.nombre_lots = moitie
+        self.taille_lot *= 2
+    
+    def moyennes_lots(self) -> np.ndarray:
+        """Moyennes des lots complets (vue recalculée, sans le lot en cours)"""
+        return self._sommes[:self.nombre_lots] / self.taille_lot
+    
+    def indice_troncature(self) -> int:
+        """d* : nombre de lots à écarter (0 si trop peu de lots)"""
+        m = self.nombre_lots
+        if m < 4:
+            return 0
+        y = self.moyennes_lots()
+        # Sommes suffixes : S1[d] = Σ_{i≥d} Y_i, S2[d] = Σ_{i≥d} Y_i²
+        s1 = np.cumsum(y[::-1])[::-1]
+        s2 = np.cumsum((y * y)[::-1])[::-1]
+        d = np.arange(m // 2 + 1)
+        restants = m - d
+        ecarts = np.maximum(s2[d] - s1[d] ** 2 / restants, 0.0)
+        return int(np.argmin(ecarts / restants ** 2))
+    
+    def resultat(self) -> dict:
+        """
+        Troncature retenue et moyenne stationnaire
+        
+        Returns:
+            moyenne (après troncature, lot en cours compris), observations
+            écartées et date de la dernière observation écartée
+        """
+        d = self.indice_troncature()
+        effectif = (self.nombre_lots - d) * self.taille_lot + self._effectif_courant
+        somme = float(self._sommes[d:self.nombre_lots].sum()) + self._somme_courante
+        return {
+            'moyenne': somme / effectif if effectif else 0.0,
+            'observations_ecartees': d * self.taille_lot,
+            'temps_troncature': float(self._fins[d - 1]) if d else 0.0
+        }
+    
+    def intervalle_confiance(self, niveau: float = 0.95, nb_lots_max: int = 40,
+                             nb_lots_min: int = 10,
+                             seuil_autocorrelation: float = 0.2) -> dict:
+        """
+        IC de la moyenne stationnaire par moyennes de lots (batch means)
+        
+        Les lots conservés après troncature sont regroupés en b lots
+        non chevauchants (les plus anciens en trop sont écartés). Tant que
+        l'autocorrélation d'ordre 1 des moyennes dépasse le seuil, la taille
+        des lots double (b est divisé par 2). Sous nb_lots_min lots, les lots
+        ne sont pas jugés indépendants et la demi-largeur est infinie.
+        
+        Returns:
+            moyenne, demi_largeur, nb_lots et autocorrelation (lag 1)
+        """
+        d = self.indice_troncature()
+        y = self.moyennes_lots()[d:]
+        b = min(nb_lots_max, len(y))
+        autocorrelation = 0.0
+        while b >= nb_lots_min:
+            taille = len(y) // b
+            lots = y[len(y) - b * taille:].reshape(b, taille).mean(axis=1)
+            ecarts = lots - lots.mean()
+            somme_carres = float(np.dot(ecarts, ecarts))
+            autocorrelation = (float(np.dot(ecarts[:-1], ecarts[1:])) / somme_carres
+                               if somme_carres > 0 else 0.0)
+            if autocorrelation <= seuil_autocorrelation:
+                quantile = sp_stats.t.ppf(0.5 + niveau / 2, b - 1)
+                return {
+                    'moyenne': float(lots.mean()),
+                    'demi_largeur': float(quantile * lots.std(ddof=1) / math.sqrt(b)),
+                    'nb_lots': b,
+                    'autocorrelation': autocorrelation
+                }
+            b //= 2
+        return {
+            'moyenne': self.resultat()['moyenne'],
+            'demi_largeur': math.inf,
+            'nb_lots': b,
+            'autocorrelation': autocorrelation
+        }
@@ -9,11 +9,13 @@ Basé sur la modélisation de Khaoula :
 """
 
 import simpy
-import random
 import numpy as np
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 from enum import Enum
+from journal import Journal, NiveauJournal, journal_par_defaut
+from statistiques_en_ligne import AccumulateurWelford
+from registre import RegistreVehicules, VOIE_A, VOIE_B
 
 
 class Direction(Enum):
@@ -22,23 +24,27 @@ class Direction(Enum):
     VOIE_B = "Voie B (Nord → Sud)"
 
 
-@dataclass
+@dataclass(slots=True)
 class Vehicule:
     """
     Représente un véhicule dans la simulation
     
+    Enregistrement compact (__slots__) : pas de __dict__ par véhicule
+    
     Attributes:
         id: Identifiant unique du véhicule
         direction: Direction du véhicule (VOIE_A ou VOIE_B)
         temps_arrivee: Temps d'arrivée dans le système (secondes)
         temps_depart: Temps de départ du système (secondes)
         temps_attente: Temps passé en attente au feu rouge
+        indice_registre: Ligne du véhicule dans le RegistreVehicules (-1 sans registre)
     """
     id: int
     direction: Direction
     temps_arrivee: float
     temps_depart: float = None
     temps_attente: float = 0.0
+    indice_registre: int = -1
     
     def calculer_temps_total(self) -> float:
         """Calcule le temps total dans le système"""
@@ -47,6 +53,92 @@ class Vehicule:
         return 0.0
 
 
+class ReserveVehicules:
+    """
+    Réserve de véhicules partis, réutilisés pour les nouvelles arrivées
+    
+    Le nombre d'objets créés reste borné par le nombre de véhicules
+    présents simultanément, pas par l'horizon de simulation.
+    """
+    
+    def __init__(self):
+        self._libres: List[Vehicule] = []
+        self.nombre_crees = 0
+        self.nombre_recycles = 0
+    
+    def obtenir(self, id: int, direction: Direction, temps_arrivee: float) -> Vehicule:
+        """Retourne un véhicule réinitialisé (recyclé si possible)"""
+        if self._libres:
+            vehicule = self._libres.pop()
+            vehicule.id = id
+            vehicule.direction = direction
+            vehicule.temps_arrivee = temps_arrivee
+            vehicule.temps_depart = None
+            vehicule.temps_attente = 0.0
+            vehicule.indice_registre = -1
+            self.nombre_recycles += 1
+            return vehicule
+        self.nombre_crees += 1
+        return Vehicule(id, direction, temps_arrivee)
+    
+    def liberer(self, vehicule: Vehicule):
+        """Rend un véhicule parti à la réserve"""
+        self._libres.append(vehicule)
+
+
+class EchantillonneurExponentiel:
+    """
+    Tire des temps inter-arrivée Exp(λ) par blocs NumPy
+    
+    Chaque voie possède son propre numpy.random.Generator : les flux sont
+    indépendants et reproductibles. Le bloc est rechargé seulement quand
+    il est épuisé, ce qui amortit le coût d'appel à NumPy.
+    """
+    
+    def __init__(self, lambda_param: float,
+                 generateur: Optional[np.random.Generator] = None,
+                 taille_bloc: int = 1024):
+        """
+        Args:
+            lambda_param: Paramètre λ de la loi exponentielle
+            generateur: Flux aléatoire dédié (nouveau flux si None)
+            taille_bloc: Nombre de variables tirées à chaque recharge
+        """
+        self.lambda_param = lambda_param
+        self.generateur = generateur if generateur is not None else np.random.default_rng()
+        self.taille_bloc = taille_bloc
+        self._bloc: List[float] = []
+        self._position = 0
+    
+    def _recharger(self):
+        """Tire un nouveau bloc de variables exponentielles"""
+        # tolist() : l'accès élément par élément est plus rapide sur une liste
+        self._bloc = self.generateur.exponential(
+            1.0 / self.lambda_param, self.taille_bloc).tolist()
+        self._position = 0
+    
+    def suivant(self) -> float:
+        """Retourne le prochain temps inter-arrivée (secondes)"""
+        if self._position == len(self._bloc):
+            self._recharger()
+        valeur = self._bloc[self._position]
+        self._position += 1
+        return valeur
+    
+    def bloc_suivant(self) -> np.ndarray:
+        """
+        Retourne d'un coup les prochains temps inter-arrivée
+        
+        Fin du bloc courant s'il est entamé, sinon un nouveau bloc : la suite
+        des valeurs est la même que par appels successifs à suivant().
+        """
+        if self._position < len(self._bloc):
+            reste = np.array(self._bloc[self._position:])
+            self._position = len(self._bloc)
+            return reste
+        return self.generateur.exponential(1.0 / self.lambda_param, self.taille_bloc)
+
+
 class GenerateurVehicules:
     """
     Génère des véhicules selon un processus de Poisson
@@ -57,7 +149,15 @@ class GenerateurVehicules:
     - E[T] = 1/λ
     """
     
-    def __init__(self, env: simpy.Environment, lambda_a: float, lambda_b: float):
+    def __init__(self, env: simpy.Environment, lambda_a: float, lambda_b: float,
+                 journal: Optional[Journal] = None,
+                 generateur_a: Optional[np.random.Generator] = None,
+                 generateur_b: Optional[np.random.Generator] = None,
+                 taille_bloc: int = 1024,
+                 generateur_auxiliaire: Optional[np.random.Generator] = None,
+                 conserver_vehicules: bool = True,
+                 recycler_vehicules: bool = False,
+                 registre: Optional[RegistreVehicules] = None):
         """
         Initialise le générateur
         
@@ -65,14 +165,36 @@ class GenerateurVehicules:
             env: Environnement SimPy
             lambda_a: Taux d'arrivée pour voie A (véhicules/seconde)
             lambda_b: Taux d'arrivée pour voie B (véhicules/seconde)
+            journal: Puits d'événements (console par défaut)
+            generateur_a/b: Flux aléatoires NumPy propres à chaque voie
+            taille_bloc: Taille des blocs de temps inter-arrivée tirés d'un coup
+            generateur_auxiliaire: Flux des tirages ponctuels (temps_inter_arrivee)
+            conserver_vehicules: Garde tous les véhicules (vehicules_a/b). Si False,
+                                 chaque véhicule est intégré aux statistiques à
+                                 son départ puis oublié : mémoire bornée par la file
+            recycler_vehicules: Sans conservation, réutilise les véhicules partis
+            registre: Registre en colonnes où noter chaque arrivée (l'intersection
+                      y note les débuts de service et départs)
         """
         self.env = env
+        self.journal = journal_par_defaut(journal)
         self.lambda_a = lambda_a
         self.lambda_b = lambda_b
         self.compteur_a = 0
         self.compteur_b = 0
         self.vehicules_a: List[Vehicule] = []
         self.vehicules_b: List[Vehicule] = []
+        self.conserver_vehicules = conserver_vehicules
+        self.registre = registre
+        self.reserve: Optional[ReserveVehicules] = (
+            ReserveVehicules() if recycler_vehicules and not conserver_vehicules else None)
+        self._attentes_a = AccumulateurWelford()  # Utilisés sans conservation
+        self._attentes_b = AccumulateurWelford()
+        self._intersections_branchees = []  # Départs déjà branchés sur liberer_vehicule
+        self.echantillonneur_a = EchantillonneurExponentiel(lambda_a, generateur_a, taille_bloc)
+        self.echantillonneur_b = EchantillonneurExponentiel(lambda_b, generateur_b, taille_bloc)
+        self.generateur_auxiliaire = (generateur_auxiliaire if generateur_auxiliaire is not None
+                                      else np.random.default_rng())
         
     def temps_inter_arrivee(self, lambda_param: float) -> float:
         """
@@ -87,7 +209,36 @@ class GenerateurVehicules:
         Returns:
             Temps en secondes jusqu'à la prochaine arrivée
         """
-        return random.expovariate(lambda_param)
+        return float(self.generateur_auxiliaire.exponential(1.0 / lambda_param))
+    
+    def _nouveau_vehicule(self, id: int, direction: Direction) -> Vehicule:
+        """Crée (ou recycle) un véhicule arrivant maintenant"""
+        if self.reserve is not None:
+            return self.reserve.obtenir(id, direction, self.env.now)
+        return Vehicule(id=id, direction=direction, temps_arrivee=self.env.now)
+    
+    def liberer_vehicule(self, vehicule: Vehicule):
+        """
+        Intègre un véhicule parti aux statistiques en ligne, puis l'oublie
+        (ou le rend à la réserve)
+        
+        Branché sur l'intersection par generer_voie_a/b quand les véhicules
+        ne sont pas conservés
+        """
+        if vehicule.direction == Direction.VOIE_A:
+            self._attentes_a.ajouter(vehicule.temps_attente)
+        else:
+            self._attentes_b.ajouter(vehicule.temps_attente)
+        if self.reserve is not None:
+            self.reserve.liberer(vehicule)
+    
+    def _brancher(self, intersection):
+        """Branche liberer_vehicule sur les départs (une fois par intersection)"""
+        if self.conserver_vehicules or any(
+                branchee is intersection for branchee in self._intersections_branchees):
+            return
+        intersection.ajouter_sur_depart(self.liberer_vehicule)
+        self._intersections_branchees.append(intersection)
     
     def generer_voie_a(self, intersection):
         """
@@ -96,22 +247,24 @@ class GenerateurVehicules:
         Args:
             intersection: Objet Intersection pour gérer le passage
         """
+        self._brancher(intersection)
         while True:
             # Attendre le temps inter-arrivée (Loi Exponentielle)
-            temps_attente = self.temps_inter_arrivee(self.lambda_a)
+            temps_attente = self.echantillonneur_a.suivant()
             yield self.env.timeout(temps_attente)
             
             # Créer un nouveau véhicule
             self.compteur_a += 1
-            vehicule = Vehicule(
-                id=self.compteur_a,
-                direction=Direction.VOIE_A,
-                temps_arrivee=self.env.now
-            )
+            vehicule = self._nouveau_vehicule(self.compteur_a, Direction.VOIE_A)
+            if self.registre is not None:
+                vehicule.indice_registre = self.registre.ajouter_arrivee(VOIE_A, self.env.now)
             
-            self.vehicules_a.append(vehicule)
+            if self.conserver_vehicules:
+                self.vehicules_a.append(vehicule)
             
-            print(f"[{self.env.now:.2f}s] 🚗 Véhicule A-{vehicule.id} arrive sur Voie A")
+            if self.journal.actif(NiveauJournal.INFO):
+                self.journal.emettre(NiveauJournal.INFO, self.env.now, 'arrivee',
+                                     {'voie': 'A', 'id': vehicule.id})
             
             # Démarrer le processus de traversée
             self.env.process(intersection.traverser_voie_a(vehicule))
@@ -123,20 +276,22 @@ class GenerateurVehicules:
         Args:
             intersection: Objet Intersection pour gérer le passage
         """
+        self._brancher(intersection)
         while True:
-            temps_attente = self.temps_inter_arrivee(self.lambda_b)
+            temps_attente = self.echantillonneur_b.suivant()
             yield self.env.timeout(temps_attente)
             
             self.compteur_b += 1
-            vehicule = Vehicule(
-                id=self.compteur_b,
-                direction=Direction.VOIE_B,
-                temps_arrivee=self.env.now
-            )
+            vehicule = self._nouveau_vehicule(self.compteur_b, Direction.VOIE_B)
+            if self.registre is not None:
+                vehicule.indice_registre = self.registre.ajouter_arrivee(VOIE_B, self.env.now)
             
-            self.vehicules_b.append(vehicule)
+            if self.conserver_vehicules:
+                self.vehicules_b.append(vehicule)
             
-            print(f"[{self.env.now:.2f}s] 🚙 Véhicule B-{vehicule.id} arrive sur Voie B")
+            if self.journal.actif(NiveauJournal.INFO):
+                self.journal.emettre(NiveauJournal.INFO, self.env.now, 'arrivee',
+                                     {'voie': 'B', 'id': vehicule.id})
             
             self.env.process(intersection.traverser_voie_b(vehicule))
     
@@ -165,6 +320,27 @@ class GenerateurVehicules:
                 'temps_attente_std': np.std(temps_attente) if temps_attente else 0
             }
         
+        def stats_en_ligne(nombre_total: int, attentes: AccumulateurWelford) -> dict:
+            if nombre_total == 0:
+                return calculer_stats([])
+            servis = attentes.n > 0
+            return {
+                'nombre_total': nombre_total,
+                'nombre_servis': attentes.n,
+                'temps_attente_moyen': attentes.moyenne if servis else 0,
+                'temps_attente_max': attentes.maximum if servis else 0,
+                'temps_attente_std': attentes.ecart_type_population if servis else 0
+            }
+        
+        if self.registre is not None:
+            return self.registre.statistiques_par_voie()
+        
+        if not self.conserver_vehicules:
+            return {
+                'voie_a': stats_en_ligne(self.compteur_a, self._attentes_a),
+                'voie_b': stats_en_ligne(self.compteur_b, self._attentes_b)
+            }
+        
         return {
             'voie_a': calculer_stats(self.vehicules_a),
             'voie_b': calculer_stats(self.vehicules_b)
@@ -0,0 +1,113 @@
+"""
+Tests pour le module balayage.py
+Responsable : Sarah
+"""
+
+import csv
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from balayage import (PARAMETRES_BALAYES, COLONNES, grille, hypercube_latin,
+                      identifiant_point, executer_balayage, main)
+
+
+def test_grille():
+    """Produit cartésien des plages, valeurs par défaut pour le reste"""
+    points = list(grille({'lambda_a': [0.1, 0.2], 'T_A': [20, 30, 40]}))
+
+    assert len(points) == 6
+    assert all(p['T_B'] == PARAMETRES_BALAYES['T_B'] for p in points)
+    assert len({identifiant_point(p) for p in points}) == 6
+    with pytest.raises(ValueError):
+        next(grille({'lambda_c': [0.1]}))
+
+
+def test_hypercube_latin_stratifie():
+    """Chaque strate de chaque paramètre est occupée une seule fois"""
+    points = hypercube_latin({'lambda_a': (0.1, 0.3), 'T_A': (20, 40)}, 50, graine=1)
+    strates = np.floor((np.array([p['lambda_a'] for p in points]) - 0.1) / 0.2 * 50)
+
+    assert sorted(strates) == list(range(50))
+    assert points == hypercube_latin({'lambda_a': (0.1, 0.3), 'T_A': (20, 40)}, 50, graine=1)
+
+
+def test_reprise_apres_interruption(tmp_path):
+    """Relancer le balayage ne simule que les points manquants"""
+    chemin = str(tmp_path / "balayage.csv")
+    points = list(grille({'lambda_a': [0.1, 0.2, 0.3], 'T_B': [20, 25]}))
+    assert executer_balayage(points, chemin, duree_simulation=600, graine=5,
+                             moteur='cycles', nb_processus=1, rappel_progression=None) == 6
+
+    # Interruption simulée : deux lignes perdues et une ligne tronquée
+    with open(chemin, encoding='utf-8') as f:
+        lignes = f.readlines()
+    with open(chemin, 'w', encoding='utf-8') as f:
+        f.writelines(lignes[:4])
+        f.write(lignes[4][:15])
+
+    assert executer_balayage(points, chemin, duree_simulation=600,
+                             moteur='cycles', nb_processus=1, rappel_progression=None) == 3
+    with open(chemin, newline='', encoding='utf-8') as f:
+        resultats = list(csv.DictReader(f))
+    assert sorted(r['id'] for r in resultats) == sorted(identifiant_point(p) for p in points)
+    assert {r['graine'] for r in resultats} == {'5'}  # graine reprise du CSV
+
+    # Interruption pendant la première ligne : seule la ligne tronquée est perdue
+    with open(chemin, encoding='utf-8') as f:
+        lignes = f.readlines()
+    with open(chemin, 'w', encoding='utf-8') as f:
+        f.write(lignes[0] + lignes[1][:15])
+    assert executer_balayage(points, chemin, duree_simulation=600, graine=5,
+                             moteur='cycles', nb_processus=1, rappel_progression=None) == 6
+
+
+def test_reprise_refusee_si_reglages_differents(tmp_path):
+    """Un CSV ne se complète pas avec une autre durée, un autre moteur ou d'autres colonnes"""
+    chemin = str(tmp_path / "balayage.csv")
+    points = list(grille({'lambda_a': [0.1, 0.2]}))
+    executer_balayage(points[:1], chemin, duree_simulation=600, graine=5,
+                      moteur='cycles', nb_processus=1, rappel_progression=None)
+
+    for reglages in ({'duree_simulation': 300, 'moteur': 'cycles'},
+                     {'duree_simulation': 600, 'moteur': 'simpy'},
+                     {'duree_simulation': 600, 'moteur': 'cycles', 'graine': 6}):
+        with pytest.raises(ValueError):
+            executer_balayage(points, chemin, nb_processus=1, rappel_progression=None,
+                              **reglages)
+    assert executer_balayage(points, chemin, duree_simulation=600, moteur='cycles',
+                             nb_processus=1, rappel_progression=None) == 1
+
+    # CSV d'une version antérieure (sans les retards analytiques)
+    ancien = str(tmp_path / "ancien.csv")
+    with open(ancien, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerow([c for c in COLONNES if 'retard' not in c])
+    with pytest.raises(ValueError):
+        executer_balayage(points, ancien, duree_simulation=600, graine=5,
+                          moteur='cycles', nb_processus=1, rappel_progression=None)
+
+    # CSV sans rapport, dernière ligne sans fin de ligne : refusé et intact
+    autre = tmp_path / "autre.csv"
+    autre.write_bytes(b"a,b\n1,2\n3,4")
+    with pytest.raises(ValueError):
+        executer_balayage(points, str(autre), duree_simulation=600, graine=5,
+                          moteur='cycles', nb_processus=1, rappel_progression=None)
+    assert autre.read_bytes() == b"a,b\n1,2\n3,4"
+
+
+def test_ligne_de_commande(tmp_path, capsys):
+    """La CLI développe les plages 'min:max:n'"""
+    chemin = str(tmp_path / "cli.csv")
+    main(['--sortie', chemin, '--lambda-a', '0.1:0.3:3', '--T-A', '25,35',
+          '--moteur', 'cycles', '--duree', '300', '--processus', '1', '--graine', '2'])
+
+    with open(chemin, newline='', encoding='utf-8') as f:
+        assert len(list(csv.DictReader(f))) == 6
+    assert "6 point(s) simulé(s)" in capsys.readouterr().out
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,73 @@
+"""
+Tests pour le module cache_resultats.py
+Responsable : Sarah
+"""
+
+import os
+import pytest
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import main
+from cache_resultats import CacheResultats, cle_cache
+from main import executer_simulation
+
+
+def test_cle_canonique():
+    """L'ordre des clés ne change pas l'empreinte ; une valeur différente si"""
+    assert cle_cache({'a': 1, 'b': [1, 2]}) == cle_cache({'b': [1, 2], 'a': 1})
+    assert cle_cache({'a': 1}) != cle_cache({'a': 2})
+
+
+def test_simulation_relue_sans_resimuler(tmp_path, monkeypatch):
+    """Un second appel identique est servi par le cache"""
+    cache = CacheResultats(str(tmp_path))
+    premier = executer_simulation(duree_simulation=300, graine=8, mode_silencieux=True,
+                                  dossier_resultats=None, cache=cache)
+    assert cache.nombre_entrees() == 1
+
+    def interdit(*args, **kwargs):
+        raise AssertionError("la simulation n'aurait pas dû être relancée")
+    monkeypatch.setattr(main, '_simuler', interdit)
+    second = executer_simulation(duree_simulation=300, graine=8, mode_silencieux=True,
+                                 dossier_resultats=None, cache=cache)
+    assert second.donnees['empirique']['voie_a'] == pytest.approx(
+        premier.donnees['empirique']['voie_a'])
+
+    # Nouvelle version du moteur : l'entrée n'est plus utilisée
+    monkeypatch.setattr(main, 'VERSION_MOTEUR', main.VERSION_MOTEUR + 1)
+    with pytest.raises(AssertionError):
+        executer_simulation(duree_simulation=300, graine=8, mode_silencieux=True,
+                            dossier_resultats=None, cache=cache)
+
+
+def test_sans_graine_pas_de_cache(tmp_path):
+    """Une simulation sans graine n'est jamais mise en cache"""
+    cache = CacheResultats(str(tmp_path))
+    executer_simulation(duree_simulation=100, mode_silencieux=True,
+                        dossier_resultats=None, cache=cache)
+    assert cache.nombre_entrees() == 0
+
+
+def test_eviction_lru(tmp_path):
+    """Au-delà de la taille maximale, les entrées les moins récemment lues partent"""
+    cache = CacheResultats(str(tmp_path), taille_max=10_000)
+    charge = {'x': 'a' * 2000}
+    for i in range(4):
+        cache.ecrire(f"cle{i}", charge)
+        os.utime(os.path.join(str(tmp_path), f"cle{i}.json"), (i, i))
+    cache.lire("cle0")  # cle0 redevient la plus récente
+
+    cache.ecrire("cle4", charge)
+    assert cache.taille() <= 10_000
+    assert cache.lire("cle0") is not None
+    assert cache.lire("cle1") is None
+
+    # Commande d'invalidation
+    assert cache.vider() == 4
+    assert cache.nombre_entrees() == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,62 @@
+"""
+Tests pour le module comparaison.py (nombres aléatoires communs)
+Responsable : Sarah
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from feux import ConfigurationFeux
+from comparaison import comparer_configurations, afficher_comparaison
+
+
+CONFIGURATIONS = {
+    '30/25': ConfigurationFeux(duree_vert_a=30, duree_vert_b=25),
+    '28/28': ConfigurationFeux(duree_vert_a=28, duree_vert_b=28, duree_pietons=14),
+}
+
+
+def test_configurations_identiques(capsys):
+    """Deux configurations identiques voient les mêmes arrivées : différence nulle"""
+    resultats = comparer_configurations(
+        {'x': ConfigurationFeux(), 'y': ConfigurationFeux()},
+        duree_simulation=300, nb_replications=3, graine=7, nb_processus=1)
+
+    difference = resultats['differences']['y']['global.temps_attente_moyen']
+    assert difference['moyenne'] == 0.0
+    assert difference['ecart_type'] == 0.0
+    assert difference['reduction_variance'] is None
+
+    # L'affichage tolère l'absence de réduction de variance
+    afficher_comparaison(resultats, 'global.temps_attente_moyen')
+    assert "≈ indiscernable" in capsys.readouterr().out
+
+
+def test_reduction_de_variance():
+    """Les différences appariées sont bien moins dispersées qu'en tirages indépendants"""
+    communs = comparer_configurations(CONFIGURATIONS, duree_simulation=1800,
+                                      nb_replications=12, graine=3, nb_processus=2)
+    independants = comparer_configurations(CONFIGURATIONS, duree_simulation=1800,
+                                           nb_replications=12, graine=3, nb_processus=2,
+                                           nombres_aleatoires_communs=False)
+
+    cle = 'global.temps_attente_moyen'
+    d_communs = communs['differences']['28/28'][cle]
+    d_independants = independants['differences']['28/28'][cle]
+    assert d_communs['ecart_type'] < d_independants['ecart_type'] / 2
+    assert d_communs['reduction_variance'] > 4
+    assert d_communs['ic_95'][0] <= d_communs['moyenne'] <= d_communs['ic_95'][1]
+    assert communs['parametres']['reference'] == '30/25'
+
+
+def test_reference_inconnue():
+    """Une référence absente des configurations est refusée"""
+    with pytest.raises(ValueError):
+        comparer_configurations(CONFIGURATIONS, reference='40/20', nb_replications=2)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,76 @@
+"""
+Tests pour la course entre configurations (course.py)
+Responsable : Sarah
+"""
+
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scipy import stats as sp_stats
+
+from feux import ConfigurationFeux
+from course import friedman_conover, wilcoxon_signes, executer_course
+
+
+def test_friedman_et_comparaisons_au_meilleur():
+    """Même statistique que scipy ; seuls les candidats nettement moins bons sont dominés"""
+    generateur = np.random.default_rng(1)
+    blocs = generateur.normal(size=(12, 1)) * 5           # Effet de la réplication
+    valeurs = blocs + np.array([0.0, 0.0, 3.0, 6.0]) + generateur.normal(scale=0.5, size=(12, 4))
+
+    resultat = friedman_conover(valeurs)
+    attendu = sp_stats.friedmanchisquare(*valeurs.T)
+    assert resultat['statistique'] == pytest.approx(attendu.statistic)
+    assert resultat['p_valeur'] == pytest.approx(attendu.pvalue)
+    assert 0 not in resultat['domines'] and 1 not in resultat['domines']
+    assert 3 in resultat['domines']
+
+    # Aucun écart : rien n'est éliminé
+    egaux = friedman_conover(np.tile(blocs, (1, 4)))
+    assert egaux['p_valeur'] == 1.0 and egaux['domines'] == []
+
+
+def test_wilcoxon_deux_candidats():
+    """À deux candidats, le moins bon est éliminé si l'écart apparié est significatif"""
+    blocs = np.arange(10, dtype=float)[:, None]
+    valeurs = np.hstack([blocs + 1.0 + 0.01 * blocs, blocs])
+    assert wilcoxon_signes(valeurs)['domines'] == [0]
+    assert wilcoxon_signes(np.hstack([blocs, blocs]))['domines'] == []
+
+
+def test_course_reaffecte_les_replications():
+    """Les réglages dominés sortent tôt ; leurs réplications vont aux survivants"""
+    candidats = {f"{T_A}/{50 - T_A}": ConfigurationFeux(duree_vert_a=T_A, duree_vert_b=50 - T_A,
+                                                         duree_pietons=14)
+                 for T_A in (10, 15, 25, 30, 33, 40)}
+    resultats = executer_course(candidats, lambda_a=0.3, lambda_b=0.2, duree_simulation=1200,
+                                budget_replications=120, graine=3, moteur='cycles',
+                                nb_processus=1)
+
+    assert resultats['replications_utilisees'] <= 120
+    assert resultats['replications_uniformes'] == 20
+    elimines = {ligne['nom'] for ligne in resultats['eliminations']}
+    assert '10/40' in elimines
+    assert all(resultats['replications'][nom] < 20 for nom in elimines)
+    for ligne in resultats['survivants']:
+        assert ligne['nom'] not in elimines
+        assert ligne['n'] == resultats['replications'][ligne['nom']] > 20
+    moyennes = [ligne['moyenne'] for ligne in resultats['survivants']]
+    assert moyennes == sorted(moyennes)
+
+
+def test_validation():
+    """Deux candidats au moins et un budget couvrant le premier test"""
+    with pytest.raises(ValueError):
+        executer_course([ConfigurationFeux()])
+    with pytest.raises(ValueError):
+        executer_course([ConfigurationFeux(), ConfigurationFeux(duree_vert_a=20)],
+                        budget_replications=6, nb_blocs_min=5)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,104 @@
+"""
+Tests pour l'évaluation multi-fidélité (evaluation_multi_fidelite.py)
+Responsable : Sarah
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from feux import ConfigurationFeux, nom_configuration
+from cache_resultats import CacheResultats
+from evaluation_multi_fidelite import evaluer_multi_fidelite, afficher_rapport
+
+
+def _candidats():
+    return [ConfigurationFeux(duree_vert_a=T_A, duree_vert_b=T_B, duree_pietons=15)
+            for T_A in range(10, 50, 5) for T_B in range(10, 35, 5)]
+
+
+def test_entonnoir_et_rapport():
+    """Chaque étage respecte son budget ; le rapport chiffre le calcul évité"""
+    resultats = evaluer_multi_fidelite(
+        _candidats(), lambda_a=0.3, lambda_b=0.2, fraction_analytique=0.25,
+        replications_cycles=3, duree_cycles=1200, fraction_cycles=0.5, nb_max_simpy=3,
+        replications_simpy=3, duree_simpy=600, graine=6, nb_processus=1)
+
+    etages = resultats['etages']
+    assert etages['analytique']['candidats'] == 40
+    assert etages['cycles']['candidats'] == 10
+    assert etages['cycles']['nb_simulations'] == 30
+    assert etages['simpy']['candidats'] == 3
+    assert etages['simpy']['nb_simulations'] == 9
+    assert set(etages['simpy']['promus']) <= set(etages['cycles']['promus'])
+    assert set(etages['cycles']['promus']) <= set(etages['analytique']['promus'])
+
+    # Les promus de l'étage 1 sont les meilleurs scores de Webster
+    scores = etages['analytique']['scores']
+    pire_promu = max(scores[nom] for nom in etages['analytique']['promus'])
+    assert all(scores[nom] >= pire_promu for nom in scores
+               if nom not in etages['analytique']['promus'])
+
+    classement = resultats['classement']
+    assert [ligne['nom'] for ligne in classement] == etages['simpy']['promus']
+    assert classement[0]['moyenne'] <= classement[-1]['moyenne']
+    assert classement[0]['ic_95'][0] <= classement[0]['moyenne'] <= classement[0]['ic_95'][1]
+
+    rapport = resultats['rapport']
+    assert rapport['simulations_simpy_evitees'] == 37 * 3
+    assert 0 < rapport['economie'] < 1
+    assert rapport['duree_tout_simpy_estimee'] > rapport['duree_totale']
+    assert rapport['correlation_rangs']['analytique_cycles'] > 0.5
+
+
+def test_etage_simpy_relu_du_cache(tmp_path, capsys):
+    """Un étage SimPy relu du cache ne sert pas à estimer le coût « tout SimPy »"""
+    def evaluer():
+        return evaluer_multi_fidelite(
+            _candidats(), lambda_a=0.3, lambda_b=0.2, replications_cycles=2, duree_cycles=600,
+            nb_max_simpy=2, replications_simpy=2, duree_simpy=300, graine=6, nb_processus=1,
+            cache=CacheResultats(str(tmp_path)))
+
+    premiere, seconde = evaluer(), evaluer()
+    assert premiere['etages']['simpy']['nb_lectures_cache'] == 0
+    assert premiere['rapport']['duree_tout_simpy_estimee'] > 0
+    assert seconde['etages']['simpy']['nb_lectures_cache'] == 2
+    assert seconde['etages']['simpy']['nb_simulations'] == 0
+    assert seconde['rapport']['duree_tout_simpy_estimee'] is None
+    assert seconde['rapport']['economie'] is None
+    assert seconde['classement'] == premiere['classement']
+
+    afficher_rapport(seconde)
+    assert "économie non estimée" in capsys.readouterr().out
+
+
+def test_configurations_sursaturees_ecartees():
+    """Un réglage où une voie est sursaturée (x ≥ 1) ne passe pas l'étage analytique"""
+    candidats = {
+        'sature': ConfigurationFeux(duree_vert_a=10, duree_vert_b=80, duree_pietons=30),
+        'correct': ConfigurationFeux(duree_vert_a=30, duree_vert_b=25),
+        'equilibre': ConfigurationFeux(duree_vert_a=28, duree_vert_b=28, duree_pietons=14),
+    }
+    resultats = evaluer_multi_fidelite(
+        candidats, lambda_a=2.0, lambda_b=0.2, fraction_analytique=0.6, replications_cycles=2,
+        duree_cycles=600, fraction_cycles=1.0, replications_simpy=2, duree_simpy=300,
+        graine=2, nb_processus=1, debit_saturation=10)
+
+    assert resultats['etages']['analytique']['scores']['sature'] is None
+    assert 'sature' not in resultats['etages']['analytique']['promus']
+    assert len(resultats['classement']) == 2
+
+
+def test_noms_et_validation():
+    """Les listes sont nommées T_A/T_B/T_pietons ; au moins deux réplications SimPy"""
+    assert nom_configuration(ConfigurationFeux(duree_vert_a=27.5, duree_vert_b=30)) == "27.5/30/15"
+    with pytest.raises(ValueError):
+        evaluer_multi_fidelite([ConfigurationFeux()], replications_simpy=1)
+    with pytest.raises(ValueError):
+        evaluer_multi_fidelite({})
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -35,6 +35,12 @@ def test_configuration_feux_personnalisee():
     assert config.duree_cycle == 76.0  # 28+3+28+3+14
 
 
+def test_configuration_to_dict():
+    """Les durées sont exportées sous les noms du modèle"""
+    config = ConfigurationFeux(duree_vert_a=40.0, duree_vert_b=20.0)
+    assert config.to_dict() == {'T_A': 40.0, 'T_B': 20.0, 'T_jaune': 3.0, 'T_pietons': 15.0}
+
+
 def test_proportions_temps_vert():
     """Test des proportions de temps vert"""
     config = ConfigurationFeux()
@@ -116,5 +122,29 @@ def test_statistiques():
     assert stats['temps_simulation'] >= config.duree_cycle * 2
 
 
+def test_attendre_vert():
+    """Test du réveil des véhicules au début du vert (sans scrutation)"""
+    env = simpy.Environment()
+    config = ConfigurationFeux()
+    systeme = SystemeFeux(env, config)
+    env.process(systeme.gerer_cycle())
+    
+    reveils = []
+    
+    def vehicule_voie_b():
+        yield systeme.attendre_vert_b()
+        reveils.append(env.now)
+    
+    env.process(vehicule_voie_b())
+    env.run(until=config.duree_cycle)
+    
+    # Voie B passe au vert après T_A + T_jaune = 33s
+    assert reveils == [33.0]
+    assert systeme.peut_passer_voie_b() == False
+    
+    # L'événement est réarmé pour le cycle suivant
+    assert not systeme.attendre_vert_b().triggered
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Tests pour le module intersection.py
+Responsable : Sarah
+"""
+
+import pytest
+import simpy
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from vehicule import Vehicule, Direction
+from feux import ConfigurationFeux, SystemeFeux
+from intersection import FileAttente, Intersection
+from journal import JournalNul
+
+
+def test_file_fifo():
+    """Les véhicules sortent dans leur ordre d'arrivée"""
+    file = FileAttente("File Voie A")
+    for i in range(3):
+        file.ajouter_vehicule(Vehicule(i + 1, Direction.VOIE_A, float(i)), float(i))
+
+    assert [file.retirer_vehicule(5.0).id for _ in range(3)] == [1, 2, 3]
+    assert file.retirer_vehicule(5.0) is None
+    assert file.est_vide()
+
+
+def test_longueurs_moyennes_temporelles():
+    """L et L_q sont des moyennes pondérées par le temps"""
+    file = FileAttente("File Voie A")
+    file.ajouter_vehicule(Vehicule(1, Direction.VOIE_A, 0.0), 0.0)
+    file.ajouter_vehicule(Vehicule(2, Direction.VOIE_A, 2.0), 2.0)
+
+    # t=4 : début de service du premier, départ à t=5
+    file.retirer_vehicule(4.0)
+    file.enregistrer_service(4.0, 5.0)
+
+    # L_q : 1 véhicule sur [0,2], 2 sur [2,4], 1 sur [4,10] → 12/10
+    assert file.longueur_moyenne_file(10.0) == pytest.approx(1.2)
+    # L : idem + 1 véhicule en traversée sur [4,5] → 13/10
+    assert file.nombre_moyen_systeme(10.0) == pytest.approx(1.3)
+
+
+def test_historique_compact():
+    """La trace optionnelle utilise des tableaux float64 / int32"""
+    file = FileAttente("File Voie B", conserver_historique=True)
+    for i in range(2000):
+        file.ajouter_vehicule(Vehicule(i, Direction.VOIE_B, float(i)), float(i))
+
+    trace = file.historique
+    assert trace.temps.dtype.name == 'float64'
+    assert trace.longueurs.dtype.name == 'int32'
+    assert len(trace.temps) == 2000
+    assert trace.longueurs[-1] == 2000
+
+    # Sans demande explicite, aucune trace n'est gardée
+    assert FileAttente("File Voie A").historique is None
+
+
+def test_rappels_depart_enchaines():
+    """Un second rappel de départ s'ajoute au premier sans le remplacer"""
+    env = simpy.Environment()
+    journal = JournalNul()
+    feux = SystemeFeux(env, ConfigurationFeux(), journal)
+    intersection = Intersection(env, feux, journal)
+    appels = []
+    intersection.ajouter_sur_depart(lambda v: appels.append(('premier', v.id)))
+    intersection.ajouter_sur_depart(lambda v: appels.append(('second', v.id)))
+
+    env.process(feux.gerer_cycle())
+    for i in range(3):
+        env.process(intersection.traverser_voie_a(Vehicule(i + 1, Direction.VOIE_A, 0.0)))
+    env.run(until=60)
+
+    assert appels == [(rang, i) for i in (1, 2, 3) for rang in ('premier', 'second')]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,87 @@
+"""
+Tests pour le module journal.py
+Responsable : Sarah
+"""
+
+import pytest
+import simpy
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from feux import SystemeFeux, ConfigurationFeux
+from vehicule import GenerateurVehicules
+from intersection import Intersection
+from journal import (Journal, NiveauJournal, JournalNul, JournalTampon,
+                     JournalRappel, JournalFichier, formater_evenement)
+
+
+def simuler(journal, duree=100):
+    """Lance une petite simulation avec le journal donné"""
+    env = simpy.Environment()
+    systeme_feux = SystemeFeux(env, ConfigurationFeux(), journal)
+    intersection = Intersection(env, systeme_feux, journal)
+    generateur = GenerateurVehicules(env, 0.3, 0.3, journal)
+
+    env.process(systeme_feux.gerer_cycle())
+    env.process(generateur.generer_voie_a(intersection))
+    env.process(generateur.generer_voie_b(intersection))
+    env.run(until=duree)
+    return intersection
+
+
+def test_journal_nul_silencieux(capsys):
+    """Le journal nul n'affiche rien et n'appelle jamais emettre"""
+    intersection = simuler(JournalNul())
+
+    assert capsys.readouterr().out == ""
+    assert intersection.file_a.nombre_vehicules_servis > 0
+
+
+def test_journal_tampon_niveaux():
+    """Le tampon filtre par niveau et respecte sa capacité"""
+    journal = JournalTampon(capacite=50, niveau=NiveauJournal.INFO)
+    simuler(journal)
+
+    assert len(journal.evenements) == 50
+    evenements = {e for _, _, e, _ in journal.evenements}
+    # Les longueurs de file sont de niveau DEBUG
+    assert 'file' not in evenements
+    assert 'arrivee' in evenements
+
+
+def test_journal_rappel():
+    """Le journal par rappel reçoit des événements structurés"""
+    recus = []
+    simuler(JournalRappel(lambda n, t, e, d: recus.append((e, d))))
+
+    feux = [d['etat'] for e, d in recus if e == 'feu']
+    assert feux[:5] == ['S1', 'S2', 'S3', 'S4', 'S5']
+
+
+def test_journal_fichier(tmp_path):
+    """Le journal fichier écrit une ligne JSON par événement"""
+    chemin = tmp_path / "evenements.jsonl"
+    with JournalFichier(str(chemin)) as journal:
+        simuler(journal, duree=40)
+
+    lignes = chemin.read_text(encoding='utf-8').splitlines()
+    assert len(lignes) > 0
+    assert '"evenement": "feu"' in lignes[0]
+
+
+def test_journal_abstrait():
+    """Un journal sans emettre() ne peut pas être instancié"""
+    with pytest.raises(TypeError):
+        Journal()
+
+
+def test_formater_evenement():
+    """Les messages console sont identiques aux anciens print"""
+    message = formater_evenement(12.5, 'arrivee', {'voie': 'A', 'id': 3})
+    assert message == "[12.50s] 🚗 Véhicule A-3 arrive sur Voie A"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,66 @@
+"""
+Tests pour le module moteur_cycles.py
+Responsable : Sarah
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from feux import ConfigurationFeux
+from main import executer_simulation
+
+
+def simuler(moteur, **parametres):
+    """Simulation silencieuse sans fichier JSON"""
+    return executer_simulation(mode_silencieux=True, dossier_resultats=None,
+                               moteur=moteur, **parametres).donnees['empirique']
+
+
+@pytest.mark.parametrize("lambda_, config", [
+    (0.3, ConfigurationFeux()),
+    (0.4, ConfigurationFeux(duree_vert_a=40, duree_vert_b=20)),
+])
+def test_cycles_equivalent_simpy(lambda_, config):
+    """À graine égale, les deux moteurs voient les mêmes arrivées"""
+    parametres = dict(duree_simulation=3000, lambda_a=lambda_, lambda_b=lambda_,
+                      config_feux=config, graine=21)
+    simpy_ = simuler('simpy', **parametres)
+    cycles = simuler('cycles', **parametres)
+
+    for voie in ('voie_a', 'voie_b'):
+        assert cycles[voie]['vehicules_total'] == simpy_[voie]['vehicules_total']
+        assert cycles[voie]['vehicules_servis'] == pytest.approx(
+            simpy_[voie]['vehicules_servis'], abs=2)
+        assert cycles[voie]['temps_attente_moyen'] == pytest.approx(
+            simpy_[voie]['temps_attente_moyen'], rel=0.02)
+        assert cycles[voie]['longueur_moyenne_file'] == pytest.approx(
+            simpy_[voie]['longueur_moyenne_file'], rel=0.02)
+    assert cycles['feux']['nombre_cycles'] == simpy_['feux']['nombre_cycles']
+    assert cycles['generateur']['voie_a']['temps_attente_max'] == pytest.approx(
+        simpy_['generateur']['voie_a']['temps_attente_max'], abs=0.2)
+
+
+@pytest.mark.parametrize("moteur", ['simpy', 'cycles'])
+def test_debit_saturation_par_voie(moteur):
+    """Un débit de saturation plus faible sur B n'allonge que l'attente de B"""
+    parametres = dict(duree_simulation=3000, lambda_a=0.3, lambda_b=0.3, graine=21)
+    reference = simuler(moteur, **parametres)
+    lente = simuler(moteur, debit_saturation_b=1.0, **parametres)
+
+    assert lente['voie_a']['temps_attente_moyen'] == reference['voie_a']['temps_attente_moyen']
+    assert lente['voie_b']['temps_attente_moyen'] > 1.3 * reference['voie_b']['temps_attente_moyen']
+    with pytest.raises(ValueError):
+        simuler(moteur, debit_saturation_a=0, **parametres)
+
+
+def test_moteur_inconnu():
+    """Un moteur inconnu est refusé"""
+    with pytest.raises(ValueError):
+        simuler('turbo', duree_simulation=10)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,85 @@
+"""
+Tests pour le calcul du cycle optimal de Webster (optimisation_webster.py)
+Responsable : Sarah
+"""
+
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from feux import ConfigurationFeux
+from optimisation_webster import plan_webster, configurations_webster, configuration_webster
+from statistiques import retards_feux
+
+
+def test_cycle_et_repartition_de_webster():
+    """Valeurs calculées à la main : Y = 0.6, L = 15s, C0 = 27.5 / 0.4"""
+    plan = plan_webster(0.2, 0.1, 0.5, 0.5, pas_arrondi=None)
+
+    assert plan['Y'] == pytest.approx(0.6)
+    assert plan['duree_cycle_webster'] == pytest.approx(68.75)
+    assert plan['duree_cycle'] == pytest.approx(68.75)
+    # Vert effectif 53.75s partagé 2/3 - 1/3, moins le jaune
+    assert plan['T_A'] == pytest.approx(53.75 * 2 / 3 - 3)
+    assert plan['T_B'] == pytest.approx(53.75 / 3 - 3)
+    assert not plan['sature']
+
+
+def test_plan_vectorise_et_configurations():
+    """Un appel sur un plan horaire redonne le calcul point par point"""
+    lambda_a = np.linspace(0.02, 0.3, 12)
+    lambda_b = lambda_a[::-1] / 2
+    plan = plan_webster(lambda_a, lambda_b, 0.5, 0.5)
+    configurations = configurations_webster(lambda_a, lambda_b, debit_saturation_a=0.5,
+                                            debit_saturation_b=0.5, duree_pietons=14)
+
+    assert plan['T_A'].shape == (12,)
+    assert len(configurations) == 12
+    for i, config in enumerate(configurations):
+        assert isinstance(config, ConfigurationFeux)
+        assert config.duree_jaune == 3
+        assert config.duree_pietons == 14
+        seule = configuration_webster(lambda_a[i], lambda_b[i], debit_saturation_a=0.5,
+                                      debit_saturation_b=0.5, duree_pietons=14)
+        assert (seule.duree_vert_a, seule.duree_vert_b) == (config.duree_vert_a, config.duree_vert_b)
+        # Verts arrondis à la seconde
+        assert config.duree_vert_a == round(config.duree_vert_a)
+    assert np.allclose(plan['duree_cycle'], plan['T_A'] + plan['T_B'] + 2 * 3 + 15)
+
+
+def test_bornes_et_saturation():
+    """Verts minimaux en faible demande, cycle maximal au-delà de Y = 1"""
+    plan = plan_webster([0.001, 0.3, 0.4], [0.001, 0.1, 0.3], 0.5, 0.5,
+                        duree_vert_min=8, duree_cycle_max=120)
+
+    # Cycle minimal de 40s : 19s de vert à partager, aucun vert sous 8s
+    assert plan['duree_cycle'][0] == 40
+    assert plan['T_A'][0] + plan['T_B'][0] == 19
+    assert list(plan['sature']) == [False, True, True]
+    assert np.isinf(plan['duree_cycle_webster'][2])
+    assert np.all(plan['duree_cycle'][1:] == 120)
+    assert np.all(plan['T_B'] >= 8)
+
+    with pytest.raises(ValueError):
+        plan_webster(0.1, 0.1, duree_vert_min=60, duree_cycle_max=100)
+
+
+def test_plan_reduit_le_retard_de_webster():
+    """Le plan de Webster fait mieux que le réglage manuel 28/28 (même modèle de retard)"""
+    lambda_a, lambda_b, saturation = 0.2, 0.1, 0.5
+    plan = plan_webster(lambda_a, lambda_b, saturation, saturation)
+
+    def retard_moyen(T_A, T_B):
+        retards = retards_feux(lambda_a, lambda_b, T_A, T_B,
+                               debit_saturation_a=saturation, debit_saturation_b=saturation)
+        return (lambda_a * retards['voie_a']['retard_webster'] +
+                lambda_b * retards['voie_b']['retard_webster']) / (lambda_a + lambda_b)
+
+    assert retard_moyen(plan['T_A'], plan['T_B']) < retard_moyen(28, 28)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
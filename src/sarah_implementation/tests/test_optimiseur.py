@@ -0,0 +1,103 @@
+"""
+Tests pour l'optimiseur des durées de feux (optimiseur.py)
+Responsable : Sarah
+"""
+
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from cache_resultats import CacheResultats
+from optimiseur import ContraintesFeux, EvaluateurConfigurations, optimiser_nelder_mead, main
+
+
+def test_contraintes_projection_et_arrondi():
+    """Les points évalués respectent bornes, cycle maximal et pas"""
+    contraintes = ContraintesFeux(duree_cycle_max=90)
+
+    T_A, T_B, T_pietons = contraintes.arrondir([70.4, 50.2, 5.0])
+    assert T_pietons == contraintes.duree_pietons_min
+    assert T_A + T_B + T_pietons + 2 * 3 <= 90
+    assert all(v == round(v) for v in (T_A, T_B, T_pietons))
+    assert T_A > T_B  # Réduction au prorata des marges
+
+    assert contraintes.arrondir([20.3, 30.6, 15.0]) == (20.0, 31.0, 15.0)
+    assert contraintes.configuration([20.3, 30.6, 15.0]).duree_cycle == 72
+
+    with pytest.raises(ValueError):
+        ContraintesFeux(duree_vert_min=50, duree_cycle_max=100)
+
+
+def test_evaluateur_memorise_et_reutilise_les_replications():
+    """Un point n'est simulé qu'une fois par réplication, même après augmentation de N"""
+    evaluateur = EvaluateurConfigurations(0.3, 0.2, duree_simulation=600, nb_replications=3,
+                                          graine=11, moteur='cycles', nb_processus=1)
+
+    premiere = evaluateur.evaluer([[30, 25, 15], [30.2, 24.8, 15]])
+    assert premiere[0] == premiere[1]  # Même point arrondi
+    assert evaluateur.nb_simulations == 3
+
+    assert evaluateur.evaluer([[30, 25, 15]]) == premiere[:1]
+    assert evaluateur.nb_simulations == 3
+
+    evaluateur.nb_replications = 6
+    evaluateur.evaluer([[30, 25, 15]])
+    assert evaluateur.nb_simulations == 6
+    assert evaluateur.resume([30, 25, 15])['n'] == 6
+
+    # Nombres aléatoires communs : un autre évaluateur de même graine redonne les mêmes valeurs
+    autre = EvaluateurConfigurations(0.3, 0.2, duree_simulation=600, nb_replications=3,
+                                     graine=11, moteur='cycles', nb_processus=1)
+    assert autre.evaluer([[30, 25, 15]]) == premiere[:1]
+
+
+def test_nelder_mead_ameliore_le_reglage_manuel():
+    """Depuis 28/28, l'optimiseur trouve un réglage nettement meilleur et s'arrête seul"""
+    contraintes = ContraintesFeux(duree_vert_min=5, duree_pietons_min=10)
+    evaluateur = EvaluateurConfigurations(0.3, 0.15, contraintes, duree_simulation=1200,
+                                          nb_replications=4, graine=5, moteur='cycles',
+                                          nb_processus=1)
+    reference = evaluateur.evaluer([[28, 28, 14]])[0]
+
+    resultats = optimiser_nelder_mead(evaluateur, depart=[28, 28, 14], pas_initial=8,
+                                      nb_replications_max=8)
+
+    assert resultats['raison_arret'] in ('stagnation', 'simplexe_degenere')
+    assert resultats['nb_replications'] == 8
+    assert resultats['objectif']['moyenne'] < 0.8 * reference
+    assert resultats['meilleur']['T_cycle'] < 28 + 28 + 14 + 6
+    assert resultats['meilleur']['T_pietons'] == 10
+    assert resultats['configuration'].duree_vert_a >= 5
+
+
+def test_cache_disque_entre_deux_optimisations(tmp_path):
+    """Une seconde optimisation identique ne lance aucune simulation"""
+    def optimiser():
+        evaluateur = EvaluateurConfigurations(
+            0.25, 0.25, duree_simulation=600, nb_replications=2, graine=8,
+            moteur='cycles', nb_processus=1, cache=CacheResultats(str(tmp_path)))
+        return optimiser_nelder_mead(evaluateur, nb_iterations_max=10)
+
+    premiere = optimiser()
+    seconde = optimiser()
+    assert premiere['nb_simulations'] > 0
+    assert seconde['nb_simulations'] == 0
+    assert seconde['nb_lectures_cache'] == premiere['nb_simulations']
+    assert seconde['meilleur'] == premiere['meilleur']
+    assert np.isclose(seconde['objectif']['moyenne'], premiere['objectif']['moyenne'])
+
+
+
+def test_ligne_de_commande_une_replication(capsys):
+    """Avec une seule réplication, le résumé s'affiche sans intervalle"""
+    assert main(['--replications', '1', '--replications-max', '1', '--moteur', 'cycles',
+                 '--graine', '3', '--iterations', '3', '--processus', '1']) == 0
+    sortie = capsys.readouterr().out
+    assert "W_q pondéré" in sortie and "IC 95%" not in sortie
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,102 @@
+"""
+Tests pour l'optimisation bayésienne (optimiseur_bayesien.py)
+Responsable : Sarah
+"""
+
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from cache_resultats import CacheResultats
+from feux import ConfigurationFeux
+from main import executer_simulation
+from optimiseur import EvaluateurConfigurations
+from optimiseur_bayesien import (ProcessusGaussien, amelioration_esperee,
+                                 observations_en_cache, optimiser_bayesien)
+
+
+def test_processus_gaussien_interpole_et_quantifie_l_incertitude():
+    """Prédiction proche des données, incertitude plus grande loin d'elles"""
+    X = np.linspace(0, 1, 12)[:, None]
+    y = np.sin(6 * X[:, 0])
+    modele = ProcessusGaussien(graine=0).ajuster(X, y)
+
+    moyenne, ecart_type = modele.predire(np.array([[0.25], [0.5], [3.0]]))
+    assert moyenne[:2] == pytest.approx(np.sin([1.5, 3.0]), abs=0.1)
+    assert ecart_type[2] > 5 * ecart_type[0]
+
+    # Kriging believer : le point ajouté devient quasi certain
+    modele.ajouter_fictif(np.array([3.0]), moyenne[2])
+    assert modele.predire(np.array([[3.0]]))[1][0] < ecart_type[2] / 5
+
+
+def test_amelioration_esperee():
+    """EI = σ·φ(0) à la meilleure valeur, ≈ amélioration certaine quand σ → 0"""
+    ei = amelioration_esperee(np.array([1.0, 0.5, 2.0]), np.array([0.2, 1e-9, 1e-9]), 1.0)
+    assert ei[0] == pytest.approx(0.2 / np.sqrt(2 * np.pi))
+    assert ei[1] == pytest.approx(0.5)
+    assert ei[2] == pytest.approx(0.0)
+
+
+def test_observations_lues_dans_le_cache(tmp_path):
+    """Entrées d'executer_simulation et de l'optimiseur, filtrées par réglages"""
+    cache = CacheResultats(str(tmp_path))
+    executer_simulation(duree_simulation=600, lambda_a=0.2, lambda_b=0.1,
+                        config_feux=ConfigurationFeux(duree_vert_a=20, duree_vert_b=15),
+                        mode_silencieux=True, dossier_resultats=None, graine=3,
+                        moteur='cycles', cache=cache)
+    # Écartées : autre horizon, autre T_jaune, autre moteur, arrêt séquentiel
+    executer_simulation(duree_simulation=900, lambda_a=0.2, lambda_b=0.1,
+                        mode_silencieux=True, dossier_resultats=None, graine=3,
+                        moteur='cycles', cache=cache)
+    executer_simulation(duree_simulation=600, lambda_a=0.2, lambda_b=0.1,
+                        config_feux=ConfigurationFeux(duree_vert_a=21, duree_jaune=4),
+                        mode_silencieux=True, dossier_resultats=None, graine=3,
+                        moteur='cycles', cache=cache)
+    executer_simulation(duree_simulation=600, lambda_a=0.2, lambda_b=0.1,
+                        config_feux=ConfigurationFeux(duree_vert_a=22),
+                        mode_silencieux=True, dossier_resultats=None, graine=3, cache=cache)
+    executer_simulation(duree_simulation=300, lambda_a=0.2, lambda_b=0.1,
+                        config_feux=ConfigurationFeux(duree_vert_a=23),
+                        mode_silencieux=True, dossier_resultats=None, graine=3,
+                        precision_cible=1e-3, duree_max=600, cache=cache)
+    evaluateur = EvaluateurConfigurations(0.3, 0.2, duree_simulation=600, nb_replications=2,
+                                          graine=3, moteur='cycles', nb_processus=1, cache=cache)
+    evaluateur.evaluer([[30, 25, 15]])
+
+    observations = observations_en_cache(cache, 600, moteur='cycles')
+    assert set(observations) == {(20.0, 15.0, 15.0, 0.2, 0.1), (30.0, 25.0, 15.0, 0.3, 0.2)}
+    W_A, W_B = observations[(30.0, 25.0, 15.0, 0.3, 0.2)]
+    assert (0.3 * W_A + 0.2 * W_B) / 0.5 == pytest.approx(evaluateur.resume([30, 25, 15])['moyenne'])
+
+    # Moteur SimPy : l'arrêt séquentiel (simulé jusqu'à 600 s) reste écarté
+    assert set(observations_en_cache(cache, 600)) == {(22.0, 25.0, 15.0, 0.2, 0.1)}
+
+
+def test_optimisation_et_demarrage_a_chaud(tmp_path):
+    """Meilleur que 28/28 ; une seconde optimisation repart des résultats en cache"""
+    def evaluateur():
+        return EvaluateurConfigurations(0.3, 0.3, duree_simulation=1200, nb_replications=3,
+                                        graine=4, moteur='cycles', nb_processus=1,
+                                        cache=CacheResultats(str(tmp_path)), poids=(1.0, 0.05))
+
+    premier = evaluateur()
+    reference = premier.evaluer([[28, 28, 14]])[0]
+    resultats = optimiser_bayesien(premier, nb_iterations_max=4, taille_lot=3)
+
+    assert resultats['objectif']['moyenne'] < 0.8 * reference
+    assert resultats['meilleur']['T_A'] > resultats['meilleur']['T_B']
+    assert resultats['nb_observations_chaudes'] == 1  # La référence 28/28
+
+    second = evaluateur()
+    relance = optimiser_bayesien(second, nb_iterations_max=4, taille_lot=3)
+    assert relance['nb_observations_chaudes'] >= resultats['nb_points_evalues']
+    assert relance['nb_simulations'] < resultats['nb_simulations']
+    assert relance['objectif']['moyenne'] <= resultats['objectif']['moyenne'] + 1e-9
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
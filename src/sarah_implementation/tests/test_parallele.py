@@ -0,0 +1,44 @@
+"""
+Tests pour le module parallele.py et le lanceur de scénarios
+Responsable : Sarah
+"""
+
+import math
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from parallele import executer_en_parallele
+from main import executer_scenarios, SCENARIOS_REFERENCE
+
+
+def test_executer_en_parallele_indices():
+    """Chaque résultat revient avec l'indice de sa tâche"""
+    taches = [float(i) for i in range(20)]
+    resultats = dict(executer_en_parallele(math.sqrt, taches, nb_processus=2,
+                                           taches_en_vol=3))
+
+    assert resultats == {i: math.sqrt(i) for i in range(20)}
+
+
+def test_executer_en_parallele_sequentiel():
+    """Avec un seul processus, l'exécution reste dans le processus courant"""
+    resultats = list(executer_en_parallele(abs, iter([-1, -2]), nb_processus=1))
+    assert resultats == [(0, 1), (1, 2)]
+
+
+def test_executer_scenarios_ordre(tmp_path):
+    """Les scénarios gardent leur ordre et leur propre fichier JSON"""
+    resultats = executer_scenarios(SCENARIOS_REFERENCE, duree_simulation=200,
+                                   nb_processus=2, graine=5,
+                                   dossier_resultats=str(tmp_path))
+
+    assert [r.donnees['parametres']['config_feux']['T_A'] for r in resultats] == [30, 40, 28]
+    assert sorted(os.listdir(tmp_path)) == sorted(f"{sc['nom']}.json"
+                                                  for sc in SCENARIOS_REFERENCE)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,64 @@
+"""
+Tests pour le module registre.py
+Responsable : Sarah
+"""
+
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from registre import RegistreVehicules, VOIE_A, VOIE_B
+from main import executer_simulation
+
+
+def test_agrandissement_et_vues():
+    """Les colonnes s'agrandissent et les vues couvrent toutes les lignes"""
+    registre = RegistreVehicules(capacite_initiale=2)
+    for i in range(5):
+        indice = registre.ajouter_arrivee(VOIE_A if i % 2 == 0 else VOIE_B, float(i))
+        registre.enregistrer_debut_service(indice, i + 1.0)
+        registre.enregistrer_depart(indice, i + 1.1)
+
+    assert registre.taille == 5
+    assert registre.arrivee.tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert registre.voie.dtype == np.int8
+    assert np.allclose(registre.temps_attente(), 1.0)
+    # Vue sans copie
+    assert np.shares_memory(registre.arrivee, registre._arrivee)
+
+
+def test_statistiques_identiques_au_generateur():
+    """À graine égale, le registre donne les mêmes attentes que les véhicules"""
+    reference = executer_simulation(duree_simulation=300, graine=11, mode_silencieux=True,
+                                    dossier_resultats=None, conserver_vehicules=True)
+    avec_registre = executer_simulation(duree_simulation=300, graine=11,
+                                        mode_silencieux=True, dossier_resultats=None,
+                                        registre_vehicules=True)
+
+    par_voie = avec_registre.registre.statistiques_par_voie()
+    for voie in ('voie_a', 'voie_b'):
+        attendu = reference.donnees['empirique']['generateur'][voie]
+        assert avec_registre.donnees['empirique']['generateur'][voie] == par_voie[voie]
+        assert par_voie[voie]['nombre_total'] == attendu['nombre_total']
+        assert par_voie[voie]['nombre_servis'] == attendu['nombre_servis']
+        for cle in ('temps_attente_moyen', 'temps_attente_max', 'temps_attente_std'):
+            assert par_voie[voie][cle] == pytest.approx(attendu[cle])
+
+
+def test_export_npz(tmp_path):
+    """Le registre est exporté à côté du JSON et se recharge à l'identique"""
+    collecteur = executer_simulation(duree_simulation=120, graine=3, mode_silencieux=True,
+                                     nom_scenario="registre", dossier_resultats=str(tmp_path),
+                                     registre_vehicules=True)
+    recharge = RegistreVehicules.charger(str(tmp_path / "registre.npz"))
+
+    assert recharge.taille == collecteur.registre.taille
+    assert np.array_equal(recharge.voie, collecteur.registre.voie)
+    assert np.array_equal(recharge.depart, collecteur.registre.depart, equal_nan=True)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -14,6 +14,9 @@ from feux import SystemeFeux, ConfigurationFeux
 from vehicule import GenerateurVehicules, Direction
 from intersection import Intersection
 from statistiques import StatistiquesTheorique, CollecteurDonnees
+from aleatoire import FluxAleatoires
+from journal import JournalNul
+from main import executer_simulation
 
 
 def test_integration_complete():
@@ -181,5 +184,95 @@ def test_scenarios_differents():
         assert stats['voie_b']['vehicules_servis'] > 0
 
 
+def test_graine_reproductible(tmp_path, monkeypatch):
+    """Une même graine redonne exactement les mêmes résultats"""
+    (tmp_path / 'src').mkdir()
+    monkeypatch.chdir(tmp_path / 'src')
+    
+    def lancer(graine):
+        return executer_simulation(duree_simulation=300, graine=graine,
+                                   mode_silencieux=True).donnees
+    
+    premier, second, autre = lancer(7), lancer(7), lancer(8)
+    
+    assert premier['parametres']['graine'] == 7
+    assert premier['empirique'] == second['empirique']
+    assert premier['empirique'] != autre['empirique']
+    
+    # Sans graine, l'entropie tirée est enregistrée pour rejouer le run
+    sans_graine = lancer(None)
+    rejoue = lancer(sans_graine['parametres']['graine'])
+    assert sans_graine['empirique'] == rejoue['empirique']
+
+
+def test_replications_intervalles_confiance():
+    """Le mode réplications agrège W_q, L et débit avec des IC à 95%"""
+    donnees = executer_simulation(duree_simulation=300, graine=11,
+                                  mode_silencieux=True, dossier_resultats=None,
+                                  nb_replications=6, nb_processus=2).donnees
+    
+    replications = donnees['replications']
+    assert replications['nombre'] == 6
+    for voie in ('voie_a', 'voie_b'):
+        w_q = replications[voie]['temps_attente_moyen']
+        assert w_q['n'] == 6
+        assert w_q['ic_95'][0] <= w_q['moyenne'] <= w_q['ic_95'][1]
+        assert 'nombre_moyen_systeme' in replications[voie]
+        assert replications[voie]['debit']['moyenne'] > 0
+        # 'empirique' garde le format d'une simulation simple (moyennes)
+        assert donnees['empirique'][voie]['temps_attente_moyen'] == pytest.approx(w_q['moyenne'])
+    
+    # Réplications reproductibles quel que soit le nombre de processus
+    sequentiel = executer_simulation(duree_simulation=300, graine=11,
+                                     mode_silencieux=True, dossier_resultats=None,
+                                     nb_replications=6, nb_processus=1).donnees
+    assert (sequentiel['replications']['voie_a']['temps_attente_moyen']['moyenne'] ==
+            pytest.approx(replications['voie_a']['temps_attente_moyen']['moyenne']))
+
+
+def test_flux_independants():
+    """Les flux dérivés d'une graine sont distincts mais reproductibles"""
+    flux = FluxAleatoires(123)
+    a = flux.generateur('arrivees_a').random(3)
+    b = flux.generateur('arrivees_b').random(3)
+    assert not (a == b).all()
+    assert (FluxAleatoires(123).generateur('arrivees_a').random(3) == a).all()
+
+
+
+def test_arret_sequentiel():
+    """Le mode séquentiel s'arrête dès que l'IC de W_q atteint la précision visée"""
+    donnees = executer_simulation(duree_simulation=600, graine=1, mode_silencieux=True,
+                                  dossier_resultats=None, precision_cible=1.0).donnees
+    
+    arret = donnees['arret_sequentiel']
+    assert arret['precision_atteinte']
+    assert 600 <= arret['duree_simulee'] < 60000
+    assert donnees['parametres']['duree_simulation'] == arret['duree_simulee']
+    for voie in ('voie_a', 'voie_b'):
+        assert arret[voie]['demi_largeur'] <= 1.0
+        assert arret[voie]['nb_lots'] >= 10
+    
+    # Précision inatteignable : arrêt à l'horizon maximal
+    plafonne = executer_simulation(duree_simulation=300, graine=1, mode_silencieux=True,
+                                   dossier_resultats=None, precision_cible=1e-3,
+                                   duree_max=900).donnees['arret_sequentiel']
+    assert not plafonne['precision_atteinte']
+    assert plafonne['duree_simulee'] == 900
+
+
+def test_arret_sequentiel_resume_sans_intervalle(capsys):
+    """Le résumé affiché tolère un horizon maximal atteint sans IC calculable"""
+    arret = executer_simulation(duree_simulation=60, graine=1, dossier_resultats=None,
+                                precision_cible=0.5, duree_max=60,
+                                journal=JournalNul()).donnees['arret_sequentiel']
+    
+    assert not arret['precision_atteinte']
+    assert arret['voie_a']['demi_largeur'] is None
+    sortie = capsys.readouterr().out
+    assert "horizon maximal" in sortie
+    assert "± ∞" in sortie
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Tests pour les indicateurs théoriques du module statistiques.py
+Responsable : Sarah
+"""
+
+import math
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from statistiques import (StatistiquesTheorique, StatistiquesTheoriqueVectorisees,
+                          CollecteurDonnees, retard_webster, retard_hcm, retards_feux)
+from main import executer_simulation
+
+
+def test_vectorise_identique_au_scalaire():
+    """Chaque point du calcul vectorisé redonne StatistiquesTheorique"""
+    lambdas = np.array([0.1, 0.3, 0.395, 0.5, 0.2])
+    mus = np.array([0.395, 0.395, 0.395, 0.395, 0.0])
+    vectorise = StatistiquesTheoriqueVectorisees(lambdas, mus)
+
+    for i, (lambda_, mu) in enumerate(zip(lambdas, mus)):
+        scalaire = StatistiquesTheorique(lambda_, mu)
+        assert vectorise.est_stable[i] == scalaire.est_stable
+        for indicateur in ('rho', 'L', 'W', 'L_q', 'W_q'):
+            attendu = getattr(scalaire, indicateur)
+            obtenu = getattr(vectorise, indicateur)[i]
+            if math.isinf(attendu):
+                assert math.isinf(obtenu)
+            else:
+                assert obtenu == pytest.approx(attendu)
+
+
+def test_diffusion_et_tableau_structure():
+    """λ et μ se diffusent ; le tableau structuré garde la forme de la grille"""
+    lambdas = np.linspace(0.05, 0.5, 30)[:, None]
+    mus = np.linspace(0.2, 0.6, 40)[None, :]
+    tableau = StatistiquesTheoriqueVectorisees(lambdas, mus).tableau()
+
+    assert tableau.shape == (30, 40)
+    assert tableau['est_stable'].dtype == bool
+    assert np.all(np.isinf(tableau['W_q'][~tableau['est_stable']]))
+    assert np.all(np.isfinite(tableau['W_q'][tableau['est_stable']]))
+
+
+def test_pour_feux():
+    """μ = proportion de vert, comme executer_simulation"""
+    voies = StatistiquesTheoriqueVectorisees.pour_feux(
+        0.3, 0.3, T_A=np.array([30.0, 40.0]), T_B=np.array([25.0, 20.0]))
+
+    assert voies['voie_a'].mu[0] == pytest.approx(30 / 76)
+    assert voies['voie_b'].mu[1] == pytest.approx(20 / 81)
+    assert not voies['voie_b'].est_stable[1]  # Scénario 2 : voie B saturée
+
+    trame = voies['voie_a'].to_dataframe()
+    assert list(trame.columns) == list(StatistiquesTheoriqueVectorisees.CHAMPS)
+    assert len(trame) == 2
+
+
+
+def test_retard_webster_valeurs():
+    """Webster : terme uniforme seul sans trafic, infini à saturation"""
+    # λ → 0 : d = C(1-g/C)²/2 = r²/(2C)
+    assert retard_webster(0.0, 28, 76, 10) == pytest.approx(48 ** 2 / (2 * 76))
+    assert retard_webster(0.3, 28, 76, 10) == pytest.approx(15.64, abs=0.01)
+    assert np.isinf(retard_webster(4.0, 28, 76, 10))
+
+
+def test_retard_hcm_sursaturation():
+    """HCM : proche de Webster en trafic léger, fini et croissant en sursaturation"""
+    assert retard_hcm(0.3, 28, 76, 10) == pytest.approx(retard_webster(0.3, 28, 76, 10),
+                                                         rel=0.01)
+    sursature = retard_hcm(np.array([4.0, 5.0]), 28, 76, 10)
+    assert np.all(np.isfinite(sursature))
+    assert sursature[1] > sursature[0]
+
+
+def test_retards_exposes_et_proches_de_la_simulation():
+    """Les retards analytiques sont dans 'theorique' et proches de la mesure"""
+    donnees = executer_simulation(duree_simulation=36000, graine=1, mode_silencieux=True,
+                                  dossier_resultats=None, moteur='cycles').donnees
+    for voie in ('voie_a', 'voie_b'):
+        theorique = donnees['theorique'][voie]
+        assert {'retard_webster', 'retard_hcm', 'degre_saturation'} <= set(theorique)
+        assert theorique['retard_webster'] == pytest.approx(
+            donnees['empirique'][voie]['temps_attente_moyen'], rel=0.05)
+
+    # Vectorisé sur une grille de configurations
+    grille = retards_feux(0.3, 0.3, T_A=np.arange(20, 41)[:, None], T_B=np.arange(20, 41)[None, :])
+    assert grille['voie_a']['retard_webster'].shape == (21, 21)
+
+
+def test_retards_debit_saturation_par_voie():
+    """Chaque voie utilise son propre débit de saturation"""
+    reference = retards_feux(0.2, 0.2, 30, 30)
+    lente = retards_feux(0.2, 0.2, 30, 30, debit_saturation_b=0.5)
+    assert lente['voie_a']['retard_webster'] == reference['voie_a']['retard_webster']
+    assert lente['voie_b']['retard_webster'] > reference['voie_b']['retard_webster']
+
+    with pytest.raises(ValueError):
+        CollecteurDonnees().definir_parametres(
+            0.2, 0.3, 0.2, 0.3, 500,
+            {'T_A': 30, 'T_B': 30, 'T_jaune': 3, 'T_pietons': 15},
+            debit_saturation_a=0.5)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,112 @@
+"""
+Tests pour le module statistiques_en_ligne.py
+Responsable : Sarah
+"""
+
+import json
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from statistiques_en_ligne import (AccumulateurWelford, DigestQuantiles,
+                                   StatistiquesEnLigne, TroncatureMSER)
+from intersection import FileAttente
+from vehicule import Vehicule, Direction
+from main import executer_simulation
+
+
+def test_welford_equivalent_numpy():
+    """Moyenne, variance et maximum identiques au calcul sur tout l'échantillon"""
+    valeurs = np.random.default_rng(0).normal(5.0, 2.0, 1000)
+    acc = AccumulateurWelford()
+    for v in valeurs:
+        acc.ajouter(float(v))
+
+    assert acc.moyenne == pytest.approx(valeurs.mean())
+    assert acc.variance == pytest.approx(valeurs.var(ddof=1))
+    assert acc.maximum == valeurs.max()
+
+
+def test_digest_petits_echantillons():
+    """Sur quelques observations, le quantile est exact et lisible sans fusion préalable"""
+    digest = DigestQuantiles()
+    for v in (3.0, 1.0, 2.0):
+        digest.ajouter(v)
+    assert digest.quantile(0.5) == 2.0
+    assert digest.quantile(1.0) == 3.0
+
+
+def test_digest_memoire_bornee():
+    """Le nombre de centroïdes reste borné par la compression"""
+    digest = DigestQuantiles(compression=50, taille_tampon=100)
+    for v in np.random.default_rng(2).random(10_000):
+        digest.ajouter(float(v))
+    digest.quantile(0.5)
+    assert len(digest._moyennes) <= 51
+    assert digest.n == 10_000
+
+
+def test_quantiles_proches_du_quantile_empirique():
+    """Sur des attentes exponentielles, le t-digest reste à quelques % du quantile exact"""
+    valeurs = np.random.default_rng(1).exponential(10.0, 20_000)
+    stats = StatistiquesEnLigne()
+    for v in valeurs:
+        stats.ajouter(float(v))
+
+    for p in StatistiquesEnLigne.QUANTILES:
+        assert stats.quantile(p) == pytest.approx(np.quantile(valeurs, p), rel=0.03)
+    assert set(stats.to_dict()) >= {'p50', 'p90', 'p95', 'p99', 'max', 'ecart_type'}
+
+
+def test_file_attente_distribution():
+    """FileAttente expose la dispersion des attentes à tout instant"""
+    file = FileAttente("File Voie A")
+    for i, attente in enumerate([1.0, 2.0, 3.0, 4.0]):
+        file.ajouter_vehicule(Vehicule(i, Direction.VOIE_A, 0.0), 0.0)
+        file.retirer_vehicule(attente)
+        file.enregistrer_service(attente, attente + 0.1)
+
+    resume = file.distribution_attente()
+    assert resume['temps_attente_max'] == 4.0
+    assert resume['temps_attente_p50'] == pytest.approx(2.5)
+    assert resume['temps_attente_std'] == pytest.approx(np.std([1, 2, 3, 4], ddof=1))
+
+
+
+def test_mser_ecarte_le_transitoire():
+    """Un biais initial décroissant est écarté ; lots fusionnés et blocs concordent"""
+    rng = np.random.default_rng(0)
+    n = 20_000
+    valeurs = rng.normal(10.0, 2.0, n) + 30.0 * np.exp(-np.arange(n) / 1000)
+    temps = np.arange(n, dtype=float)
+
+    une_a_une = TroncatureMSER()
+    for v, t in zip(valeurs, temps):
+        une_a_une.ajouter(float(v), float(t))
+    par_blocs = TroncatureMSER()
+    for debut in range(0, n, 777):
+        par_blocs.ajouter_bloc(valeurs[debut:debut + 777], temps[debut:debut + 777])
+
+    resultat = une_a_une.resultat()
+    assert resultat == par_blocs.resultat()
+    assert resultat['observations_ecartees'] > 1000
+    assert resultat['moyenne'] == pytest.approx(10.0, abs=0.2)
+    assert une_a_une.nombre_lots < une_a_une.nb_max_lots  # mémoire bornée
+
+
+def test_troncature_dans_le_json(tmp_path):
+    """La troncature retenue est enregistrée par voie dans le JSON"""
+    executer_simulation(duree_simulation=600, graine=4, mode_silencieux=True,
+                        nom_scenario="chauffe", dossier_resultats=str(tmp_path))
+    with open(tmp_path / "chauffe.json", encoding='utf-8') as f:
+        voie_a = json.load(f)['empirique']['voie_a']
+
+    assert {'temps_attente_moyen_stationnaire', 'troncature_vehicules',
+            'troncature_temps'} <= set(voie_a)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
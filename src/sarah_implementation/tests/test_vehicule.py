@@ -1,6 +1,17 @@
 """Tests pour le module vehicule.py"""
 import pytest
-from src.vehicule import Vehicule, Direction, GenerateurVehicules
+import sys
+import os
+
+# vehicule.py importe ses voisins (journal) par leur nom de module
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.vehicule import (Vehicule, Direction, GenerateurVehicules,
+                          EchantillonneurExponentiel)
+from feux import SystemeFeux, ConfigurationFeux
+from intersection import Intersection
+from journal import JournalNul
+import numpy as np
 import simpy
 
 def test_creation_vehicule():
@@ -22,5 +33,88 @@ def test_generateur():
     moyenne = sum(temps) / len(temps)
     assert 2.0 < moyenne < 5.0  # Marge pour l'aléatoire
 
+def test_echantillonneur_par_blocs():
+    """Les tirages par blocs suivent Exp(λ) et se rechargent à la demande"""
+    echantillonneur = EchantillonneurExponentiel(0.3, np.random.default_rng(1),
+                                                 taille_bloc=100)
+    temps = [echantillonneur.suivant() for _ in range(5000)]
+    
+    assert len(set(temps)) == 5000  # Pas de bloc réutilisé
+    assert abs(np.mean(temps) - 1 / 0.3) < 0.2
+
+def test_flux_independants_par_voie():
+    """Chaque voie a son propre flux, reproductible à graine égale"""
+    def premiers_temps(graine_a, graine_b):
+        env = simpy.Environment()
+        gen = GenerateurVehicules(env, 0.3, 0.3,
+                                  generateur_a=np.random.default_rng(graine_a),
+                                  generateur_b=np.random.default_rng(graine_b))
+        return ([gen.echantillonneur_a.suivant() for _ in range(3)],
+                [gen.echantillonneur_b.suivant() for _ in range(3)])
+    
+    a1, b1 = premiers_temps(1, 2)
+    a2, b2 = premiers_temps(1, 3)
+    assert a1 == a2  # Voie A inchangée quand seule la voie B change
+    assert b1 != b2
+
+def test_vehicule_compact():
+    """Le véhicule est un enregistrement à __slots__ (pas de __dict__)"""
+    v = Vehicule(1, Direction.VOIE_A, 0.0)
+    assert not hasattr(v, '__dict__')
+    with pytest.raises(AttributeError):
+        v.autre_attribut = 1
+
+def test_statistiques_sans_conservation():
+    """Sans conservation, les stats en ligne égalent celles sur la liste"""
+    def simuler(conserver):
+        env = simpy.Environment()
+        journal = JournalNul()
+        feux = SystemeFeux(env, ConfigurationFeux(), journal)
+        intersection = Intersection(env, feux, journal)
+        gen = GenerateurVehicules(env, 0.3, 0.3, journal,
+                                  generateur_a=np.random.default_rng(1),
+                                  generateur_b=np.random.default_rng(2),
+                                  conserver_vehicules=conserver,
+                                  recycler_vehicules=True)
+        env.process(feux.gerer_cycle())
+        env.process(gen.generer_voie_a(intersection))
+        env.process(gen.generer_voie_b(intersection))
+        env.run(until=2000)
+        return gen
+    
+    avec, sans = simuler(True), simuler(False)
+    assert sans.vehicules_a == [] and sans.vehicules_b == []
+    # Peu d'objets créés : bornés par le nombre de véhicules présents
+    assert sans.reserve.nombre_crees < 100
+    assert sans.reserve.nombre_recycles > 1000
+    
+    stats_avec, stats_sans = avec.obtenir_statistiques(), sans.obtenir_statistiques()
+    for voie in ('voie_a', 'voie_b'):
+        for cle, valeur in stats_avec[voie].items():
+            assert stats_sans[voie][cle] == pytest.approx(valeur)
+
+def test_branchement_depart_unique():
+    """Le générateur se branche une seule fois, après les rappels existants"""
+    env = simpy.Environment()
+    journal = JournalNul()
+    feux = SystemeFeux(env, ConfigurationFeux(), journal)
+    intersection = Intersection(env, feux, journal)
+    departs = []
+    intersection.ajouter_sur_depart(departs.append)
+    gen = GenerateurVehicules(env, 0.3, 0.3, journal,
+                              generateur_a=np.random.default_rng(1),
+                              generateur_b=np.random.default_rng(2),
+                              conserver_vehicules=False)
+    env.process(feux.gerer_cycle())
+    env.process(gen.generer_voie_a(intersection))
+    env.process(gen.generer_voie_b(intersection))
+    env.run(until=500)
+    
+    stats = gen.obtenir_statistiques()
+    servis = (intersection.file_a.nombre_vehicules_servis +
+              intersection.file_b.nombre_vehicules_servis)
+    assert len(departs) == servis > 0
+    assert stats['voie_a']['nombre_servis'] + stats['voie_b']['nombre_servis'] == servis
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file